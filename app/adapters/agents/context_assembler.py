@@ -0,0 +1,135 @@
+import math
+from typing import Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class ContextAssembler:
+    """
+    Turn retrieved chunks into a compact, ordered context block for a prompt.
+
+    STEPS:
+    1. Pick chunks by relevance until the model's token budget is reached
+    2. Order the picked chunks by document, then by position in the document
+    3. Merge runs of adjacent chunk_index, dropping the overlap that the
+       chunker repeats at the start of every chunk
+
+    Token counts are estimated (~4 characters per token); the budget is a
+    guard against oversized prompts, not an exact limit.
+    """
+
+    CHARS_PER_TOKEN = 4
+    MAX_OVERLAP_WORDS = 120  # upper bound on the chunker's repeated region
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        default_budget: Optional[int] = None,
+    ) -> None:
+        self._budgets = budgets if budgets is not None else settings.LLM_CONTEXT_TOKEN_BUDGETS
+        self._default_budget = default_budget or settings.LLM_CONTEXT_TOKEN_BUDGET_DEFAULT
+
+    def budget_for(self, model: Optional[str] = None) -> int:
+        return self._budgets.get(model or "", self._default_budget)
+
+    @classmethod
+    def estimate_tokens(cls, text: str) -> int:
+        return math.ceil(len(text) / cls.CHARS_PER_TOKEN)
+
+    def assemble(
+        self,
+        chunks: List[dict],
+        model: Optional[str] = None,
+        budget: Optional[int] = None,
+    ) -> str:
+        """Return the context text for *chunks* within the token budget of *model*."""
+        budget = budget or self.budget_for(model)
+        candidates = self._unique(chunks)
+        if not candidates:
+            return ""
+
+        selected: List[dict] = []
+        context = ""
+        for chunk in sorted(candidates, key=lambda c: c.get("score") or 0.0, reverse=True):
+            attempt = self._render(selected + [chunk])
+            if self.estimate_tokens(attempt) <= budget:
+                selected.append(chunk)
+                context = attempt
+
+        if not selected:
+            # Even the best chunk is over budget – keep as much of it as fits
+            best = max(candidates, key=lambda c: c.get("score") or 0.0)
+            context = (best.get("content") or "")[: budget * self.CHARS_PER_TOKEN]
+
+        raw_tokens = sum(self.estimate_tokens(c.get("content") or "") for c in chunks)
+        used_tokens = self.estimate_tokens(context)
+        saved = max(raw_tokens - used_tokens, 0)
+        metrics.inc("llm_context_tokens_saved_total", saved, model=model or "default")
+        logger.info(
+            f"Context assembled for {model or 'default'}: {len(chunks)} chunks -> "
+            f"{len(selected)} kept, {used_tokens}/{budget} tokens, saved {saved}"
+        )
+        return context
+
+    @staticmethod
+    def _unique(chunks: List[dict]) -> List[dict]:
+        """Drop empty chunks and repeated (document_id, chunk_index) hits."""
+        seen = set()
+        unique = []
+        for chunk in chunks:
+            if not (chunk.get("content") or "").strip():
+                continue
+            key = (chunk.get("document_id"), chunk.get("chunk_index"))
+            if key[1] is not None and key in seen:
+                continue
+            seen.add(key)
+            unique.append(chunk)
+        return unique
+
+    def _render(self, chunks: List[dict]) -> str:
+        # Documents keep the order of their best hit; chunks follow the document
+        doc_rank: Dict[str, int] = {}
+        for chunk in sorted(chunks, key=lambda c: c.get("score") or 0.0, reverse=True):
+            doc_rank.setdefault(str(chunk.get("document_id")), len(doc_rank))
+
+        ordered = sorted(
+            chunks,
+            key=lambda c: (
+                doc_rank[str(c.get("document_id"))],
+                c.get("chunk_index") if c.get("chunk_index") is not None else math.inf,
+            ),
+        )
+
+        passages: List[str] = []
+        previous: Optional[dict] = None
+        for chunk in ordered:
+            content = chunk["content"].strip()
+            if previous is not None and self._is_adjacent(previous, chunk):
+                passages[-1] = self._merge(passages[-1], content)
+            else:
+                passages.append(content)
+            previous = chunk
+        return "\n\n".join(passages)
+
+    @staticmethod
+    def _is_adjacent(previous: dict, chunk: dict) -> bool:
+        return (
+            previous.get("document_id") == chunk.get("document_id")
+            and previous.get("chunk_index") is not None
+            and chunk.get("chunk_index") == previous["chunk_index"] + 1
+        )
+
+    def _merge(self, head: str, tail: str) -> str:
+        """Join two adjacent chunks, keeping their shared overlap only once."""
+        head_words = head.split()
+        tail_words = tail.split()
+        longest = min(len(head_words), len(tail_words), self.MAX_OVERLAP_WORDS)
+        for size in range(longest, 0, -1):
+            if head_words[-size:] == tail_words[:size]:
+                rest = tail.split(None, size)[size:]
+                return f"{head} {rest[0]}" if rest else head
+        return f"{head} {tail}"
@@ -0,0 +1,135 @@
+import asyncio
+import json
+import math
+import os
+import re
+from typing import Dict, List, Optional
+
+from app.application.interfaces import IDocumentEmbedderInterface
+from app.core.logging import get_logger
+from app.domain.entities.ai_entity import IntentPrediction
+
+logger = get_logger(__name__)
+
+_EXAMPLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "intent_examples.json")
+
+
+class IntentClassifier:
+    """
+    Local first stage of the Nova router.
+
+    STAGES:
+    1. Keyword rules – settle unambiguous messages with no I/O at all
+    2. Nearest centroid – cosine similarity between the message embedding and
+       the mean embedding of each intent's example phrases
+    3. Otherwise return None so the caller falls back to the LLM router
+
+    A centroid decision needs both a minimum similarity and a margin over the
+    runner-up, so only confident cases skip the LLM. The embedder is the
+    shared (cached) query embedder and the tutor node searches with the same
+    clean() text, so a tutor question that goes on to retrieval is not
+    embedded twice.
+    """
+
+    LABELS = ("tutor", "quiz", "conversational")
+
+    RULES: Dict[str, re.Pattern] = {
+        "quiz": re.compile(
+            r"\b(quiz(zes)?|mcqs?|multiple[- ]choice|flash ?cards?|mock (exam|test)s?|"
+            r"practi[cs]e (questions?|tests?|exams?)|exam[- ]style|test (me|my knowledge))\b",
+            re.IGNORECASE,
+        ),
+        "conversational": re.compile(
+            r"^(hi+|hey+|hello+|hiya|yo|good (morning|afternoon|evening|night)|thanks?( you| a lot| so much)?|"
+            r"thank u|ty|thx|cheers|bye|goodbye|see (you|ya)( later)?|ok(ay)?|cool|nice|lol|"
+            r"how are you( doing)?( today)?|what'?s up|who are you|nice to meet you)"
+            r"( nova)?[\s!.?,:)]*$",
+            re.IGNORECASE,
+        ),
+        "tutor": re.compile(
+            r"^(explain|define|describe|summari[sz]e|compare|contrast|elaborate|clarify|"
+            r"(can|could) you (explain|help me understand|break down)|"
+            r"what (is|are|was|were|does|do)|why|how (does|do|is|are|can|to)|"
+            r"i (don'?t|do not) (understand|get))\b",
+            re.IGNORECASE,
+        ),
+    }
+
+    def __init__(
+        self,
+        embedder: Optional[IDocumentEmbedderInterface] = None,
+        examples: Optional[Dict[str, List[str]]] = None,
+        min_similarity: float = 0.6,
+        min_margin: float = 0.05,
+    ) -> None:
+        self._embedder = embedder
+        self._examples = examples or self._load_examples()
+        self._min_similarity = min_similarity
+        self._min_margin = min_margin
+        self._centroids: Optional[Dict[str, List[float]]] = None
+        self._centroid_lock = asyncio.Lock()
+
+    async def classify(self, text: str) -> Optional[IntentPrediction]:
+        """Return a confident prediction, or None to defer to the LLM router."""
+        prediction = self.classify_rules(text)
+        if prediction is not None:
+            return prediction
+        return await self.classify_centroid(text)
+
+    def classify_rules(self, text: str) -> Optional[IntentPrediction]:
+        cleaned = self.clean(text)
+        if not cleaned:
+            return IntentPrediction(label="conversational", confidence=1.0, source="rules")
+
+        hits = [label for label, pattern in self.RULES.items() if pattern.search(cleaned)]
+        if len(hits) == 1:
+            return IntentPrediction(label=hits[0], confidence=1.0, source="rules")
+        return None
+
+    async def classify_centroid(self, text: str) -> Optional[IntentPrediction]:
+        if self._embedder is None:
+            return None
+        try:
+            centroids = await self._get_centroids()
+            _, vector = await self._embedder.embed(self.clean(text))
+        except Exception as e:
+            logger.warning(f"Intent centroid stage unavailable: {e}")
+            return None
+
+        query = self._normalize(vector)
+        scores = sorted(
+            ((sum(q * c for q, c in zip(query, centroid)), label) for label, centroid in centroids.items()),
+            reverse=True,
+        )
+        (best, label), (runner_up, _) = scores[0], scores[1]
+        if best >= self._min_similarity and best - runner_up >= self._min_margin:
+            return IntentPrediction(label=label, confidence=round(best, 4), source="centroid")
+        return None
+
+    @staticmethod
+    def clean(text: str) -> str:
+        """Drop @Nova mentions and collapse whitespace."""
+        text = re.sub(r"@nova(ai)?\b", "", text or "", flags=re.IGNORECASE)
+        return " ".join(text.split())
+
+    async def _get_centroids(self) -> Dict[str, List[float]]:
+        if self._centroids is None:
+            async with self._centroid_lock:
+                if self._centroids is None:
+                    centroids = {}
+                    for label, phrases in self._examples.items():
+                        embedded = await self._embedder.embed_multiple(phrases)
+                        vectors = [self._normalize(v) for _, v in embedded]
+                        centroids[label] = self._normalize([sum(dim) / len(vectors) for dim in zip(*vectors)])
+                    self._centroids = centroids
+        return self._centroids
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> List[float]:
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    @staticmethod
+    def _load_examples() -> Dict[str, List[str]]:
+        with open(_EXAMPLES_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
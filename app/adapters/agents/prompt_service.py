@@ -1,35 +1,91 @@
 import os
-from typing import Any, Dict, Optional
+import string
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Optional
+
+
+@dataclass(frozen=True)
+class _CompiledPrompt:
+    template: str
+    variables: FrozenSet[str]
+    mtime: float
 
 
 class PromptService:
-    """Service to load and inject context into markdown prompt files."""
+    """
+    Service to load and inject context into markdown prompt files.
+
+    Templates are parsed once and cached; with `check_mtime` a cached
+    template is re-read when its file changes (one stat per call), otherwise
+    the cache is only filled by `preload()` or on first use. Literal braces in
+    a template must be doubled (`{{` / `}}`), as with `str.format`.
+    """
 
-    def __init__(self, prompts_dir: Optional[str] = None):
+    def __init__(self, prompts_dir: Optional[str] = None, check_mtime: bool = True):
         if prompts_dir is None:
             # Default to the sibling directory
             base_dir = os.path.dirname(os.path.abspath(__file__))
             self.prompts_dir = os.path.join(base_dir, "prompts")
         else:
             self.prompts_dir = prompts_dir
+        self._check_mtime = check_mtime
+        self._cache: Dict[str, _CompiledPrompt] = {}
+
+    def preload(self) -> None:
+        """Parse every prompt in the directory up front."""
+        for file_name in os.listdir(self.prompts_dir):
+            name, ext = os.path.splitext(file_name)
+            if ext == ".md":
+                self._compile(name)
 
     def get_prompt(self, name: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Retrieve a prompt by name and format it with the provided context."""
-        file_path = os.path.join(self.prompts_dir, f"{name}.md")
-        
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"Prompt file not found: {file_path}")
+        prompt = self._get_compiled(name)
+        if not prompt.variables:
+            # Still format so doubled braces collapse the same way
+            return prompt.template.format()
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        missing = prompt.variables.difference(context or {})
+        if missing:
+            raise KeyError(f"Prompt '{name}' is missing variables: {', '.join(sorted(missing))}")
+        return prompt.template.format(**context)
 
-        if context:
+    def _get_compiled(self, name: str) -> _CompiledPrompt:
+        prompt = self._cache.get(name)
+        if prompt is None:
+            return self._compile(name)
+        if self._check_mtime:
             try:
-                return content.format(**context)
-            except KeyError as e:
-                # If a key is missing, we still want to return the content, 
-                # maybe with placeholders or just as is.
-                # For safety, we can use a more robust formatter or just log it.
-                return content
-        
-        return content
+                if os.stat(self._path(name)).st_mtime != prompt.mtime:
+                    return self._compile(name)
+            except FileNotFoundError:
+                self._cache.pop(name, None)
+                raise FileNotFoundError(f"Prompt file not found: {self._path(name)}")
+        return prompt
+
+    def _compile(self, name: str) -> _CompiledPrompt:
+        file_path = self._path(name)
+        try:
+            mtime = os.stat(file_path).st_mtime
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Prompt file not found: {file_path}")
+
+        try:
+            variables = frozenset(
+                field.split(".")[0].split("[")[0]
+                for _, field, _, _ in string.Formatter().parse(content)
+                if field is not None
+            )
+        except ValueError as e:
+            raise ValueError(f"Prompt '{name}' is not a valid template: {e}")
+        if "" in variables:
+            raise ValueError(f"Prompt '{name}' uses positional fields; name every variable")
+
+        prompt = _CompiledPrompt(template=content, variables=variables, mtime=mtime)
+        self._cache[name] = prompt
+        return prompt
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.prompts_dir, f"{name}.md")
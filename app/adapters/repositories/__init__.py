@@ -3,3 +3,4 @@ from .sql_chat_repo import *
 from .sql_document_repo import *
 from .sql_study_session_repo import *
 
+from .sql_quiz_repo import *
@@ -0,0 +1,88 @@
+import uuid
+from typing import List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.application.interfaces.quiz_bank_interface import IQuizBankInterface
+from app.domain.entities.ai_entity import QuizQuestion, QuizType
+from app.infrastructure.db.models.quiz_model import QuizQuestionModel
+
+
+class SQLQuizBankRepository(IQuizBankInterface):
+    """PostgreSQL implementation of the quiz question bank."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def replace_for_document(
+        self,
+        document_id: uuid.UUID,
+        user_id: uuid.UUID,
+        class_id: Optional[uuid.UUID],
+        questions: List[QuizQuestion],
+    ) -> int:
+        await self._session.execute(
+            delete(QuizQuestionModel).where(QuizQuestionModel.document_id == document_id)
+        )
+        self._session.add_all([
+            QuizQuestionModel(
+                id=q.id,
+                document_id=document_id,
+                user_id=user_id,
+                class_id=class_id,
+                quiz_type=q.quiz_type.value,
+                section_index=q.section_index,
+                question_text=q.question_text,
+                options=q.options,
+                correct_answer=q.correct_answer,
+                explanation=q.explanation,
+            )
+            for q in questions
+        ])
+        await self._session.commit()
+        return len(questions)
+
+    async def sample(
+        self,
+        quiz_type: QuizType,
+        limit: int,
+        user_id: Optional[uuid.UUID] = None,
+        document_id: Optional[uuid.UUID] = None,
+        class_id: Optional[uuid.UUID] = None,
+    ) -> List[QuizQuestion]:
+        q = select(QuizQuestionModel).where(QuizQuestionModel.quiz_type == quiz_type.value)
+        if document_id:
+            q = q.where(QuizQuestionModel.document_id == document_id)
+        elif class_id:
+            q = q.where(QuizQuestionModel.class_id == class_id)
+        else:
+            q = q.where(
+                QuizQuestionModel.user_id == user_id,
+                QuizQuestionModel.class_id.is_(None),
+            )
+
+        q = q.order_by(func.random()).limit(limit)
+        result = await self._session.execute(q)
+        return [self._to_entity(m) for m in result.scalars().all()]
+
+    async def count_for_document(self, document_id: uuid.UUID) -> int:
+        result = await self._session.execute(
+            select(func.count()).select_from(QuizQuestionModel).where(
+                QuizQuestionModel.document_id == document_id
+            )
+        )
+        return result.scalar() or 0
+
+    @staticmethod
+    def _to_entity(model: QuizQuestionModel) -> QuizQuestion:
+        return QuizQuestion(
+            id=model.id,
+            question_text=model.question_text,
+            options=list(model.options or []),
+            correct_answer=model.correct_answer,
+            explanation=model.explanation,
+            quiz_type=QuizType(model.quiz_type),
+            document_id=model.document_id,
+            section_index=model.section_index,
+        )
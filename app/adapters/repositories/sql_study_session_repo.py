@@ -2,12 +2,16 @@ import uuid
 from datetime import datetime, timezone
 from typing import List, Optional
 
-from sqlalchemy import and_, func, select
+from sqlalchemy import and_, delete, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.application.interfaces.study_session_interface import IStudySessionInterface
-from app.domain.entities.study_session_entity import StudySession
-from app.infrastructure.db.models.study_session_model import StudySessionModel
+from app.application.interfaces.study_session_interface import (
+    IStudyRollupInterface, IStudySessionInterface)
+from app.domain.entities.study_session_entity import (RollupScope,
+                                                      StudyRollup,
+                                                      StudySession)
+from app.infrastructure.db.models.study_session_model import (
+    StudyRollupModel, StudyRollupRefreshModel, StudySessionModel)
 
 
 class SQLStudySessionRepository(IStudySessionInterface):
@@ -91,6 +95,38 @@ class SQLStudySessionRepository(IStudySessionInterface):
         result = await self._session.execute(q)
         return result.scalar() or 0
 
+    async def list_users_active_since(self, since: Optional[datetime] = None) -> List[uuid.UUID]:
+        q = select(StudySessionModel.user_id).distinct()
+        if since is not None:
+            q = q.where(StudySessionModel.last_heartbeat > since)
+        result = await self._session.execute(q)
+        return list(result.scalars().all())
+
+    async def aggregate_by_document(self, user_id: uuid.UUID) -> List[StudyRollup]:
+        result = await self._session.execute(
+            select(
+                StudySessionModel.document_id,
+                StudySessionModel.class_id,
+                func.sum(StudySessionModel.duration_seconds),
+                func.count(),
+                func.max(StudySessionModel.last_heartbeat),
+            )
+            .where(StudySessionModel.user_id == user_id)
+            .group_by(StudySessionModel.document_id, StudySessionModel.class_id)
+        )
+        return [
+            StudyRollup(
+                user_id=user_id,
+                scope=RollupScope.DOCUMENT,
+                scope_key=str(document_id),
+                class_id=class_id,
+                total_seconds=int(seconds or 0),
+                session_count=count,
+                last_studied_at=last,
+            )
+            for document_id, class_id, seconds, count, last in result.all()
+        ]
+
     @staticmethod
     def _to_entity(model: StudySessionModel) -> StudySession:
         return StudySession(
@@ -104,3 +140,76 @@ class SQLStudySessionRepository(IStudySessionInterface):
             duration_seconds=model.duration_seconds,
             is_active=model.is_active,
         )
+
+
+class SQLStudyRollupRepository(IStudyRollupInterface):
+    """PostgreSQL implementation of the study rollup store."""
+
+    WATERMARK_ID = uuid.uuid5(uuid.NAMESPACE_URL, "study_rollups:watermark")
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def replace_for_user(self, user_id: uuid.UUID, rollups: List[StudyRollup]) -> int:
+        await self._session.execute(
+            delete(StudyRollupModel).where(StudyRollupModel.user_id == user_id)
+        )
+        self._session.add_all([
+            StudyRollupModel(
+                id=r.id,
+                user_id=user_id,
+                class_id=r.class_id,
+                scope=r.scope.value,
+                scope_key=r.scope_key,
+                label=r.label,
+                total_seconds=r.total_seconds,
+                session_count=r.session_count,
+                last_studied_at=r.last_studied_at,
+            )
+            for r in rollups
+        ])
+        await self._session.commit()
+        return len(rollups)
+
+    async def list_for_user(
+        self,
+        user_id: uuid.UUID,
+        class_id: Optional[uuid.UUID] = None,
+        scope: Optional[RollupScope] = None,
+        limit: Optional[int] = None,
+    ) -> List[StudyRollup]:
+        q = select(StudyRollupModel).where(StudyRollupModel.user_id == user_id)
+        if class_id:
+            q = q.where(StudyRollupModel.class_id == class_id)
+        if scope:
+            q = q.where(StudyRollupModel.scope == scope.value)
+
+        q = q.order_by(StudyRollupModel.total_seconds.desc())
+        if limit:
+            q = q.limit(limit)
+        result = await self._session.execute(q)
+        return [self._to_entity(m) for m in result.scalars().all()]
+
+    async def get_watermark(self) -> Optional[datetime]:
+        model = await self._session.get(StudyRollupRefreshModel, self.WATERMARK_ID)
+        return model.refreshed_at if model else None
+
+    async def set_watermark(self, refreshed_at: datetime) -> None:
+        await self._session.merge(
+            StudyRollupRefreshModel(id=self.WATERMARK_ID, refreshed_at=refreshed_at)
+        )
+        await self._session.commit()
+
+    @staticmethod
+    def _to_entity(model: StudyRollupModel) -> StudyRollup:
+        return StudyRollup(
+            id=model.id,
+            user_id=model.user_id,
+            class_id=model.class_id,
+            scope=RollupScope(model.scope),
+            scope_key=model.scope_key,
+            label=model.label,
+            total_seconds=model.total_seconds,
+            session_count=model.session_count,
+            last_studied_at=model.last_studied_at,
+        )
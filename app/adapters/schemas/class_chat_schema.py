@@ -48,6 +48,7 @@ class ClassMemberResponse(BaseModel):
     username: str
     role: str          # owner | admin | member
     joined_at: datetime
+    is_online: bool = False
 
 
 class ClassResponse(BaseModel):
@@ -59,6 +60,7 @@ class ClassResponse(BaseModel):
     is_private: bool
     created_by: UUID
     member_count: int
+    online_count: int = 0
     members: list[ClassMemberResponse]
     created_at: datetime
 
@@ -40,6 +40,22 @@ class DocumentChunkResponse(BaseModel):
         from_attributes = True
 
 
+class SectionSummaryResponse(BaseModel):
+    """Summary of one section (a run of consecutive chunks)."""
+    index: int
+    chunk_start: int
+    chunk_end: int
+    summary: str
+
+
+class DocumentSummaryResponse(BaseModel):
+    """Precomputed document overview, key concepts and section summaries."""
+    document_id: UUID
+    summary: str
+    key_concepts: list[str]
+    sections: list[SectionSummaryResponse]
+
+
 class UploadDocumentResponse(BaseModel):
     """Response returned immediately after upload (before processing finishes)."""
     document: DocumentResponse
@@ -20,7 +20,20 @@ class StudySessionResponse(BaseModel):
         from_attributes = True
 
 
+class StudyDocumentStat(BaseModel):
+    document_id: str
+    title: Optional[str] = None
+    seconds: int
+
+
+class StudyConceptStat(BaseModel):
+    concept: Optional[str] = None
+    seconds: int
+
+
 class StudyStatsResponse(BaseModel):
     total_study_seconds: int
     total_sessions: int
     class_stats: dict[str, int]  # class_id or "personal" -> seconds
+    top_documents: list[StudyDocumentStat] = []
+    top_concepts: list[StudyConceptStat] = []
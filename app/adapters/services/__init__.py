@@ -1,9 +1,15 @@
+from .answer_cache import *
+from .chat_membership_cache import *
 from .chat_redis_cache import *
 from .chat_redis_pubsub import *
+from .chat_redis_streams import *
 from .document_extractor import *
+from .embedding_cache import *
 from .jwt_auth import *
 from .local_storage import *
 from .ollama_embedder import *
 from .push_notification import *
 from .qdrant_vector import *
+from .redis_checkpointer import *
 from .smtp_email import *
+from .user_profile_cache import *
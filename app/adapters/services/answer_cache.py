@@ -0,0 +1,178 @@
+import base64
+import json
+import math
+import operator
+from array import array
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.application.interfaces import IAnswerCacheInterface
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.domain.entities.ai_entity import CachedAnswer
+
+logger = get_logger(__name__)
+
+
+class RedisAnswerCache(IAnswerCacheInterface):
+    """
+    Redis-backed semantic answer cache.
+
+    LAYOUT:
+    - tutor:answers:{scope}      LIST of recent answers (newest first, capped)
+    - tutor:docver:{document_id} INT version, bumped whenever the document changes
+    - tutor:threshold            HASH class_id -> similarity threshold
+
+    Embeddings are unit-normalised before storage so similarity is a plain
+    dot product, and packed as base64 float32 to keep entries small.
+    """
+
+    def __init__(self, redis_url: str, max_entries: int = 100, ttl: int = 24 * 3600):
+        self.redis_url = redis_url
+        self._redis: Any  # redis.asyncio.Redis (stubs are sync-typed)
+        self._max_entries = max_entries
+        self._ttl = ttl
+
+    async def connect(self):
+        """Initialize Redis connection."""
+        self._redis = await redis.from_url(
+            self.redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+
+    async def disconnect(self):
+        """Close Redis connection."""
+        if self._redis:
+            await self._redis.close()
+
+    async def lookup(
+        self,
+        scope: str,
+        embedding: list[float],
+        threshold: float,
+    ) -> Optional[CachedAnswer]:
+        query = self._normalize(embedding)
+        try:
+            raw_entries = await self._redis.lrange(self._get_answers_key(scope), 0, -1)
+        except Exception as e:
+            logger.warning(f"Answer cache read failed: {e}")
+            return None
+
+        best: Optional[dict] = None
+        best_score = threshold
+        for raw in raw_entries:
+            data = json.loads(raw)
+            score = sum(map(operator.mul, query, self._unpack(data["embedding"])))
+            if score >= best_score:
+                best, best_score = data, score
+
+        if best is None:
+            metrics.inc("answer_cache_requests_total", result="miss")
+            return None
+
+        # Cited chunks must still be the ones the answer was built from
+        current = await self.get_document_versions(list(best["document_versions"]))
+        if current is None or current != best["document_versions"]:
+            metrics.inc("answer_cache_requests_total", result="stale")
+            return None
+
+        metrics.inc("answer_cache_requests_total", result="hit")
+        entry = self._deserialize(best)
+        entry.similarity = best_score
+        return entry
+
+    async def store(self, scope: str, entry: CachedAnswer) -> None:
+        key = self._get_answers_key(scope)
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.lpush(key, json.dumps(self._serialize(entry)))
+                pipe.ltrim(key, 0, self._max_entries - 1)
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Answer cache write failed: {e}")
+
+    async def get_document_versions(self, document_ids: list[str]) -> Optional[dict[str, int]]:
+        if not document_ids:
+            return {}
+        try:
+            values = await self._redis.mget([self._get_version_key(d) for d in document_ids])
+        except Exception as e:
+            logger.warning(f"Answer cache version read failed: {e}")
+            return None
+        return {d: int(v or 0) for d, v in zip(document_ids, values)}
+
+    async def invalidate_document(
+        self,
+        document_id: UUID,
+        owner_id: UUID,
+        class_id: Optional[UUID] = None,
+    ) -> None:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.incr(self._get_version_key(str(document_id)))
+                pipe.delete(self._get_answers_key(self.scope_for(owner_id, document_id=document_id)))
+                if class_id:
+                    pipe.delete(self._get_answers_key(self.scope_for(owner_id, class_id)))
+                    pipe.delete(self._get_answers_key(self.scope_for(owner_id, class_id, document_id)))
+                await pipe.execute()
+        except Exception as e:
+            # Stale entries are still caught by the version check once Redis is back
+            logger.warning(f"Answer cache invalidation of document {document_id} failed: {e}")
+
+    async def get_threshold(self, class_id: UUID) -> Optional[float]:
+        try:
+            value = await self._redis.hget(self._get_threshold_key(), str(class_id))
+        except Exception as e:
+            logger.warning(f"Answer cache threshold read failed: {e}")
+            return None
+        return float(value) if value is not None else None
+
+    async def set_threshold(self, class_id: UUID, threshold: float) -> None:
+        await self._redis.hset(self._get_threshold_key(), str(class_id), str(threshold))
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> list[float]:
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    @staticmethod
+    def _pack(vector: list[float]) -> str:
+        return base64.b64encode(array("f", vector).tobytes()).decode("ascii")
+
+    @staticmethod
+    def _unpack(data: str) -> array:
+        return array("f", base64.b64decode(data))
+
+    def _serialize(self, entry: CachedAnswer) -> dict:
+        return {
+            "question": entry.question,
+            "answer": entry.answer,
+            "embedding": self._pack(self._normalize(entry.embedding)),
+            "cited_chunks": entry.cited_chunks,
+            "document_versions": entry.document_versions,
+            "created_at": entry.created_at.isoformat(),
+        }
+
+    def _deserialize(self, data: dict) -> CachedAnswer:
+        return CachedAnswer(
+            question=data["question"],
+            answer=data["answer"],
+            embedding=self._unpack(data["embedding"]).tolist(),
+            cited_chunks=data["cited_chunks"],
+            document_versions=data["document_versions"],
+            created_at=datetime.fromisoformat(data["created_at"]),
+        )
+
+    def _get_answers_key(self, scope: str) -> str:
+        return f"tutor:answers:{scope}"
+
+    def _get_version_key(self, document_id: str) -> str:
+        return f"tutor:docver:{document_id}"
+
+    def _get_threshold_key(self) -> str:
+        return "tutor:threshold"
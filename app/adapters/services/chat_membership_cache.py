@@ -0,0 +1,78 @@
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.application.interfaces import IChatMembershipCache
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class RedisChatMembershipCache(IChatMembershipCache):
+    """
+    Redis-backed cache of class memberships, shared by all instances.
+
+    LAYOUT:
+    - chat:members:{group_id}   SET of member user ids
+
+    Only confirmed memberships are cached, so a new member is never turned
+    away by a stale entry; removals and class deletion drop theirs. Failures
+    are logged and treated as misses, so callers fall back to the database.
+    """
+
+    def __init__(self, redis_url: str, ttl: int = 24 * 3600):
+        self.redis_url = redis_url
+        self._redis: Any  # redis.asyncio.Redis (stubs are sync-typed)
+        self._ttl = ttl
+
+    async def connect(self):
+        """Initialize Redis connection."""
+        self._redis = await redis.from_url(
+            self.redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+
+    async def disconnect(self):
+        """Close Redis connection."""
+        if self._redis:
+            await self._redis.close()
+
+    async def contains(self, group_id: UUID, user_id: UUID) -> bool:
+        try:
+            found = bool(await self._redis.sismember(self._get_members_key(group_id), str(user_id)))
+        except Exception as e:
+            logger.warning(f"Membership cache read failed: {e}")
+            found = False
+
+        metrics.inc("chat_membership_cache_total", outcome="hit" if found else "miss")
+        return found
+
+    async def add(self, group_id: UUID, user_id: UUID) -> None:
+        key = self._get_members_key(group_id)
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.sadd(key, str(user_id))
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Membership cache write failed: {e}")
+
+    async def remove(self, group_id: UUID, user_ids: list[UUID]) -> None:
+        if not user_ids:
+            return
+        try:
+            await self._redis.srem(self._get_members_key(group_id), *(str(u) for u in user_ids))
+        except Exception as e:
+            logger.warning(f"Membership cache removal failed: {e}")
+
+    async def invalidate_group(self, group_id: UUID) -> None:
+        try:
+            await self._redis.delete(self._get_members_key(group_id))
+        except Exception as e:
+            logger.warning(f"Membership cache invalidation failed: {e}")
+
+    def _get_members_key(self, group_id: UUID) -> str:
+        return f"chat:members:{group_id}"
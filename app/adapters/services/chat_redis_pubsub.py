@@ -1,22 +1,47 @@
 import asyncio
 import json
-from typing import Any, Callable, Dict
+import time
+from typing import Any, Callable, Dict, Optional
 from uuid import UUID
 
 import redis.asyncio as redis
 
 from app.application.interfaces import IChatPresenceService, IChatPubSub
+from app.core.logging import get_logger
+from app.core.metrics import metrics
 from app.domain.entities import ChatMessage
 
+logger = get_logger(__name__)
+
+
+class RedisPubSub(IChatPubSub):
+    """
+    Redis pub/sub relay for chat events across API instances.
+
+    SUBSCRIBING:
+    All group channels share one subscriber connection, read by a single
+    dispatcher task that routes each message by its channel to that
+    channel's callback. Subscribing and unsubscribing only edit the
+    channel -> callback map (and the Redis subscription); the reader is
+    started on connect and stopped on disconnect.
+
+    Callbacks receive the event exactly as published (JSON text) so the
+    WebSocket fan-out can forward it without decoding and re-encoding.
+    They run inline on the reader, one message at a time, which keeps
+    per-group ordering; they should hand off rather than block.
+    """
+
+    READ_TIMEOUT = 1.0  # seconds; lets the reader notice idle periods and shutdown
+    RECONNECT_DELAY = 1.0
 
-class RedisPubSub(IChatPubSub):    
     def __init__(self, redis_url: str):
         self.redis_url = redis_url
         self._publisher: Any  # redis.asyncio.Redis (stubs are sync-typed)
         self._subscriber: Any  # redis.asyncio.Redis
         self._pubsub: Any
-        self._subscriptions: Dict[str, asyncio.Task] = {}  # channel -> task
         self._callbacks: Dict[str, Callable] = {}  # channel -> callback
+        self._has_channels = asyncio.Event()
+        self._reader: Optional[asyncio.Task] = None
     
     async def connect(self):
         """Initialize Redis connections."""
@@ -32,12 +57,16 @@ class RedisPubSub(IChatPubSub):
             decode_responses=True,
         )
         self._pubsub = self._subscriber.pubsub()
+        self._reader = asyncio.create_task(self._dispatch())
     
     async def disconnect(self):
         """Close Redis connections."""
-        # Cancel all subscription tasks
-        for task in self._subscriptions.values():
-            task.cancel()
+        # Stop the dispatcher before its connection goes away
+        if self._reader:
+            self._reader.cancel()
+            await asyncio.gather(self._reader, return_exceptions=True)
+            self._reader = None
+        self._callbacks.clear()
         
         if self._pubsub:
             await self._pubsub.close()
@@ -54,8 +83,6 @@ class RedisPubSub(IChatPubSub):
         
         ChatMessage is JSON-serialized for transmission.
         """
-        channel = self._get_channel_name(group_id)
-        
         # Serialize message to dict
         message_dict = {
             "type": "message",
@@ -82,8 +109,31 @@ class RedisPubSub(IChatPubSub):
             }
         }
         
-        # Publish to Redis channel
-        await self._publisher.publish(channel, json.dumps(message_dict))
+        await self._publish(group_id, message_dict)
+    
+    async def publish_message_delta(
+        self,
+        group_id: UUID,
+        message_id: UUID,
+        delta: str,
+        sequence: int,
+        done: bool = False,
+        reply_to_id: Optional[UUID] = None,
+    ) -> None:
+        """Publish a chunk of a streaming message (e.g. a NovaAI reply)."""
+        event = {
+            "type": "message_delta",
+            "data": {
+                "id": str(message_id),
+                "group_id": str(group_id),
+                "reply_to_id": str(reply_to_id) if reply_to_id else None,
+                "delta": delta,
+                "sequence": sequence,
+                "done": done,
+            }
+        }
+        
+        await self._publish(group_id, event)
     
     async def publish_typing_indicator(
         self,
@@ -93,8 +143,6 @@ class RedisPubSub(IChatPubSub):
         is_typing: bool,
     ) -> None:
         """Publish typing indicator."""
-        channel = self._get_channel_name(group_id)
-        
         event = {
             "type": "typing",
             "data": {
@@ -104,7 +152,7 @@ class RedisPubSub(IChatPubSub):
             }
         }
         
-        await self._publisher.publish(channel, json.dumps(event))
+        await self._publish(group_id, event)
     
     async def publish_user_joined(
         self,
@@ -113,8 +161,6 @@ class RedisPubSub(IChatPubSub):
         username: str,
     ) -> None:
         """Publish user joined event."""
-        channel = self._get_channel_name(group_id)
-        
         event = {
             "type": "user_joined",
             "data": {
@@ -123,7 +169,7 @@ class RedisPubSub(IChatPubSub):
             }
         }
         
-        await self._publisher.publish(channel, json.dumps(event))
+        await self._publish(group_id, event)
     
     async def publish_user_left(
         self,
@@ -132,8 +178,6 @@ class RedisPubSub(IChatPubSub):
         username: str,
     ) -> None:
         """Publish user left event."""
-        channel = self._get_channel_name(group_id)
-        
         event = {
             "type": "user_left",
             "data": {
@@ -142,7 +186,7 @@ class RedisPubSub(IChatPubSub):
             }
         }
         
-        await self._publisher.publish(channel, json.dumps(event))
+        await self._publish(group_id, event)
     
     async def subscribe_to_group(self, group_id: UUID, callback: Callable) -> None:
         """
@@ -152,67 +196,86 @@ class RedisPubSub(IChatPubSub):
         
         Args:
             group_id: ChatGroup to subscribe to
-            callback: async function(event_data: dict) to handle events
+            callback: async function(payload: str) receiving each event as its
+                JSON text
         """
         channel = self._get_channel_name(group_id)
         
         # Already subscribed?
-        if channel in self._subscriptions:
+        if channel in self._callbacks:
             return
         
-        # Subscribe to Redis channel
-        await self._pubsub.subscribe(channel)
-        
-        # Store callback
+        # Register first so nothing published right after SUBSCRIBE is missed
         self._callbacks[channel] = callback
+        try:
+            await self._pubsub.subscribe(channel)
+        except Exception:
+            del self._callbacks[channel]
+            raise
         
-        # Start listening task
-        task = asyncio.create_task(self._listen_to_channel(channel))
-        self._subscriptions[channel] = task
+        self._has_channels.set()
+        metrics.set_gauge("pubsub_channels", len(self._callbacks))
     
     async def unsubscribe_from_group(self, group_id: UUID) -> None:
         """Unsubscribe from a group's channel."""
         channel = self._get_channel_name(group_id)
         
-        # Cancel listening task
-        if channel in self._subscriptions:
-            self._subscriptions[channel].cancel()
-            del self._subscriptions[channel]
-        
-        # Remove callback
-        if channel in self._callbacks:
-            del self._callbacks[channel]
+        # Messages still in flight for the channel are dropped from here on
+        if self._callbacks.pop(channel, None) is None:
+            return
         
         # Unsubscribe from Redis
         await self._pubsub.unsubscribe(channel)
+        metrics.set_gauge("pubsub_channels", len(self._callbacks))
+    
+    async def get_events_since(self, group_id: UUID, last_event_id: str) -> Optional[list[str]]:
+        """Pub/sub keeps no history: clients resync from the database."""
+        return None
+    
+    async def _publish(self, group_id: UUID, event: dict) -> None:
+        """Send an event to every instance subscribed to the group."""
+        await self._publisher.publish(self._get_channel_name(group_id), json.dumps(event))
     
-    async def _listen_to_channel(self, channel: str):
+    async def _dispatch(self) -> None:
         """
-        Listen to a Redis channel and invoke callback for each message.
-        
-        This runs as a background task for each subscribed channel.
+        The single reader: pull messages off the shared subscriber connection
+        and route each one to its channel's callback.
         """
-        try:
-            async for message in self._pubsub.listen():
-                if message["type"] == "message":
-                    try:
-                        # Deserialize event
-                        event_data = json.loads(message["data"])
-                        
-                        # Invoke callback
-                        callback = self._callbacks.get(channel)
-                        if callback:
-                            await callback(event_data)
-                    
-                    except Exception as e:
-                        print(f"Error processing message on {channel}: {e}")
-        
-        except asyncio.CancelledError:
-            # Task was cancelled (unsubscribe)
-            pass
-        
-        except Exception as e:
-            print(f"Error in subscription task for {channel}: {e}")
+        while True:
+            try:
+                if not self._callbacks:
+                    # Nothing to read until the first subscription
+                    self._has_channels.clear()
+                    await self._has_channels.wait()
+                    continue
+
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.READ_TIMEOUT
+                )
+                if message is None or message["type"] != "message":
+                    continue
+
+                channel = message["channel"]
+                callback = self._callbacks.get(channel)
+                if callback is None:
+                    # Unsubscribed while the message was in flight
+                    metrics.inc("pubsub_messages_total", outcome="unrouted")
+                    continue
+
+                try:
+                    await callback(message["data"])
+                    metrics.inc("pubsub_messages_total", outcome="dispatched")
+                except Exception as e:
+                    metrics.inc("pubsub_messages_total", outcome="error")
+                    logger.error(f"Error processing message on {channel}: {e}")
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                # Connection trouble: redis-py resubscribes on reconnect
+                logger.error(f"Pub/sub reader error, retrying in {self.RECONNECT_DELAY}s: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
     
     def _get_channel_name(self, group_id: UUID) -> str:
         """Get Redis channel name for a group."""
@@ -221,11 +284,24 @@ class RedisPubSub(IChatPubSub):
 
 
 
-class RedisPresence(IChatPresenceService):    
-    def __init__(self, redis_url: str):
+class RedisPresence(IChatPresenceService):
+    """
+    Per-user presence in Redis.
+
+    LAYOUT:
+    - presence:group:{group_id}   ZSET user_id -> last heartbeat (unix seconds)
+
+    A user is online while their last heartbeat is younger than
+    presence_ttl, whoever else keeps heartbeating in the group. Stale
+    members are pruned lazily by heartbeats and reads, and the key itself
+    expires once the whole group has gone quiet. Every call is a single
+    round trip.
+    """
+
+    def __init__(self, redis_url: str, presence_ttl: int = 90):
         self.redis_url = redis_url
         self._redis: Any  # redis.asyncio.Redis (stubs are sync-typed)
-        self.presence_ttl = 300  # 5 minutes
+        self.presence_ttl = presence_ttl
     
     async def connect(self):
         """Initialize Redis connection."""
@@ -243,29 +319,52 @@ class RedisPresence(IChatPresenceService):
         Client should call this periodically (every 30-60 seconds) as heartbeat.
         """
         key = self._get_presence_key(group_id)
+        now = time.time()
         
-        # Add user to online set
-        await self._redis.sadd(key, str(user_id))
-        
-        # Set expiry (will be refreshed on next heartbeat)
-        await self._redis.expire(key, self.presence_ttl)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(key, {str(user_id): now})
+            pipe.zremrangebyscore(key, "-inf", now - self.presence_ttl)
+            pipe.expire(key, self.presence_ttl)
+            await pipe.execute()
     
     async def set_user_offline(self, user_id: UUID, group_id: UUID) -> None:
         """Mark user as offline in a group."""
         key = self._get_presence_key(group_id)
-        await self._redis.srem(key, str(user_id))
+        await self._redis.zrem(key, str(user_id))
     
     async def get_online_users(self, group_id: UUID) -> list[UUID]:
         """Get list of online users in a group."""
-        key = self._get_presence_key(group_id)
-        user_ids = await self._redis.smembers(key)
-        return [UUID(uid) for uid in user_ids]
+        return (await self.get_online_users_by_group([group_id]))[group_id]
+    
+    async def get_online_users_by_group(self, group_ids: list[UUID]) -> dict[UUID, list[UUID]]:
+        """Get online users of many groups in one round trip."""
+        cutoff = time.time() - self.presence_ttl
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for group_id in group_ids:
+                key = self._get_presence_key(group_id)
+                pipe.zremrangebyscore(key, "-inf", cutoff)
+                pipe.zrangebyscore(key, f"({cutoff}", "+inf")
+            results = await pipe.execute()
+        return {
+            group_id: [UUID(uid.decode()) for uid in members]
+            for group_id, members in zip(group_ids, results[1::2])
+        }
+    
+    async def get_online_counts(self, group_ids: list[UUID]) -> dict[UUID, int]:
+        """Count online users of many groups in one round trip."""
+        cutoff = time.time() - self.presence_ttl
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for group_id in group_ids:
+                pipe.zcount(self._get_presence_key(group_id), f"({cutoff}", "+inf")
+            counts = await pipe.execute()
+        return dict(zip(group_ids, counts))
     
     async def is_user_online(self, user_id: UUID, group_id: UUID) -> bool:
         """Check if a user is online in a group."""
         key = self._get_presence_key(group_id)
-        return bool(await self._redis.sismember(key, str(user_id)))
+        last_seen = await self._redis.zscore(key, str(user_id))
+        return last_seen is not None and last_seen > time.time() - self.presence_ttl
     
     def _get_presence_key(self, group_id: UUID) -> str:
         """Get Redis key for group presence."""
-        return f"presence:group:{group_id}"
\ No newline at end of file
+        return f"presence:group:{group_id}"
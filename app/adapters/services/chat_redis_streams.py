@@ -0,0 +1,232 @@
+import asyncio
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.adapters.services.chat_redis_pubsub import RedisPubSub
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Chat messages go through the group stream and can be replayed. Deltas
+# (superseded by their message), typing and joins/leaves only matter live
+# and stay on pub/sub, so they never use up the stream cap.
+STREAMED_EVENT_TYPES = frozenset({"message"})
+
+
+class RedisStreamPubSub(RedisPubSub):
+    """
+    Durable chat relay on Redis Streams: same events as RedisPubSub, but
+    chat messages are kept in a capped stream per group, so they can be
+    replayed to a client that reconnects. Message deltas, typing and
+    join/leave events still go over pub/sub, so a late delta can arrive
+    after its final message; clients ignore deltas of a finished message.
+
+    LAYOUT:
+    - chat:stream:{group_id}   STREAM type, event (JSON text)
+      capped at about maxlen entries, dropped after ttl seconds idle
+
+    READING:
+    One reader task blocks on a single XREAD over every subscribed stream,
+    remembering the last id seen per stream; a Redis hiccup only delays
+    delivery, since the reader resumes from those ids. Subscribing starts
+    at the stream's current end. Stream events reach callbacks as JSON
+    text with their stream id appended as "event_id".
+
+    REPLAY:
+    A client passes the last event_id it saw; get_events_since returns the
+    chat messages after it, up to where the reader has got (the rest
+    reach the client live), or None if the stream no longer reaches back
+    that far (or more than replay_limit events were missed).
+
+    Needs Redis 6.2+ (exclusive XRANGE).
+    """
+
+    READ_COUNT = 500  # entries per XREAD
+
+    def __init__(
+        self,
+        redis_url: str,
+        maxlen: int = 1000,
+        ttl: int = 24 * 3600,
+        replay_limit: int = 500,
+    ):
+        super().__init__(redis_url)
+        self._reader_redis: Any  # redis.asyncio.Redis, blocked in XREAD
+        self._maxlen = maxlen
+        self._ttl = ttl
+        self._replay_limit = replay_limit
+        self._stream_callbacks: Dict[str, Callable] = {}  # stream -> callback
+        self._offsets: Dict[str, str] = {}  # stream -> last id read
+        self._has_streams = asyncio.Event()
+        self._stream_reader: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        """Initialize Redis connections."""
+        await super().connect()
+        # The stream reader blocks in XREAD, so it gets its own connection
+        self._reader_redis = await redis.from_url(
+            self.redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+        self._stream_reader = asyncio.create_task(self._read_streams())
+
+    async def disconnect(self):
+        """Close Redis connections."""
+        if self._stream_reader:
+            self._stream_reader.cancel()
+            await asyncio.gather(self._stream_reader, return_exceptions=True)
+            self._stream_reader = None
+        self._stream_callbacks.clear()
+        self._offsets.clear()
+
+        if self._reader_redis:
+            await self._reader_redis.close()
+
+        await super().disconnect()
+
+    async def subscribe_to_group(self, group_id: UUID, callback) -> None:
+        """
+        Start delivering a group's new events to callback.
+
+        Args:
+            group_id: ChatGroup to subscribe to
+            callback: async function(payload: str) receiving each event as its
+                JSON text; chat messages include their event_id
+        """
+        stream = self._get_stream_key(group_id)
+        if stream not in self._stream_callbacks:
+            # Everything after the current end is delivered, even if the
+            # reader only picks the stream up on its next XREAD
+            latest = await self._publisher.xrevrange(stream, count=1)
+            self._offsets[stream] = latest[0][0] if latest else "0-0"
+            self._stream_callbacks[stream] = callback
+            self._has_streams.set()
+
+        await super().subscribe_to_group(group_id, callback)
+
+    async def unsubscribe_from_group(self, group_id: UUID) -> None:
+        """Stop delivering a group's events."""
+        stream = self._get_stream_key(group_id)
+        if self._stream_callbacks.pop(stream, None) is not None:
+            self._offsets.pop(stream, None)
+
+        await super().unsubscribe_from_group(group_id)
+
+    async def get_events_since(self, group_id: UUID, last_event_id: str) -> Optional[list[str]]:
+        """Chat messages after last_event_id, or None if some are gone."""
+        try:
+            last = self._parse_id(last_event_id)
+        except ValueError:
+            return None
+
+        stream = self._get_stream_key(group_id)
+        try:
+            async with self._publisher.pipeline(transaction=False) as pipe:
+                pipe.xrange(stream, count=1)
+                pipe.xrevrange(stream, count=1)
+                pipe.xrange(stream, min=f"({last_event_id}", count=self._replay_limit + 1)
+                oldest, newest, entries = await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Replay of group {group_id} failed: {e}")
+            return None
+
+        if not oldest:
+            return None  # expired, evicted or lost in a Redis restart
+        if self._parse_id(oldest[0][0]) > last:
+            return None  # trimmed past the client's position
+        if self._parse_id(newest[0][0]) < last:
+            return None  # the client saw events this stream no longer has
+        if len(entries) > self._replay_limit:
+            return None
+
+        # Entries the reader has not reached yet will be delivered live;
+        # replaying them too would send them twice
+        offset = self._offsets.get(stream)
+        delivered = self._parse_id(offset) if offset else (0, 0)
+        return [
+            self._with_event_id(fields["event"], entry_id)
+            for entry_id, fields in entries
+            if self._parse_id(entry_id) <= delivered
+        ]
+
+    async def _publish(self, group_id: UUID, event: dict) -> None:
+        """Append a chat message to the group's stream (one round trip)."""
+        if event["type"] not in STREAMED_EVENT_TYPES:
+            await super()._publish(group_id, event)
+            return
+
+        stream = self._get_stream_key(group_id)
+        async with self._publisher.pipeline(transaction=False) as pipe:
+            pipe.xadd(
+                stream,
+                {"type": event["type"], "event": json.dumps(event)},
+                maxlen=self._maxlen,
+                approximate=True,
+            )
+            pipe.expire(stream, self._ttl)
+            await pipe.execute()
+
+    async def _read_streams(self) -> None:
+        """
+        The stream reader: XREAD every subscribed stream from its last id
+        and route each entry to the stream's callback, in order.
+        """
+        while True:
+            try:
+                if not self._offsets:
+                    # Nothing to read until the first subscription
+                    self._has_streams.clear()
+                    await self._has_streams.wait()
+                    continue
+
+                response = await self._reader_redis.xread(
+                    dict(self._offsets),
+                    count=self.READ_COUNT,
+                    block=int(self.READ_TIMEOUT * 1000),
+                )
+
+                for stream, entries in response or []:
+                    for entry_id, fields in entries:
+                        callback = self._stream_callbacks.get(stream)
+                        if callback is None:
+                            # Unsubscribed while the entries were in flight
+                            metrics.inc("pubsub_messages_total", outcome="unrouted")
+                            break
+                        if self._parse_id(entry_id) <= self._parse_id(self._offsets[stream]):
+                            continue  # read before a resubscribe moved the offset on
+                        self._offsets[stream] = entry_id
+
+                        try:
+                            await callback(self._with_event_id(fields["event"], entry_id))
+                            metrics.inc("pubsub_messages_total", outcome="dispatched")
+                        except Exception as e:
+                            metrics.inc("pubsub_messages_total", outcome="error")
+                            logger.error(f"Error processing event on {stream}: {e}")
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception as e:
+                # Offsets are kept, so nothing published meanwhile is lost
+                logger.error(f"Stream reader error, retrying in {self.RECONNECT_DELAY}s: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+
+    @staticmethod
+    def _with_event_id(payload: str, entry_id: str) -> str:
+        """Append the stream id to an encoded event without decoding it."""
+        return f'{payload[:-1]}, "event_id": "{entry_id}"}}'
+
+    @staticmethod
+    def _parse_id(entry_id: str) -> Tuple[int, int]:
+        """Stream id "ms-seq" as a comparable tuple (ValueError if malformed)."""
+        ms, seq = entry_id.split("-")
+        return int(ms), int(seq)
+
+    def _get_stream_key(self, group_id: UUID) -> str:
+        """Get Redis stream key for a group."""
+        return f"chat:stream:{group_id}"
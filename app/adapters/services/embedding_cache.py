@@ -0,0 +1,158 @@
+import hashlib
+from array import array
+from collections import OrderedDict
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from app.application.interfaces import IDocumentEmbedderInterface
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class CachedEmbedder(IDocumentEmbedderInterface):
+    """
+    Two-level cache in front of a query embedder.
+
+    LOOKUP ORDER:
+    1. In-process LRU (zero network)
+    2. Redis, shared by every API instance
+    3. The wrapped embedder (Ollama round trip)
+
+    Entries are keyed by (model, normalized query), so repeated and templated
+    queries – e.g. the constant quiz-generation query – are embedded once.
+    Only `embed` is cached; `embed_multiple` is used for ingestion, where
+    every chunk is unique, and passes straight through.
+    """
+
+    KEY_PREFIX = "emb"
+
+    def __init__(
+        self,
+        embedder: IDocumentEmbedderInterface,
+        redis_url: Optional[str] = None,
+        max_entries: int = 2048,
+        ttl: int = 7 * 24 * 3600,
+        model: Optional[str] = None,
+    ):
+        self._embedder = embedder
+        self._redis_url = redis_url
+        self._redis: Any = None  # redis.asyncio.Redis (stubs are sync-typed)
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._model = model or getattr(embedder, "model", embedder.__class__.__name__)
+        self._lru: OrderedDict[str, list[float]] = OrderedDict()
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    async def connect(self):
+        """Initialize the Redis connection (binary – vectors are stored packed)."""
+        if self._redis_url:
+            self._redis = await redis.from_url(self._redis_url)
+
+    async def disconnect(self):
+        """Close the Redis connection."""
+        if self._redis:
+            await self._redis.close()
+
+    async def embed(self, text: str) -> tuple[str, list[float]]:
+        """Embed a query, serving repeats from the LRU or Redis."""
+        normalized = self.normalize(text)
+        key = self._cache_key(normalized)
+
+        vector = self._lru.get(key)
+        if vector is not None:
+            self._lru.move_to_end(key)
+            self._record("memory", hit=True)
+            return text, vector
+        self._record("memory", hit=False)
+
+        vector = await self._redis_get(key)
+        if vector is not None:
+            self._record("redis", hit=True)
+            self._lru_put(key, vector)
+            return text, vector
+        if self._redis is not None:
+            self._record("redis", hit=False)
+
+        _, vector = await self._embedder.embed(normalized)
+        self._lru_put(key, vector)
+        await self._redis_set(key, vector)
+        return text, vector
+
+    async def embed_multiple(self, texts: list[str]) -> list[tuple[str, list[float]]]:
+        """Ingestion path – delegated without caching."""
+        return await self._embedder.embed_multiple(texts)
+
+    def stats(self) -> dict:
+        """Hit counts and hit rate per cache layer."""
+        result: dict = {layer: self._layer_stats(layer) for layer in ("memory", "redis")}
+        result["entries"] = len(self._lru)
+        return result
+
+    def _layer_stats(self, layer: str) -> dict:
+        hits = metrics.get_counter(
+            "embedding_cache_requests_total", layer=layer, result="hit", model=self._model
+        )
+        misses = metrics.get_counter(
+            "embedding_cache_requests_total", layer=layer, result="miss", model=self._model
+        )
+        total = hits + misses
+        return {
+            "hits": int(hits),
+            "misses": int(misses),
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace and case so trivially different queries share an entry."""
+        return " ".join(text.split()).casefold()
+
+    def _cache_key(self, normalized: str) -> str:
+        digest = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        return f"{self.KEY_PREFIX}:{self._model}:{digest}"
+
+    def _lru_put(self, key: str, vector: list[float]) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self._max_entries:
+            self._lru.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> Optional[list[float]]:
+        if self._redis is None:
+            return None
+        try:
+            data = await self._redis.get(key)
+        except Exception as e:
+            logger.warning(f"Embedding cache read failed: {e}")
+            return None
+        if not data:
+            return None
+        return array("f", data).tolist()
+
+    async def _redis_set(self, key: str, vector: list[float]) -> None:
+        if self._redis is None:
+            return
+        try:
+            await self._redis.setex(key, self._ttl, array("f", vector).tobytes())
+        except Exception as e:
+            logger.warning(f"Embedding cache write failed: {e}")
+
+    def _record(self, layer: str, hit: bool) -> None:
+        metrics.inc(
+            "embedding_cache_requests_total",
+            layer=layer,
+            result="hit" if hit else "miss",
+            model=self._model,
+        )
+        metrics.set_gauge(
+            "embedding_cache_hit_rate",
+            self._layer_stats(layer)["hit_rate"],
+            layer=layer,
+            model=self._model,
+        )
@@ -41,18 +41,27 @@ class JWTAuth(IJwtService):
 
     # ── JWT ─────────────────────────────────────────────────────
 
-    def _create_token(self, user_id: uuid.UUID, expires_delta: timedelta, token_type: str) -> str:
+    def _create_token(
+        self,
+        user_id: uuid.UUID,
+        expires_delta: timedelta,
+        token_type: str,
+        claims: Optional[dict] = None,
+    ) -> str:
         payload = {
             "sub": str(user_id),
             "type": token_type,
             "exp": datetime.utcnow() + expires_delta,
             "iat": datetime.utcnow(),
+            **(claims or {}),
         }
         return jwt.encode(payload, self._secret, algorithm=self._algorithm)
 
-    def create_tokens(self, user_id: uuid.UUID) -> TokenPair:
+    def create_tokens(self, user_id: uuid.UUID, username: Optional[str] = None) -> TokenPair:
+        # Display name for the chat handshake; signed, so no lookup is needed
+        claims = {"username": username} if username else None
         return TokenPair(
-            access_token=self._create_token(user_id, self._access_expire, "access"),
+            access_token=self._create_token(user_id, self._access_expire, "access", claims),
             refresh_token=self._create_token(user_id, self._refresh_expire, "refresh"),
         )
 
@@ -0,0 +1,156 @@
+import asyncio
+import hashlib
+import json
+from typing import AsyncGenerator, Dict, List, Optional
+
+from app.application.interfaces.llm_interface import ILLMInterface
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class _StreamBroadcast:
+    """
+    One upstream token stream fanned out to any number of subscribers.
+
+    Tokens are buffered, so a subscriber that joins late first replays what
+    was already produced and then follows the live stream. The upstream call
+    is cancelled once the last subscriber goes away.
+    """
+
+    def __init__(self, source: AsyncGenerator[str, None]) -> None:
+        self._source = source
+        self._tokens: List[str] = []
+        self._done = False
+        self._abandoned = False
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+        self._subscribers = 0
+        self._task = asyncio.create_task(self._pump())
+
+    @property
+    def done(self) -> bool:
+        """True once finished or abandoned; new callers must not attach."""
+        return self._done or self._abandoned
+
+    async def _pump(self) -> None:
+        try:
+            async for token in self._source:
+                async with self._changed:
+                    self._tokens.append(token)
+                    self._changed.notify_all()
+        except asyncio.CancelledError:
+            self._error = ConnectionAbortedError("LLM stream cancelled")
+            raise
+        except Exception as e:
+            self._error = e
+        finally:
+            async with self._changed:
+                self._done = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncGenerator[str, None]:
+        self._subscribers += 1
+        position = 0
+        try:
+            while True:
+                async with self._changed:
+                    await self._changed.wait_for(
+                        lambda: position < len(self._tokens) or self._done
+                    )
+                    pending = self._tokens[position:]
+                    finished = self._done
+                position += len(pending)
+                for token in pending:
+                    yield token
+                if finished and position >= len(self._tokens):
+                    break
+            if self._error is not None:
+                raise self._error
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and not self._done:
+                self._abandoned = True
+                self._task.cancel()
+
+
+class CoalescingLLM(ILLMInterface):
+    """
+    Single-flight wrapper around an LLM.
+
+    Identical calls – same model, system message, prompt and parameters –
+    that arrive while one is already running attach to it instead of
+    starting another generation:
+    - complete:        late callers await the leader's result
+    - complete_stream: late callers join a fan-out of the leader's tokens
+
+    Only in-flight calls are shared; nothing is cached after completion.
+    """
+
+    def __init__(self, llm: ILLMInterface) -> None:
+        self._llm = llm
+        self._completions: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _StreamBroadcast] = {}
+
+    @property
+    def model_name(self) -> str:
+        return self._llm.model_name
+
+    async def complete(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 1000
+    ) -> str:
+        key = self._key("complete", prompt, system_message, max_tokens)
+        task = self._completions.get(key)
+
+        coalesced = task is not None
+        if task is None:
+            task = asyncio.create_task(self._llm.complete(prompt, system_message, max_tokens))
+            self._completions[key] = task
+            task.add_done_callback(lambda _: self._completions.pop(key, None))
+        self._record("complete", coalesced)
+
+        # Shield so one caller going away does not cancel the call for the others
+        return await asyncio.shield(task)
+
+    async def complete_stream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 1000
+    ) -> AsyncGenerator[str, None]:
+        key = self._key("stream", prompt, system_message, max_tokens)
+        broadcast = self._streams.get(key)
+
+        coalesced = broadcast is not None and not broadcast.done
+        if not coalesced:
+            broadcast = _StreamBroadcast(self._llm.complete_stream(prompt, system_message, max_tokens))
+            self._streams[key] = broadcast
+        self._record("stream", coalesced)
+
+        subscription = broadcast.subscribe()
+        try:
+            async for token in subscription:
+                yield token
+        finally:
+            # Close explicitly so a departing caller is unsubscribed right away
+            await subscription.aclose()
+            if broadcast.done and self._streams.get(key) is broadcast:
+                del self._streams[key]
+
+    def _key(self, mode: str, prompt: str, system_message: Optional[str], max_tokens: int) -> str:
+        raw = json.dumps([mode, self.model_name, system_message, prompt, max_tokens])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _record(self, mode: str, coalesced: bool) -> None:
+        metrics.inc("llm_calls_total", model=self.model_name, mode=mode, coalesced=coalesced)
+        if coalesced:
+            logger.debug(f"Coalesced identical in-flight {mode} call on {self.model_name}")
+        metrics.set_gauge(
+            "llm_inflight_calls",
+            len(self._completions) + len(self._streams),
+            model=self.model_name,
+        )
@@ -0,0 +1,133 @@
+from typing import Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.application.interfaces.llm_interface import ILLMInterface
+from app.core.config import Settings
+from app.core.logging import get_logger
+
+from .llm_coalescing import CoalescingLLM
+from .llm_routing import RoutingLLM
+from .llm_service import OllamaLLM, OpenAILLM, llm_timeout
+
+logger = get_logger(__name__)
+
+
+class LLMGateway:
+    """
+    Owns one long-lived, pooled HTTP client per LLM provider.
+
+    Clients are created once at startup and shared by every request, so
+    completions reuse warm keep-alive connections instead of paying for
+    TCP/TLS setup each time. `get_llm` hands out lightweight LLM adapters
+    bound to those clients.
+    """
+
+    def __init__(self, settings: Settings) -> None:
+        self._settings = settings
+        self._ollama_client: Optional[httpx.AsyncClient] = None
+        self._openai_client: Optional[AsyncOpenAI] = None
+        self._llm: Optional[ILLMInterface] = None
+
+    async def start(self) -> None:
+        """Create the pooled clients (idempotent)."""
+        s = self._settings
+        if self._ollama_client is None:
+            self._ollama_client = self._build_http_client()
+
+        if self._openai_client is None and s.OPENAI_API_KEY:
+            self._openai_client = AsyncOpenAI(
+                api_key=s.OPENAI_API_KEY,
+                http_client=self._build_http_client(),
+                max_retries=s.LLM_MAX_RETRIES,
+            )
+
+        logger.info(
+            f"LLM gateway started (http2={self._http2_enabled()}, "
+            f"max_connections={s.LLM_HTTP_MAX_CONNECTIONS})"
+        )
+
+    async def close(self) -> None:
+        """Close the pooled clients and their connections."""
+        if self._ollama_client is not None:
+            await self._ollama_client.aclose()
+            self._ollama_client = None
+
+        if self._openai_client is not None:
+            await self._openai_client.close()
+            self._openai_client = None
+
+        self._llm = None
+
+    def get_llm(self) -> ILLMInterface:
+        """
+        Return the LLM for the configured providers, bound to the pooled clients.
+
+        With fallbacks configured, calls are routed across providers with
+        failover (and hedging when LLM_HEDGE_AFTER_SECONDS is set). Once
+        started, the same instance is shared by every request so that
+        routing stats accumulate and identical in-flight calls coalesce.
+        """
+        if self._llm is not None:
+            return self._llm
+
+        s = self._settings
+        providers = [self._build_provider(name) for name in self._provider_names()]
+        llm: ILLMInterface
+        if len(providers) == 1:
+            llm = providers[0]
+        else:
+            llm = RoutingLLM(
+                providers,
+                hedge_after=s.LLM_HEDGE_AFTER_SECONDS,
+                cooldown=s.LLM_ROUTING_COOLDOWN,
+                slow_after=s.LLM_ROUTING_SLOW_SECONDS,
+            )
+
+        if s.LLM_COALESCING_ENABLED:
+            llm = CoalescingLLM(llm)
+
+        if self._ollama_client is not None:
+            self._llm = llm
+        return llm
+
+    def _provider_names(self) -> list[str]:
+        """Primary provider first, then fallbacks – skipping any not configured."""
+        s = self._settings
+        names: list[str] = []
+        for name in [s.LLM_PROVIDER, *s.LLM_FALLBACK_PROVIDERS]:
+            name = name.lower()
+            if name == "openai" and not s.OPENAI_API_KEY:
+                continue
+            if name in ("openai", "ollama") and name not in names:
+                names.append(name)
+        return names or ["ollama"]
+
+    def _build_provider(self, name: str) -> ILLMInterface:
+        s = self._settings
+        if name == "openai":
+            return OpenAILLM(api_key=s.OPENAI_API_KEY, model=s.OPENAI_MODEL, client=self._openai_client)
+        return OllamaLLM(host=s.OLLAMA_HOST, model=s.OLLAMA_CHAT_MODEL, client=self._ollama_client)
+
+    def _build_http_client(self) -> httpx.AsyncClient:
+        s = self._settings
+        return httpx.AsyncClient(
+            http2=self._http2_enabled(),
+            limits=httpx.Limits(
+                max_connections=s.LLM_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=s.LLM_HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=s.LLM_HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=llm_timeout(s),
+        )
+
+    def _http2_enabled(self) -> bool:
+        if not self._settings.LLM_HTTP2:
+            return False
+        try:
+            import h2  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
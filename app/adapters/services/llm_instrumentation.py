@@ -0,0 +1,142 @@
+import math
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, List, Optional
+
+from app.core.logging import get_logger
+from app.core.metrics import current_use_case, metrics
+from app.domain.entities.ai_entity import LLMUsage
+
+logger = get_logger(__name__)
+
+# When set, every finished LLM call in this context appends its usage here
+llm_usage_collector: ContextVar[Optional[List[LLMUsage]]] = ContextVar(
+    "llm_usage_collector", default=None
+)
+
+
+@contextmanager
+def collect_llm_usage() -> Iterator[List[LLMUsage]]:
+    """Collect the usage of every LLM call made inside the block."""
+    usages: List[LLMUsage] = []
+    token = llm_usage_collector.set(usages)
+    try:
+        yield usages
+    finally:
+        llm_usage_collector.reset(token)
+
+
+class LLMCallTimer:
+    """
+    Measures one LLM call and records it on completion.
+
+    Providers feed it tokens as they arrive and the usage numbers they
+    report; `finish` fills any gaps with estimates, then publishes:
+    - metrics summaries: llm_latency_seconds, llm_ttft_seconds,
+      llm_prompt_tokens, llm_completion_tokens, llm_tokens_per_second
+    - counters: llm_prompt_tokens_total, llm_completion_tokens_total
+    - one structured log line (fields bound via loguru)
+    all labelled by model, use case and mode.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, model: str, mode: str, prompt: str, system_message: Optional[str] = None) -> None:
+        self._model = model
+        self._mode = mode
+        self._use_case = current_use_case.get()
+        self._prompt_chars = len(prompt) + len(system_message or "")
+        self._completion_chars = 0
+        self._started = time.perf_counter()
+        self._first_token_at: Optional[float] = None
+        self._prompt_tokens: Optional[int] = None
+        self._completion_tokens: Optional[int] = None
+        self._generation_seconds: Optional[float] = None
+
+    def token(self, text: str) -> None:
+        if self._first_token_at is None:
+            self._first_token_at = time.perf_counter()
+        self._completion_chars += len(text)
+
+    def usage(
+        self,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        generation_seconds: Optional[float] = None,
+    ) -> None:
+        """Provider-reported counts (and pure generation time, when known)."""
+        if prompt_tokens is not None:
+            self._prompt_tokens = prompt_tokens
+        if completion_tokens is not None:
+            self._completion_tokens = completion_tokens
+        if generation_seconds:
+            self._generation_seconds = generation_seconds
+
+    def finish(self, ok: bool = True) -> LLMUsage:
+        latency = time.perf_counter() - self._started
+        ttft = (
+            self._first_token_at - self._started
+            if self._mode == "stream" and self._first_token_at is not None
+            else None
+        )
+        estimated = self._prompt_tokens is None or self._completion_tokens is None
+        prompt_tokens = self._prompt_tokens if self._prompt_tokens is not None else self._estimate(self._prompt_chars)
+        completion_tokens = (
+            self._completion_tokens if self._completion_tokens is not None else self._estimate(self._completion_chars)
+        )
+
+        # Prefer the provider's own generation time; otherwise exclude time to first token
+        generation = self._generation_seconds or (latency - ttft if ttft is not None else latency)
+        tokens_per_second = completion_tokens / generation if generation > 0 else 0.0
+
+        usage = LLMUsage(
+            model=self._model,
+            use_case=self._use_case,
+            mode=self._mode,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency=latency,
+            ttft=ttft,
+            tokens_per_second=tokens_per_second,
+            estimated=estimated,
+        )
+        self._record(usage, ok)
+        return usage
+
+    def _record(self, usage: LLMUsage, ok: bool) -> None:
+        labels = {"model": usage.model, "use_case": usage.use_case, "mode": usage.mode}
+        metrics.inc("llm_requests_total", ok=ok, **labels)
+        metrics.observe("llm_latency_seconds", usage.latency, **labels)
+        if not ok:
+            logger.bind(**labels, latency=round(usage.latency, 3)).warning("LLM call failed")
+            return
+
+        if usage.ttft is not None:
+            metrics.observe("llm_ttft_seconds", usage.ttft, **labels)
+        metrics.observe("llm_prompt_tokens", usage.prompt_tokens, **labels)
+        metrics.observe("llm_completion_tokens", usage.completion_tokens, **labels)
+        metrics.observe("llm_tokens_per_second", usage.tokens_per_second, **labels)
+        metrics.inc("llm_prompt_tokens_total", usage.prompt_tokens, **labels)
+        metrics.inc("llm_completion_tokens_total", usage.completion_tokens, **labels)
+
+        logger.bind(
+            **labels,
+            latency=round(usage.latency, 3),
+            ttft=round(usage.ttft, 3) if usage.ttft is not None else None,
+            prompt_tokens=usage.prompt_tokens,
+            completion_tokens=usage.completion_tokens,
+            tokens_per_second=round(usage.tokens_per_second, 1),
+            estimated=usage.estimated,
+        ).info(
+            f"LLM {usage.mode} {usage.model} [{usage.use_case}]: {usage.latency:.2f}s, "
+            f"{usage.prompt_tokens}+{usage.completion_tokens} tokens, {usage.tokens_per_second:.1f} tok/s"
+        )
+
+        collector = llm_usage_collector.get()
+        if collector is not None:
+            collector.append(usage)
+
+    @classmethod
+    def _estimate(cls, chars: int) -> int:
+        return math.ceil(chars / cls.CHARS_PER_TOKEN)
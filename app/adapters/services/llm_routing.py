@@ -0,0 +1,284 @@
+import asyncio
+import statistics
+import time
+from collections import deque
+from typing import AsyncGenerator, Deque, Dict, Iterable, List, Optional, Tuple
+
+from app.application.interfaces.llm_interface import ILLMInterface
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class _ProviderStats:
+    """Rolling latency / error window for one provider."""
+
+    def __init__(self, window: int) -> None:
+        self._samples: Deque[Tuple[float, bool]] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+
+    def record(self, latency: float, ok: bool) -> None:
+        self._samples.append((latency, ok))
+        self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+
+    def trip(self, cooldown: float) -> None:
+        """Take the provider out of rotation, with a clean slate when it returns."""
+        self.cooldown_until = time.monotonic() + cooldown
+        self.consecutive_failures = 0
+        self._samples.clear()
+
+    @property
+    def count(self) -> int:
+        return len(self._samples)
+
+    @property
+    def error_rate(self) -> float:
+        if not self._samples:
+            return 0.0
+        return sum(1 for _, ok in self._samples if not ok) / len(self._samples)
+
+    @property
+    def median_latency(self) -> Optional[float]:
+        latencies = [latency for latency, ok in self._samples if ok]
+        return statistics.median(latencies) if latencies else None
+
+
+class RoutingLLM(ILLMInterface):
+    """
+    Routes calls across several LLM providers.
+
+    ROUTING:
+    - Providers are tried in their configured order, skipping unhealthy ones
+      first: cooling down, then (when `slow_after` is set) those whose rolling
+      median latency exceeds it. Stats are kept per mode: total latency for
+      `complete`, time to first token for `complete_stream`.
+    - A failed call falls through to the next provider. A provider that
+      fails `max_consecutive_failures` times in a row, or whose rolling error
+      rate reaches `max_error_rate`, cools down for `cooldown` seconds and
+      then gets a fresh window.
+    - With `hedge_after` set, a second provider is started when the first has
+      not answered (or, for streams, produced a token) within that many
+      seconds; whichever responds first wins and the other is cancelled.
+
+    Once a stream has yielded tokens it is committed to its provider; a
+    failure after that point is raised rather than retried elsewhere.
+    """
+
+    def __init__(
+        self,
+        providers: List[ILLMInterface],
+        hedge_after: Optional[float] = None,
+        window: int = 50,
+        max_consecutive_failures: int = 3,
+        max_error_rate: float = 0.5,
+        cooldown: float = 30.0,
+        slow_after: Optional[float] = None,
+    ) -> None:
+        if not providers:
+            raise ValueError("RoutingLLM needs at least one provider")
+        self._providers = providers
+        self._hedge_after = hedge_after
+        self._max_consecutive_failures = max_consecutive_failures
+        self._max_error_rate = max_error_rate
+        self._cooldown = cooldown
+        self._slow_after = slow_after
+        self._stats: Dict[Tuple[int, str], _ProviderStats] = {
+            (id(p), mode): _ProviderStats(window)
+            for p in providers
+            for mode in ("complete", "stream")
+        }
+
+    @property
+    def model_name(self) -> str:
+        return self._ordered("complete")[0].model_name
+
+    def stats(self, mode: str = "complete") -> List[dict]:
+        """Current routing view for *mode*, best provider first."""
+        now = time.monotonic()
+        view = []
+        for p in self._ordered(mode):
+            stats = self._stats[(id(p), mode)]
+            view.append({
+                "model": p.model_name,
+                "error_rate": round(stats.error_rate, 4),
+                "median_latency": stats.median_latency,
+                "cooling_down": stats.cooldown_until > now,
+            })
+        return view
+
+    async def complete(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 1000
+    ) -> str:
+        candidates = iter(self._ordered("complete"))
+        running: Dict[asyncio.Task, Tuple[ILLMInterface, float]] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch(hedge: bool = False) -> bool:
+            provider = next(candidates, None)
+            if provider is None:
+                return False
+            if hedge:
+                metrics.inc("llm_hedged_requests_total", model=provider.model_name, mode="complete")
+            task = asyncio.create_task(provider.complete(prompt, system_message, max_tokens))
+            running[task] = (provider, time.monotonic())
+            return True
+
+        launch()
+        hedged = False
+        try:
+            while running:
+                timeout = self._hedge_after if not hedged and len(running) == 1 else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch(hedge=True)
+                    hedged = True
+                    continue
+
+                for task in done:
+                    provider, started = running.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        self._record(provider, "complete", time.monotonic() - started, ok=True)
+                        return task.result()
+                    last_error = error
+                    self._record(provider, "complete", time.monotonic() - started, ok=False, error=error)
+
+                if not running:
+                    launch()
+        finally:
+            await self._cancel(running)
+
+        raise last_error or RuntimeError("No LLM provider available")
+
+    async def complete_stream(
+        self,
+        prompt: str,
+        system_message: Optional[str] = None,
+        max_tokens: int = 1000
+    ) -> AsyncGenerator[str, None]:
+        candidates = iter(self._ordered("stream"))
+        running: Dict[asyncio.Task, Tuple[ILLMInterface, AsyncGenerator[str, None], float]] = {}
+        last_error: Optional[BaseException] = None
+
+        def launch(hedge: bool = False) -> bool:
+            provider = next(candidates, None)
+            if provider is None:
+                return False
+            if hedge:
+                metrics.inc("llm_hedged_requests_total", model=provider.model_name, mode="stream")
+            stream = provider.complete_stream(prompt, system_message, max_tokens)
+            task = asyncio.ensure_future(stream.__anext__())
+            running[task] = (provider, stream, time.monotonic())
+            return True
+
+        winner: Optional[Tuple[ILLMInterface, AsyncGenerator[str, None], float]] = None
+        first_token: Optional[str] = None
+
+        launch()
+        hedged = False
+        try:
+            # Race for the first token
+            while running and winner is None:
+                timeout = self._hedge_after if not hedged and len(running) == 1 else None
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    launch(hedge=True)
+                    hedged = True
+                    continue
+
+                for task in done:
+                    provider, stream, started = running.pop(task)
+                    error = task.exception()
+                    if error is None or isinstance(error, StopAsyncIteration):
+                        if winner is None:
+                            winner = (provider, stream, started)
+                            first_token = None if error else task.result()
+                            continue
+                    else:
+                        last_error = error
+                        self._record(provider, "stream", time.monotonic() - started, ok=False, error=error)
+                    await stream.aclose()
+
+                if winner is None and not running:
+                    launch()
+        finally:
+            await self._cancel(running, streams=[s for _, s, _ in running.values()])
+
+        if winner is None:
+            raise last_error or RuntimeError("No LLM provider available")
+
+        provider, stream, started = winner
+        self._record(provider, "stream", time.monotonic() - started, ok=True)
+        if first_token is None:
+            return
+
+        try:
+            yield first_token
+            async for token in stream:
+                yield token
+        except Exception as e:
+            self._record(provider, "stream", time.monotonic() - started, ok=False, error=e)
+            raise
+        finally:
+            await stream.aclose()
+
+    def _ordered(self, mode: str) -> List[ILLMInterface]:
+        now = time.monotonic()
+
+        def key(item: Tuple[int, ILLMInterface]):
+            index, provider = item
+            stats = self._stats[(id(provider), mode)]
+            latency = stats.median_latency
+            slow = self._slow_after is not None and latency is not None and latency > self._slow_after
+            return (stats.cooldown_until > now, slow, index)
+
+        return [p for _, p in sorted(enumerate(self._providers), key=key)]
+
+    def _record(
+        self,
+        provider: ILLMInterface,
+        mode: str,
+        latency: float,
+        ok: bool,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        stats = self._stats[(id(provider), mode)]
+        stats.record(latency, ok)
+        metrics.inc("llm_provider_requests_total", model=provider.model_name, mode=mode, ok=ok)
+
+        if not ok:
+            logger.warning(f"LLM provider {provider.model_name} failed: {error!r}")
+            if (
+                stats.consecutive_failures >= self._max_consecutive_failures
+                or (stats.count >= 5 and stats.error_rate >= self._max_error_rate)
+            ):
+                stats.trip(self._cooldown)
+                logger.warning(
+                    f"LLM provider {provider.model_name} cooling down for {self._cooldown}s"
+                )
+
+        metrics.set_gauge(
+            "llm_provider_error_rate", stats.error_rate, model=provider.model_name, mode=mode
+        )
+
+    @staticmethod
+    async def _cancel(
+        tasks: Iterable[asyncio.Future],
+        streams: Iterable[AsyncGenerator[str, None]] = (),
+    ) -> None:
+        """Cancel losing / abandoned calls and close the streams they hold."""
+        tasks = list(tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for stream in streams:
+            await stream.aclose()
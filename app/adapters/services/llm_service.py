@@ -1,23 +1,43 @@
 import json
-from typing import AsyncGenerator, Optional
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional
 
 import httpx
 from openai import AsyncOpenAI
 
 from app.application.interfaces.llm_interface import ILLMInterface
-from app.core.config import settings
+from app.core.config import Settings, settings
 from app.core.logging import get_logger
 
+from .llm_instrumentation import LLMCallTimer
+
 logger = get_logger(__name__)
 
 
+def llm_timeout(config: Settings = settings) -> httpx.Timeout:
+    """Connect/read/write/pool timeouts for LLM calls."""
+    return httpx.Timeout(
+        connect=config.LLM_CONNECT_TIMEOUT,
+        read=config.LLM_READ_TIMEOUT,
+        write=config.LLM_WRITE_TIMEOUT,
+        pool=config.LLM_POOL_TIMEOUT,
+    )
+
+
 class OpenAILLM(ILLMInterface):
     """OpenAI implementation of the LLM interface."""
 
-    def __init__(self, api_key: str, model: str = "gpt-4") -> None:
-        self._client = AsyncOpenAI(api_key=api_key)
+    def __init__(
+        self, api_key: str, model: str = "gpt-4", client: Optional[AsyncOpenAI] = None
+    ) -> None:
+        # Prefer the gateway's pooled client; a private one is only for scripts/workers
+        self._client = client or AsyncOpenAI(api_key=api_key, timeout=llm_timeout())
         self._model = model
 
+    @property
+    def model_name(self) -> str:
+        return self._model
+
     async def complete(
         self, 
         prompt: str, 
@@ -29,6 +49,8 @@ class OpenAILLM(ILLMInterface):
             messages.append({"role": "system", "content": system_message})
         messages.append({"role": "user", "content": prompt})
 
+        timer = LLMCallTimer(self._model, "complete", prompt, system_message)
+        ok = False
         try:
             response = await self._client.chat.completions.create(
                 model=self._model,
@@ -36,10 +58,17 @@ class OpenAILLM(ILLMInterface):
                 max_tokens=max_tokens,
                 temperature=0.7,
             )
-            return response.choices[0].message.content or ""
+            content = response.choices[0].message.content or ""
+            timer.token(content)
+            if response.usage:
+                timer.usage(response.usage.prompt_tokens, response.usage.completion_tokens)
+            ok = True
+            return content
         except Exception as e:
             logger.error(f"OpenAI completion error: {e}")
             raise
+        finally:
+            timer.finish(ok)
 
 
     async def complete_stream(
@@ -53,6 +82,8 @@ class OpenAILLM(ILLMInterface):
             messages.append({"role": "system", "content": system_message})
         messages.append({"role": "user", "content": prompt})
 
+        timer = LLMCallTimer(self._model, "stream", prompt, system_message)
+        ok = False
         try:
             stream = await self._client.chat.completions.create(
                 model=self._model,
@@ -60,22 +91,46 @@ class OpenAILLM(ILLMInterface):
                 max_tokens=max_tokens,
                 temperature=0.7,
                 stream=True,
+                stream_options={"include_usage": True},
             )
             async for chunk in stream:
+                # The final chunk carries usage only, with no choices
+                if chunk.usage:
+                    timer.usage(chunk.usage.prompt_tokens, chunk.usage.completion_tokens)
+                if not chunk.choices:
+                    continue
                 content = chunk.choices[0].delta.content
                 if content:
+                    timer.token(content)
                     yield content
+            ok = True
         except Exception as e:
             logger.error(f"OpenAI stream completion error: {e}")
             raise
+        finally:
+            timer.finish(ok)
 
 
 class OllamaLLM(ILLMInterface):
     """Ollama implementation of the LLM interface."""
 
-    def __init__(self, host: str, model: str) -> None:
+    def __init__(self, host: str, model: str, client: Optional[httpx.AsyncClient] = None) -> None:
         self._host = host.rstrip("/")
         self._model = model
+        self._client = client
+
+    @property
+    def model_name(self) -> str:
+        return self._model
+
+    @asynccontextmanager
+    async def _session(self) -> AsyncIterator[httpx.AsyncClient]:
+        """Yield the gateway's pooled client, or a short-lived one when none was given."""
+        if self._client is not None:
+            yield self._client
+            return
+        async with httpx.AsyncClient(timeout=llm_timeout()) as client:
+            yield client
 
     async def complete(
         self, 
@@ -96,15 +151,23 @@ class OllamaLLM(ILLMInterface):
             "options": {"num_predict": max_tokens}
         }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        timer = LLMCallTimer(self._model, "complete", prompt, system_message)
+        ok = False
+        async with self._session() as client:
             try:
                 response = await client.post(url, json=payload)
                 response.raise_for_status()
                 data = response.json()
-                return data["message"]["content"]
+                content = data["message"]["content"]
+                timer.token(content)
+                self._record_usage(timer, data)
+                ok = True
+                return content
             except Exception as e:
                 logger.error(f"Ollama completion error: {e}")
                 raise
+            finally:
+                timer.finish(ok)
 
     async def complete_stream(
         self, 
@@ -125,7 +188,9 @@ class OllamaLLM(ILLMInterface):
             "options": {"num_predict": max_tokens}
         }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        timer = LLMCallTimer(self._model, "stream", prompt, system_message)
+        ok = False
+        async with self._session() as client:
             try:
                 async with client.stream("POST", url, json=payload) as response:
                     response.raise_for_status()
@@ -134,9 +199,27 @@ class OllamaLLM(ILLMInterface):
                             continue
                         chunk = json.loads(line)
                         if "message" in chunk and "content" in chunk["message"]:
-                            yield chunk["message"]["content"]
+                            content = chunk["message"]["content"]
+                            if content:
+                                timer.token(content)
+                            yield content
                         if chunk.get("done"):
+                            # The final chunk carries Ollama's own token counts and timings
+                            self._record_usage(timer, chunk)
                             break
+                ok = True
             except Exception as e:
                 logger.error(f"Ollama stream completion error: {e}")
                 raise
+            finally:
+                timer.finish(ok)
+
+    @staticmethod
+    def _record_usage(timer: LLMCallTimer, data: dict) -> None:
+        """Pass on prompt_eval_count / eval_count / eval_duration (ns) from Ollama."""
+        eval_duration = data.get("eval_duration")
+        timer.usage(
+            prompt_tokens=data.get("prompt_eval_count"),
+            completion_tokens=data.get("eval_count"),
+            generation_seconds=eval_duration / 1e9 if eval_duration else None,
+        )
@@ -18,6 +18,10 @@ class OllamaEmbedder(IDocumentEmbedderInterface):
         self._api_key = api_key or settings.OLLAMA_API_KEY
         self._client = AsyncClient(host=self._host, api_key=self._api_key)
 
+    @property
+    def model(self) -> str:
+        return self._model
+
     async def embed(self, text: str) -> tuple[str, list[float]]:
         """Embed a single text string and return (text, vector)."""
         response = await self._client.embed(model=self._model, input=text)
@@ -5,24 +5,61 @@ from qdrant_client import QdrantClient, models
 
 from app.application.interfaces import IVectorStoreInterface
 from app.core.config import settings
-from app.domain.entities import DocumentChunksAndEmbeddings
+from app.domain.entities import (DocumentChunksAndEmbeddings, DocumentSummary,
+                                 SectionSummary)
 
 
 class QdrantVector(IVectorStoreInterface):
-    def __init__(self, host: str, port: int, api_key: Optional[str] = None):
-        self._client = QdrantClient(
+    """
+    Qdrant-backed vector store.
+
+    COLLECTIONS:
+    - QDRANT_COLLECTION_NAME            one point per chunk (fine tier)
+    - QDRANT_SUMMARY_COLLECTION_NAME    per document (coarse tier): the chunk
+                                        centroid (level=centroid), the overview
+                                        (level=document) and section summaries
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        api_key: Optional[str] = None,
+        client: Optional[QdrantClient] = None,
+    ):
+        # An injected client (e.g. QdrantClient(":memory:")) is used as-is
+        self._client = client or QdrantClient(
             host=host,
             port=port,
             api_key=api_key,
         )
         
-        if not self._client.collection_exists(settings.QDRANT_COLLECTION_NAME):
-            self._client.create_collection(
-            collection_name=settings.QDRANT_COLLECTION_NAME,
-            vectors_config=models.VectorParams(
-                size=settings.QDRANT_VECTOR_SIZE, distance=models.Distance.COSINE
-            ),
-        )
+        # Chunks (fine tier) and section / document summaries (coarse tier)
+        for collection_name in (settings.QDRANT_COLLECTION_NAME, settings.QDRANT_SUMMARY_COLLECTION_NAME):
+            if not self._client.collection_exists(collection_name):
+                self._client.create_collection(
+                    collection_name=collection_name,
+                    vectors_config=models.VectorParams(
+                        size=settings.QDRANT_VECTOR_SIZE, distance=models.Distance.COSINE
+                    ),
+                )
+            # Idempotent, so collections created before an index was added get it too
+            self._create_payload_indexes(collection_name)
+
+    def _create_payload_indexes(self, collection_name: str) -> None:
+        """Index the payload fields used as search scopes so filters stay cheap."""
+        for field, schema in (
+            ("user_id", models.PayloadSchemaType.KEYWORD),
+            ("class_id", models.PayloadSchemaType.KEYWORD),
+            ("document_id", models.PayloadSchemaType.KEYWORD),
+            ("chunk_index", models.PayloadSchemaType.INTEGER),
+            ("level", models.PayloadSchemaType.KEYWORD),
+        ):
+            self._client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field,
+                field_schema=schema,
+            )
 
     async def store_embeddings(
         self,
@@ -68,44 +105,250 @@ class QdrantVector(IVectorStoreInterface):
     async def delete_embeddings(self, document_id: str) -> None:
         from qdrant_client.models import FieldCondition, Filter, MatchValue
 
-        self._client.delete(
-            collection_name=settings.QDRANT_COLLECTION_NAME,
-            points_selector=Filter(
+        for collection_name in (settings.QDRANT_COLLECTION_NAME, settings.QDRANT_SUMMARY_COLLECTION_NAME):
+            self._client.delete(
+                collection_name=collection_name,
+                points_selector=Filter(
+                    must=[
+                        FieldCondition(
+                            key="document_id",
+                            match=MatchValue(value=document_id),
+                        )
+                    ]
+                ),
+            )
+
+    async def store_document_vector(
+        self, document_id: str, user_id: str, class_id: str, vector: list[float]
+    ) -> None:
+        from qdrant_client.models import PointStruct
+
+        self._client.upsert(
+            collection_name=settings.QDRANT_SUMMARY_COLLECTION_NAME,
+            points=[
+                PointStruct(
+                    id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{document_id}:centroid")),
+                    vector=vector,
+                    payload={
+                        "document_id": document_id,
+                        "user_id": user_id,
+                        "class_id": class_id,
+                        "level": "centroid",
+                    },
+                )
+            ],
+        )
+
+    async def search_documents(
+        self,
+        embedded_query: list[float],
+        top_k: int = 10,
+        user_id: Optional[str] = None,
+        class_id: Optional[str] = None,
+    ) -> list[dict]:
+        from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+        results = self._client.query_points(
+            collection_name=settings.QDRANT_SUMMARY_COLLECTION_NAME,
+            query=embedded_query,
+            query_filter=Filter(
                 must=[
-                    FieldCondition(
-                        key="document_id",
-                        match=MatchValue(value=document_id),
-                    )
+                    *self._scope_conditions(user_id, class_id, None, None),
+                    FieldCondition(key="level", match=MatchValue(value="centroid")),
                 ]
             ),
+            limit=top_k,
+            with_payload=["document_id"],
         )
+        return [
+            {"document_id": (r.payload or {}).get("document_id"), "score": r.score}
+            for r in results.points
+        ]
 
+    async def store_summaries(self, summary: DocumentSummary) -> None:
+        from qdrant_client.models import (FieldCondition, Filter, MatchValue,
+                                          PointStruct)
 
-    async def search_embeddings(
+        base = {
+            "document_id": summary.document_id,
+            "user_id": summary.user_id,
+            "class_id": summary.class_id,
+            "created_at": str(summary.created_at),
+        }
+        last_chunk = max((s.chunk_end for s in summary.sections), default=0)
+        points = [
+            PointStruct(
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{summary.document_id}:document")),
+                vector=summary.embedding,
+                payload={
+                    **base,
+                    "level": "document",
+                    "section_index": None,
+                    "chunk_index": 0,
+                    "chunk_range": [0, last_chunk],
+                    "content": summary.summary,
+                    "key_concepts": summary.key_concepts,
+                },
+            )
+        ]
+        for section in summary.sections:
+            points.append(
+                PointStruct(
+                    id=str(uuid.uuid5(uuid.NAMESPACE_URL, f"{summary.document_id}:section:{section.index}")),
+                    vector=section.embedding,
+                    payload={
+                        **base,
+                        "level": "section",
+                        "section_index": section.index,
+                        "chunk_index": section.chunk_start,
+                        "chunk_range": [section.chunk_start, section.chunk_end],
+                        "content": section.summary,
+                    },
+                )
+            )
+
+        # Reprocessing may yield fewer sections; drop the old summaries first
+        self._client.delete(
+            collection_name=settings.QDRANT_SUMMARY_COLLECTION_NAME,
+            points_selector=Filter(
+                must=[FieldCondition(key="document_id", match=MatchValue(value=summary.document_id))],
+                must_not=[FieldCondition(key="level", match=MatchValue(value="centroid"))],
+            ),
+        )
+        self._client.upsert(
+            collection_name=settings.QDRANT_SUMMARY_COLLECTION_NAME,
+            points=points,
+        )
+
+    async def get_document_summary(self, document_id: str) -> Optional[DocumentSummary]:
+        from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+        points, _ = self._client.scroll(
+            collection_name=settings.QDRANT_SUMMARY_COLLECTION_NAME,
+            scroll_filter=Filter(
+                must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))]
+            ),
+            limit=settings.DOCUMENT_SUMMARY_MAX_SECTIONS + 2,  # + overview and centroid
+            with_payload=True,
+            with_vectors=False,
+        )
+        payloads = [point.payload or {} for point in points]
+        overview = next((p for p in payloads if p.get("level") == "document"), None)
+        if overview is None:
+            return None
+
+        sections = sorted(
+            (
+                SectionSummary(
+                    index=p["section_index"],
+                    chunk_start=p["chunk_range"][0],
+                    chunk_end=p["chunk_range"][1],
+                    summary=p.get("content", ""),
+                )
+                for p in payloads
+                if p.get("level") == "section"
+            ),
+            key=lambda section: section.index,
+        )
+        return DocumentSummary(
+            document_id=document_id,
+            user_id=overview.get("user_id"),
+            class_id=overview.get("class_id"),
+            summary=overview.get("content", ""),
+            key_concepts=overview.get("key_concepts", []),
+            sections=sections,
+        )
+
+    async def search_summaries(
         self,
         embedded_query: list[float],
         top_k: int = 5,
         user_id: Optional[str] = None,
         class_id: Optional[str] = None,
         document_id: Optional[str] = None,
+        document_ids: Optional[list[str]] = None,
     ) -> list[dict]:
         from qdrant_client.models import FieldCondition, Filter, MatchValue
 
-        must_conditions = []
+        results = self._client.query_points(
+            collection_name=settings.QDRANT_SUMMARY_COLLECTION_NAME,
+            query=embedded_query,
+            query_filter=Filter(
+                must=self._scope_conditions(user_id, class_id, document_id, document_ids),
+                must_not=[FieldCondition(key="level", match=MatchValue(value="centroid"))],
+            ),
+            limit=top_k,
+            with_payload=True,
+        )
 
-        if user_id:
-            must_conditions.append(
-                FieldCondition(key="user_id", match=MatchValue(value=user_id))
-            )
-        
-        if class_id:
-            must_conditions.append(
-                FieldCondition(key="class_id", match=MatchValue(value=class_id))
+        result_list = []
+        for r in results.points:
+            payload = r.payload or {}
+            result_list.append({
+                "chunk_index": payload.get("chunk_index"),
+                "document_id": payload.get("document_id"),
+                "class_id": payload.get("class_id"),
+                "user_id": payload.get("user_id"),
+                "content": payload.get("content", ""),
+                "score": r.score,
+                "level": payload.get("level"),
+                "section_index": payload.get("section_index"),
+                "chunk_range": payload.get("chunk_range"),
+                "key_concepts": payload.get("key_concepts", []),
+            })
+        return result_list
+
+
+    async def get_document_chunks(self, document_id: str) -> list[dict]:
+        from qdrant_client.models import FieldCondition, Filter, MatchValue
+
+        chunks = []
+        offset = None
+        while True:
+            points, offset = self._client.scroll(
+                collection_name=settings.QDRANT_COLLECTION_NAME,
+                scroll_filter=Filter(
+                    must=[FieldCondition(key="document_id", match=MatchValue(value=document_id))]
+                ),
+                limit=256,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
             )
+            for point in points:
+                payload = point.payload or {}
+                chunks.append({
+                    "chunk_index": payload.get("chunk_index"),
+                    "document_id": payload.get("document_id"),
+                    "class_id": payload.get("class_id"),
+                    "user_id": payload.get("user_id"),
+                    "content": payload.get("content", ""),
+                })
+            if offset is None:
+                break
 
-        if document_id:
+        chunks.sort(key=lambda c: c["chunk_index"] or 0)
+        return chunks
+
+    async def search_embeddings(
+        self,
+        embedded_query: list[float],
+        top_k: int = 5,
+        user_id: Optional[str] = None,
+        class_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        document_ids: Optional[list[str]] = None,
+        chunk_range: Optional[tuple[int, int]] = None,
+        with_vectors: bool = False,
+    ) -> list[dict]:
+        from qdrant_client.models import FieldCondition, Filter, Range
+
+        must_conditions = self._scope_conditions(user_id, class_id, document_id, document_ids)
+
+        if chunk_range:
+            start, end = chunk_range
             must_conditions.append(
-                FieldCondition(key="document_id", match=MatchValue(value=document_id))
+                FieldCondition(key="chunk_index", range=Range(gte=start, lte=end))
             )
 
         results = self._client.query_points(
@@ -114,12 +357,13 @@ class QdrantVector(IVectorStoreInterface):
             query_filter=Filter(must=must_conditions),
             limit=top_k,
             with_payload=True,
+            with_vectors=with_vectors,
         )
 
         result_list = []
         for r in results.points:
             payload = r.payload or {}
-            result_list.append({
+            hit = {
                 "chunk_index": payload.get("chunk_index"),
                 "document_id": payload.get("document_id"),
                 "class_id": payload.get("class_id"),
@@ -128,5 +372,41 @@ class QdrantVector(IVectorStoreInterface):
                 "score": r.score,
                 "embedding_model": payload.get("embedding_model", "unknown"),
                 "embedding_dim": payload.get("embedding_dim", 0),
-            })
+            }
+            if with_vectors:
+                hit["vector"] = r.vector
+            result_list.append(hit)
         return result_list
+
+    @staticmethod
+    def _scope_conditions(
+        user_id: Optional[str],
+        class_id: Optional[str],
+        document_id: Optional[str],
+        document_ids: Optional[list[str]],
+    ) -> list:
+        from qdrant_client.models import FieldCondition, MatchAny, MatchValue
+
+        must_conditions = []
+
+        if user_id:
+            must_conditions.append(
+                FieldCondition(key="user_id", match=MatchValue(value=user_id))
+            )
+
+        if class_id:
+            must_conditions.append(
+                FieldCondition(key="class_id", match=MatchValue(value=class_id))
+            )
+
+        if document_id:
+            must_conditions.append(
+                FieldCondition(key="document_id", match=MatchValue(value=document_id))
+            )
+
+        if document_ids:
+            must_conditions.append(
+                FieldCondition(key="document_id", match=MatchAny(any=list(document_ids)))
+            )
+
+        return must_conditions
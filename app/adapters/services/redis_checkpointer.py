@@ -0,0 +1,196 @@
+from typing import Any, AsyncIterator, Optional, Sequence
+
+import redis.asyncio as redis
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import (WRITES_IDX_MAP, BaseCheckpointSaver,
+                                       ChannelVersions, Checkpoint,
+                                       CheckpointMetadata, CheckpointTuple,
+                                       get_checkpoint_id,
+                                       get_checkpoint_metadata)
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class RedisCheckpointSaver(BaseCheckpointSaver):
+    """
+    Redis-backed LangGraph checkpointer for the Nova agent.
+
+    LAYOUT:
+    - nova:checkpoint:{thread_id}:{ns}               HASH latest checkpoint of the thread
+    - nova:checkpoint:{thread_id}:{ns}:writes:{id}   HASH pending writes of that checkpoint
+
+    Only the latest checkpoint per thread is kept: the agent resumes
+    conversations but never time-travels, so history would only cost memory.
+    Every write refreshes the thread's TTL, so idle conversations expire on
+    their own. Async-only; the agent never runs the graph synchronously.
+    Writes are last-writer-wins, so callers must not run the same thread
+    concurrently (chat serializes Nova replies per group).
+    """
+
+    def __init__(self, redis_url: str, ttl: int = 7 * 24 * 3600) -> None:
+        super().__init__()
+        self.redis_url = redis_url
+        self._redis: Any  # redis.asyncio.Redis (stubs are sync-typed)
+        self._ttl = ttl
+
+    async def connect(self):
+        """Initialize Redis connection."""
+        # Checkpoints are serialized to bytes, so no response decoding
+        self._redis = await redis.from_url(self.redis_url)
+
+    async def disconnect(self):
+        """Close Redis connection."""
+        if self._redis:
+            await self._redis.close()
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+
+        saved = await self._redis.hgetall(self._get_checkpoint_key(thread_id, checkpoint_ns))
+        if not saved:
+            return None
+
+        checkpoint_id = saved[b"id"].decode()
+        requested_id = get_checkpoint_id(config)
+        if requested_id and requested_id != checkpoint_id:
+            return None  # superseded; only the latest is kept
+
+        raw_writes = await self._redis.hgetall(
+            self._get_writes_key(thread_id, checkpoint_ns, checkpoint_id)
+        )
+        pending_writes = []
+        for field, value in sorted(raw_writes.items(), key=lambda item: self._write_order(item[0])):
+            task_id, _ = self._write_order(field)
+            channel, write_value = self._loads(value)
+            pending_writes.append((task_id, channel, write_value))
+
+        parent_id = saved.get(b"parent_id", b"").decode()
+        return CheckpointTuple(
+            config={
+                "configurable": {
+                    "thread_id": thread_id,
+                    "checkpoint_ns": checkpoint_ns,
+                    "checkpoint_id": checkpoint_id,
+                }
+            },
+            checkpoint=self._loads(saved[b"checkpoint"]),
+            metadata=self._loads(saved[b"metadata"]),
+            pending_writes=pending_writes,
+            parent_config=(
+                {
+                    "configurable": {
+                        "thread_id": thread_id,
+                        "checkpoint_ns": checkpoint_ns,
+                        "checkpoint_id": parent_id,
+                    }
+                }
+                if parent_id
+                else None
+            ),
+        )
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        # Only the latest checkpoint exists, so there is at most one to list
+        if config is None or limit == 0:
+            return
+        checkpoint_tuple = await self.aget_tuple(config)
+        if checkpoint_tuple is None:
+            return
+        if before and (before_id := get_checkpoint_id(before)):
+            if checkpoint_tuple.config["configurable"]["checkpoint_id"] >= before_id:
+                return
+        if filter and not all(checkpoint_tuple.metadata.get(k) == v for k, v in filter.items()):
+            return
+        yield checkpoint_tuple
+
+    async def aput(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        parent_id = config["configurable"].get("checkpoint_id")
+        key = self._get_checkpoint_key(thread_id, checkpoint_ns)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={
+                "id": checkpoint["id"],
+                "parent_id": parent_id or "",
+                "checkpoint": self._dumps(checkpoint),
+                "metadata": self._dumps(get_checkpoint_metadata(config, metadata)),
+            })
+            pipe.expire(key, self._ttl)
+            if parent_id:
+                # The parent is overwritten, so its pending writes are dead too
+                pipe.delete(self._get_writes_key(thread_id, checkpoint_ns, parent_id))
+            await pipe.execute()
+
+        return {
+            "configurable": {
+                "thread_id": thread_id,
+                "checkpoint_ns": checkpoint_ns,
+                "checkpoint_id": checkpoint["id"],
+            }
+        }
+
+    async def aput_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        thread_id = config["configurable"]["thread_id"]
+        checkpoint_ns = config["configurable"].get("checkpoint_ns", "")
+        checkpoint_id = config["configurable"]["checkpoint_id"]
+        key = self._get_writes_key(thread_id, checkpoint_ns, checkpoint_id)
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for idx, (channel, value) in enumerate(writes):
+                write_idx = WRITES_IDX_MAP.get(channel, idx)
+                field = f"{task_id}:{write_idx}"
+                payload = self._dumps((channel, value))
+                if write_idx >= 0:
+                    # Special channels (errors, interrupts) may be overwritten
+                    pipe.hset(key, field, payload)
+                else:
+                    pipe.hsetnx(key, field, payload)
+            pipe.expire(key, self._ttl)
+            await pipe.execute()
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        keys = [key async for key in self._redis.scan_iter(match=f"nova:checkpoint:{thread_id}:*")]
+        if keys:
+            await self._redis.delete(*keys)
+
+    def _dumps(self, value: Any) -> bytes:
+        type_, data = self.serde.dumps_typed(value)
+        return type_.encode() + b"\x00" + data
+
+    def _loads(self, raw: bytes) -> Any:
+        type_, _, data = raw.partition(b"\x00")
+        return self.serde.loads_typed((type_.decode(), data))
+
+    @staticmethod
+    def _write_order(field: bytes) -> tuple:
+        task_id, _, idx = field.decode().rpartition(":")
+        return task_id, int(idx)
+
+    def _get_checkpoint_key(self, thread_id: str, checkpoint_ns: str) -> str:
+        return f"nova:checkpoint:{thread_id}:{checkpoint_ns}"
+
+    def _get_writes_key(self, thread_id: str, checkpoint_ns: str, checkpoint_id: str) -> str:
+        return f"nova:checkpoint:{thread_id}:{checkpoint_ns}:writes:{checkpoint_id}"
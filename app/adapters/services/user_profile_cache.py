@@ -0,0 +1,87 @@
+import uuid
+from typing import Any, Optional
+
+import redis.asyncio as redis
+
+from app.application.interfaces import IUserProfileCache
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.domain.entities import UserProfile
+
+logger = get_logger(__name__)
+
+
+class RedisUserProfileCache(IUserProfileCache):
+    """
+    Redis-backed cache of user display info, shared by all instances.
+
+    LAYOUT:
+    - user:profile:{user_id}   HASH username, first_name, last_name, avatar_url
+
+    Filled whenever tokens are issued and rewritten by every profile change,
+    so readers (the chat WebSocket handshake) never need the database.
+    Failures are logged and treated as misses: the cache must never break
+    login or a profile update.
+    """
+
+    def __init__(self, redis_url: str, ttl: int = 7 * 24 * 3600):
+        self.redis_url = redis_url
+        self._redis: Any  # redis.asyncio.Redis (stubs are sync-typed)
+        self._ttl = ttl
+
+    async def connect(self):
+        """Initialize Redis connection."""
+        self._redis = await redis.from_url(
+            self.redis_url,
+            encoding="utf-8",
+            decode_responses=True,
+        )
+
+    async def disconnect(self):
+        """Close Redis connection."""
+        if self._redis:
+            await self._redis.close()
+
+    async def get(self, user_id: uuid.UUID) -> Optional[UserProfile]:
+        try:
+            data = await self._redis.hgetall(self._get_profile_key(user_id))
+        except Exception as e:
+            logger.warning(f"User profile cache read failed: {e}")
+            data = None
+
+        if not data:
+            metrics.inc("user_profile_cache_total", outcome="miss")
+            return None
+
+        metrics.inc("user_profile_cache_total", outcome="hit")
+        return UserProfile(
+            user_id=user_id,
+            username=data.get("username", ""),
+            first_name=data.get("first_name", ""),
+            last_name=data.get("last_name", ""),
+            avatar_url=data.get("avatar_url") or None,
+        )
+
+    async def set(self, profile: UserProfile) -> None:
+        key = self._get_profile_key(profile.user_id)
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.hset(key, mapping={
+                    "username": profile.username,
+                    "first_name": profile.first_name,
+                    "last_name": profile.last_name,
+                    "avatar_url": profile.avatar_url or "",
+                })
+                pipe.expire(key, self._ttl)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"User profile cache write failed: {e}")
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        try:
+            await self._redis.delete(self._get_profile_key(user_id))
+        except Exception as e:
+            logger.warning(f"User profile cache invalidation failed: {e}")
+
+    def _get_profile_key(self, user_id: uuid.UUID) -> str:
+        return f"user:profile:{user_id}"
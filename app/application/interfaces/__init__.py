@@ -7,3 +7,5 @@ from .notification_interface import *
 from .document_interface import *
 from .study_session_interface import *
 from .llm_interface import *
+from .answer_cache_interface import *
+from .quiz_bank_interface import *
@@ -0,0 +1,77 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from uuid import UUID
+
+from app.domain.entities.ai_entity import CachedAnswer
+
+
+class IAnswerCacheInterface(ABC):
+    """Semantic cache of tutor answers, scoped per class and/or document."""
+
+    @staticmethod
+    def scope_for(
+        user_id: UUID,
+        class_id: Optional[UUID] = None,
+        document_id: Optional[UUID] = None,
+    ) -> str:
+        """
+        Scope of the question: a class, one document of a class, or one of
+        the user's own documents. Answers grounded in one document never
+        serve another, and answers outside a class never leave their user.
+        Class scopes are shared, so callers must check membership first.
+        """
+        if class_id and document_id:
+            return f"class:{class_id}:doc:{document_id}"
+        if class_id:
+            return f"class:{class_id}"
+        return f"user:{user_id}:doc:{document_id}"
+
+    @abstractmethod
+    async def lookup(
+        self,
+        scope: str,
+        embedding: list[float],
+        threshold: float,
+    ) -> Optional[CachedAnswer]:
+        """
+        Return the most similar cached answer in a scope.
+
+        Only answers whose cosine similarity is >= threshold and whose cited
+        documents have not changed since the answer was produced are returned.
+        """
+        ...
+
+    @abstractmethod
+    async def store(self, scope: str, entry: CachedAnswer) -> None:
+        """Cache an answer for later lookups in the same scope."""
+        ...
+
+    @abstractmethod
+    async def get_document_versions(self, document_ids: list[str]) -> Optional[dict[str, int]]:
+        """Return the current version counter of each document, or None if unavailable."""
+        ...
+
+    @abstractmethod
+    async def invalidate_document(
+        self,
+        document_id: UUID,
+        owner_id: UUID,
+        class_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Invalidate answers that may depend on a document.
+
+        Bumps the document version and drops the cached answers of its class
+        and its owner's document scope. Never raises: failures are logged.
+        """
+        ...
+
+    @abstractmethod
+    async def get_threshold(self, class_id: UUID) -> Optional[float]:
+        """Return the class-specific similarity threshold, if one was set."""
+        ...
+
+    @abstractmethod
+    async def set_threshold(self, class_id: UUID, threshold: float) -> None:
+        """Set the similarity threshold used for a class."""
+        ...
@@ -1,5 +1,6 @@
 import uuid
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from app.application.dtos import GoogleUserInfo, TokenPair
 
@@ -15,7 +16,8 @@ class IJwtService(ABC):
         ...
 
     @abstractmethod
-    def create_tokens(self, user_id: uuid.UUID) -> TokenPair:
+    def create_tokens(self, user_id: uuid.UUID, username: Optional[str] = None) -> TokenPair:
+        """Issue an access/refresh pair; the access token carries the username claim."""
         ...
 
     @abstractmethod
@@ -132,6 +132,24 @@ class IChatPubSub(ABC):
         """
         ...
     
+    @abstractmethod
+    async def publish_message_delta(
+        self,
+        group_id: UUID,
+        message_id: UUID,
+        delta: str,
+        sequence: int,
+        done: bool = False,
+        reply_to_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Publish an incremental chunk of a message that is still being generated.
+
+        Deltas share the id of the final message, which is published with
+        publish_message once complete.
+        """
+        ...
+    
     @abstractmethod
     async def publish_typing_indicator(
         self, 
@@ -158,7 +176,8 @@ class IChatPubSub(ABC):
         """
         Subscribe to a group's channel.
         
-        callback: async function that receives published messages
+        callback: async function that receives each published message as
+        its encoded JSON text
         """
         ...
     
@@ -167,6 +186,18 @@ class IChatPubSub(ABC):
         """Unsubscribe from a group's channel."""
         ...
 
+    @abstractmethod
+    async def get_events_since(self, group_id: UUID, last_event_id: str) -> Optional[list[str]]:
+        """
+        Chat messages published to a group after last_event_id, oldest
+        first, encoded as they are delivered to subscribers.
+
+        Returns None when they cannot all be replayed (no history kept,
+        or some were already trimmed); the client then reloads history
+        from the database.
+        """
+        ...
+
 
 class IChatPresenceService(ABC):
     @abstractmethod
@@ -188,6 +219,11 @@ class IChatPresenceService(ABC):
     async def is_user_online(self, user_id: UUID, group_id: UUID) -> bool:
         """Check if a user is online in a group."""
         ...
+    
+    @abstractmethod
+    async def get_online_counts(self, group_ids: list[UUID]) -> dict[UUID, int]:
+        """Count online users of many groups at once."""
+        ...
 
 
 class IChatCacheInterface(ABC):
@@ -236,4 +272,27 @@ class IChatCacheInterface(ABC):
         group_name: str,
     ) -> None:
         """Notify users of a new message (if they have notifications enabled)."""
-        ...
\ No newline at end of file
+        ...
+
+class IChatMembershipCache(ABC):
+    """Shared cache of class memberships, so hot paths skip the database."""
+
+    @abstractmethod
+    async def contains(self, group_id: UUID, user_id: UUID) -> bool:
+        """True if the user is cached as a member; False on a miss."""
+        ...
+
+    @abstractmethod
+    async def add(self, group_id: UUID, user_id: UUID) -> None:
+        """Cache a confirmed membership."""
+        ...
+
+    @abstractmethod
+    async def remove(self, group_id: UUID, user_ids: list[UUID]) -> None:
+        """Drop memberships that ended (removal or leaving)."""
+        ...
+
+    @abstractmethod
+    async def invalidate_group(self, group_id: UUID) -> None:
+        """Drop every cached membership of a class (e.g. when it is deleted)."""
+        ...
@@ -4,6 +4,7 @@ from uuid import UUID
 
 from app.domain.entities import Document
 from app.domain.entities.document_entity import (DocumentChunksAndEmbeddings,
+                                                 DocumentSummary,
                                                  ExtractedChunk)
 
 
@@ -179,7 +180,67 @@ class IVectorStoreInterface(ABC):
 
     @abstractmethod
     async def delete_embeddings(self, document_id: str) -> None:
-        """Remove all vectors belonging to a document from the store."""
+        """Remove all vectors (chunks and summaries) belonging to a document."""
+        ...
+
+    @abstractmethod
+    async def store_document_vector(
+        self, document_id: str, user_id: str, class_id: str, vector: list[float]
+    ) -> None:
+        """Store the document-level vector (chunk centroid) used to rank documents."""
+        ...
+
+    @abstractmethod
+    async def search_documents(
+        self,
+        embedded_query: list[float],
+        top_k: int = 10,
+        user_id: Optional[str] = None,
+        class_id: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Rank documents by their document-level vector.
+
+        Returns:
+            List of dicts with document_id and score, best first.
+        """
+        ...
+
+    @abstractmethod
+    async def store_summaries(self, summary: DocumentSummary) -> None:
+        """Replace a document's entries in the summary tier."""
+        ...
+
+    @abstractmethod
+    async def get_document_summary(self, document_id: str) -> Optional[DocumentSummary]:
+        """Return a document's precomputed summary (without embeddings), if any."""
+        ...
+
+    @abstractmethod
+    async def search_summaries(
+        self,
+        embedded_query: list[float],
+        top_k: int = 5,
+        user_id: Optional[str] = None,
+        class_id: Optional[str] = None,
+        document_id: Optional[str] = None,
+        document_ids: Optional[list[str]] = None,
+    ) -> list[dict]:
+        """
+        Return the top-k most similar section / document summaries.
+
+        Hits are shaped like chunk hits (chunk_index is the section's first
+        chunk) plus level ('section' | 'document') and chunk_range.
+        """
+        ...
+
+    @abstractmethod
+    async def get_document_chunks(self, document_id: str) -> list[dict]:
+        """
+        Return every chunk of a document, ordered by chunk_index.
+
+        Each dict has chunk_index, document_id, class_id, user_id and content.
+        """
         ...
 
     @abstractmethod
@@ -190,14 +251,22 @@ class IVectorStoreInterface(ABC):
         user_id: Optional[str] = None,
         class_id: Optional[str] = None,
         document_id: Optional[str] = None,
+        document_ids: Optional[list[str]] = None,
+        chunk_range: Optional[tuple[int, int]] = None,
+        with_vectors: bool = False,
     ) -> list[dict[str, str | int]]:
         """
-        Embed a query string and return the top-k most similar chunks.
+        Return the top-k most similar chunks to an embedded query.
 
-        Uses the same model stored on the indexed chunks for consistency.
+        Scopes are applied inside the vector query, so every hit returned
+        already matches them:
+          - document_id:  a single document
+          - document_ids: any of several documents
+          - chunk_range:  inclusive (start, end) range of chunk_index
 
         Returns:
             List of dicts with keys:
-              - chunk_id, document_id, content, score, embedding_model
+              - chunk_index, document_id, content, score, embedding_model
+              - vector (only when with_vectors=True)
         """
         ...
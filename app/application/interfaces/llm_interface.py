@@ -5,6 +5,11 @@ from typing import AsyncGenerator, List, Optional
 class ILLMInterface(ABC):
     """Generic interface for LLM completions."""
 
+    @property
+    def model_name(self) -> str:
+        """Name of the model served, used for per-model budgets and metrics."""
+        return self.__class__.__name__
+
     @abstractmethod
     async def complete(
         self, 
@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from uuid import UUID
+
+from app.domain.entities.ai_entity import QuizQuestion, QuizType
+
+
+class IQuizBankInterface(ABC):
+    """Persistence for quiz questions generated ahead of time, per document."""
+
+    @abstractmethod
+    async def replace_for_document(
+        self,
+        document_id: UUID,
+        user_id: UUID,
+        class_id: Optional[UUID],
+        questions: List[QuizQuestion],
+    ) -> int:
+        """Swap a document's question bank for a new one; returns the count stored."""
+        ...
+
+    @abstractmethod
+    async def sample(
+        self,
+        quiz_type: QuizType,
+        limit: int,
+        user_id: Optional[UUID] = None,
+        document_id: Optional[UUID] = None,
+        class_id: Optional[UUID] = None,
+    ) -> List[QuizQuestion]:
+        """
+        Return up to `limit` random questions of a type.
+
+        Scope: a single document if given, else every document of the class,
+        else the user's personal (class-less) documents.
+        """
+        ...
+
+    @abstractmethod
+    async def count_for_document(self, document_id: UUID) -> int:
+        """Number of banked questions for a document."""
+        ...
@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from app.domain.entities.study_session_entity import StudySession
+from app.domain.entities.study_session_entity import (RollupScope,
+                                                      StudyRollup,
+                                                      StudySession)
 
 
 class IStudySessionInterface(ABC):
@@ -46,3 +49,46 @@ class IStudySessionInterface(ABC):
     ) -> int:
         """Calculate total study seconds for a user (overall or per class)."""
         ...
+
+    @abstractmethod
+    async def list_users_active_since(self, since: Optional[datetime] = None) -> List[UUID]:
+        """Users with a session heartbeat after `since` (all users when None)."""
+        ...
+
+    @abstractmethod
+    async def aggregate_by_document(self, user_id: UUID) -> List[StudyRollup]:
+        """
+        Study time of a user grouped by (document, class), as DOCUMENT
+        rollups without labels.
+        """
+        ...
+
+
+class IStudyRollupInterface(ABC):
+    """Persistence interface for the pre-aggregated study rollups."""
+
+    @abstractmethod
+    async def replace_for_user(self, user_id: UUID, rollups: List[StudyRollup]) -> int:
+        """Atomically replace every rollup of a user. Returns the number stored."""
+        ...
+
+    @abstractmethod
+    async def list_for_user(
+        self,
+        user_id: UUID,
+        class_id: Optional[UUID] = None,
+        scope: Optional[RollupScope] = None,
+        limit: Optional[int] = None,
+    ) -> List[StudyRollup]:
+        """A user's rollups, most studied first, optionally for one class and scope."""
+        ...
+
+    @abstractmethod
+    async def get_watermark(self) -> Optional[datetime]:
+        """Start of the last refresh that completed (None before the first)."""
+        ...
+
+    @abstractmethod
+    async def set_watermark(self, refreshed_at: datetime) -> None:
+        """Record that every session active before `refreshed_at` is rolled up."""
+        ...
@@ -2,7 +2,7 @@ import uuid
 from abc import ABC, abstractmethod
 from typing import Optional
 
-from app.domain.entities import User
+from app.domain.entities import User, UserProfile
 
 
 class IUserInterface(ABC):
@@ -54,3 +54,22 @@ class IUserInterface(ABC):
     async def count_all(self) -> int:
         """Count all active users."""
         ...
+
+
+class IUserProfileCache(ABC):
+    """Shared cache of user display info, so hot paths skip the database."""
+
+    @abstractmethod
+    async def get(self, user_id: uuid.UUID) -> Optional[UserProfile]:
+        """Return the cached profile, or None on a miss."""
+        ...
+
+    @abstractmethod
+    async def set(self, profile: UserProfile) -> None:
+        """Cache (or overwrite) a user's profile."""
+        ...
+
+    @abstractmethod
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        """Drop a user's cached profile."""
+        ...
@@ -1,8 +1,114 @@
+import asyncio
+import json
+import math
+import re
 import uuid
-from typing import List, Optional
-from app.domain.entities.ai_entity import Quiz, QuizType, PerformanceAnalysis
+from datetime import datetime, timezone
+from typing import AsyncContextManager, Callable, List, Optional, Tuple
+from app.domain.entities import Document
+from app.domain.entities.ai_entity import Quiz, QuizQuestion, QuizType, PerformanceAnalysis
+from app.domain.entities.study_session_entity import RollupScope, StudyRollup
+from app.application.interfaces import (IDocumentInterface, IQuizBankInterface,
+                                        IStudyRollupInterface, IVectorStoreInterface)
 from app.application.interfaces.llm_interface import ILLMInterface
 from app.application.use_cases.document_usecases import SearchDocumentsUseCase
+from app.application.use_cases.llm_output import parse_json_object, strip_reasoning
+from app.adapters.agents.context_assembler import ContextAssembler
+from app.core.logging import get_logger
+from app.core.metrics import metrics, use_case_label
+
+logger = get_logger(__name__)
+
+_OPTION_LABEL = re.compile(r"^\(?([A-Da-d])[).:\]]\s+|^\(?([A-Da-d])\)?$")
+
+QUIZ_OUTPUT_FORMAT = """Output ONLY valid JSON, no other text:
+{"title": "...", "questions": [{"question_text": "...", "options": ["...", "...", "...", "..."], "correct_answer": "...", "explanation": "..."}]}
+'options' holds exactly 4 choices for MCQ and is empty otherwise; for MCQ, 'correct_answer' repeats the correct option's text."""
+
+
+def parse_quiz_response(response: str, quiz_type: QuizType) -> Tuple[Optional[str], List[QuizQuestion]]:
+    """
+    Parse an LLM quiz answer into (title, questions).
+
+    Tolerates reasoning blocks, code fences and prose around the JSON.
+    Questions that fail validation are dropped rather than failing the quiz:
+    - every question needs text and a correct answer
+    - MCQ needs 4 distinct options and a correct answer that is one of
+      them (an option letter such as "B" is resolved to its text)
+    """
+    text = strip_reasoning(response)
+    # The outermost JSON value: an object, or a bare list of questions
+    starts = [i for i in (text.find("{"), text.find("[")) if i != -1]
+    if not starts:
+        return None, []
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    try:
+        payload = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        logger.warning(f"Quiz response is not valid JSON: {e}")
+        return None, []
+
+    if isinstance(payload, list):
+        payload = {"questions": payload}
+    raw_questions = payload.get("questions") if isinstance(payload, dict) else None
+    if not isinstance(raw_questions, list):
+        return None, []
+
+    questions: List[QuizQuestion] = []
+    seen = set()
+    for raw in raw_questions:
+        question = _validate_question(raw, quiz_type)
+        if question is None:
+            continue
+        key = question.question_text.lower()
+        if key not in seen:
+            seen.add(key)
+            questions.append(question)
+
+    if len(questions) < len(raw_questions):
+        logger.info(f"Dropped {len(raw_questions) - len(questions)} invalid quiz questions")
+    title = payload.get("title")
+    return (title.strip() if isinstance(title, str) and title.strip() else None), questions
+
+
+def _validate_question(raw: object, quiz_type: QuizType) -> Optional[QuizQuestion]:
+    if not isinstance(raw, dict):
+        return None
+    question_text = str(raw.get("question_text") or raw.get("question") or "").strip()
+    answer = str(raw.get("correct_answer") or raw.get("answer") or "").strip()
+    explanation = str(raw.get("explanation") or "").strip() or None
+    if not question_text or not answer:
+        return None
+
+    options: List[str] = []
+    if quiz_type == QuizType.MCQ:
+        raw_options = raw.get("options")
+        if not isinstance(raw_options, list):
+            return None
+        options = [_OPTION_LABEL.sub("", str(o).strip()).strip() for o in raw_options]
+        if len(options) != 4 or any(not o for o in options) or len({o.lower() for o in options}) != 4:
+            return None
+
+        label = _OPTION_LABEL.match(answer)
+        letter = label and (label.group(1) or label.group(2))
+        stripped = _OPTION_LABEL.sub("", answer).strip()
+        matches = [o for o in options if o.lower() == stripped.lower()]
+        if matches:
+            answer = matches[0]
+        elif letter and not stripped:
+            answer = options["abcd".index(letter.lower())]
+        else:
+            return None
+
+    return QuizQuestion(
+        question_text=question_text,
+        options=options,
+        correct_answer=answer,
+        explanation=explanation,
+        quiz_type=quiz_type,
+    )
+
 
 class GenerateQuizUseCase:
     """Use case to generate a quiz from documents."""
@@ -12,9 +118,19 @@ Your task is to generate a quiz based on the provided study materials.
 Follow the requested format (MCQ, Theory, or Flashcard) strictly.
 For MCQ, provide 4 options and the correct answer with an explanation."""
 
-    def __init__(self, llm: ILLMInterface, search_use_case: SearchDocumentsUseCase):
+    def __init__(
+        self,
+        llm: ILLMInterface,
+        search_use_case: SearchDocumentsUseCase,
+        context_assembler: Optional[ContextAssembler] = None,
+        quiz_bank_factory: Optional[Callable[[], AsyncContextManager[IQuizBankInterface]]] = None,
+    ):
         self._llm = llm
         self._search_use_case = search_use_case
+        self._context_assembler = context_assembler or ContextAssembler()
+        # Opens a short-lived bank repository per request, so the use case
+        # can be long-lived (Nova) and no session is held during generation
+        self._quiz_bank_factory = quiz_bank_factory
 
     async def execute(
         self, 
@@ -24,60 +140,277 @@ For MCQ, provide 4 options and the correct answer with an explanation."""
         class_id: Optional[uuid.UUID] = None,
         num_questions: int = 5
     ) -> Quiz:
-        # Retrieve context
+        title = f"Quiz on {document_id or 'Course Materials'}"
+
+        # 1. Sample the precomputed bank; generation is only the fallback
+        if self._quiz_bank_factory is not None:
+            async with self._quiz_bank_factory() as quiz_bank:
+                banked = await quiz_bank.sample(
+                    quiz_type,
+                    num_questions,
+                    user_id=user_id,
+                    document_id=document_id,
+                    class_id=class_id,
+                )
+            if len(banked) >= num_questions:
+                metrics.inc("quiz_requests_total", source="bank")
+                return Quiz(
+                    title=title,
+                    quiz_type=quiz_type,
+                    questions=banked,
+                    document_id=document_id,
+                    class_id=class_id
+                )
+
+        metrics.inc("quiz_requests_total", source="generated")
+
+        # 2. Retrieve context
         context_chunks = await self._search_use_case.execute(
             query="Key concepts and main points for quiz generation",
             user_id=user_id,
             class_id=class_id,
-            top_k=10
+            document_id=document_id,
+            top_k=10,
+            diversify=True,
         )
-        
-        if document_id:
-            context_chunks = [c for c in context_chunks if c.get("document_id") == str(document_id)]
 
-        context_text = "\n\n".join([c["content"] for c in context_chunks])
+        context_text = self._context_assembler.assemble(context_chunks, model=self._llm.model_name)
         
         prompt = f"""Generate a {quiz_type.value} quiz with {num_questions} questions.
 Context:
 {context_text}
 
-Output format: JSON with a 'title' and a list of 'questions' each having 'question_text', 'options' (if MCQ), 'correct_answer', and 'explanation'."""
+{QUIZ_OUTPUT_FORMAT}"""
 
-        # In a real implementation, we'd use structured output parsing here.
-        # For now, we'll assume a helper or just direct completion.
-        response = await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT)
+        with use_case_label("quiz"):
+            response = await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT)
         
-        # Parse response into Quiz entity (simplified for now)
-        # Note: Proper parsing into Quiz entity would go here.
+        parsed_title, questions = parse_quiz_response(response, quiz_type)
         return Quiz(
-            title=f"Quiz on {document_id or 'Course Materials'}",
+            title=parsed_title or title,
             quiz_type=quiz_type,
-            questions=[], # Questions would be parsed from response
+            questions=questions[:num_questions],
             document_id=document_id,
             class_id=class_id
         )
 
+
+class BuildQuizBankUseCase:
+    """
+    Generate a document's quiz question bank, ahead of any quiz request.
+
+    Runs after ingestion (document READY). The document's chunks are split
+    into consecutive sections, and each section gets its own generation call,
+    run concurrently up to `concurrency`. Parsed, validated questions replace
+    the document's previous bank.
+    """
+
+    SYSTEM_PROMPT = GenerateQuizUseCase.SYSTEM_PROMPT
+
+    def __init__(
+        self,
+        llm: ILLMInterface,
+        vector_store: IVectorStoreInterface,
+        quiz_bank: IQuizBankInterface,
+        context_assembler: Optional[ContextAssembler] = None,
+        section_chunks: int = 6,
+        max_sections: int = 8,
+        questions_per_section: int = 4,
+        quiz_types: Tuple[QuizType, ...] = (QuizType.MCQ,),
+        concurrency: int = 3,
+    ):
+        self._llm = llm
+        self._vector_store = vector_store
+        self._quiz_bank = quiz_bank
+        self._context_assembler = context_assembler or ContextAssembler()
+        self._section_chunks = section_chunks
+        self._max_sections = max_sections
+        self._questions_per_section = questions_per_section
+        self._quiz_types = quiz_types
+        self._concurrency = concurrency
+
+    async def execute(self, document: Document) -> int:
+        chunks = await self._vector_store.get_document_chunks(str(document.id))
+        if not chunks:
+            logger.warning(f"No chunks to build a quiz bank for document {document.id}")
+            return 0
+
+        # Grow sections rather than skip content when the document is long
+        size = max(self._section_chunks, math.ceil(len(chunks) / self._max_sections))
+        sections = [chunks[i:i + size] for i in range(0, len(chunks), size)]
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def generate(index: int, section: List[dict], quiz_type: QuizType) -> List[QuizQuestion]:
+            async with semaphore:
+                return await self._generate_section(document, index, section, quiz_type)
+
+        results = await asyncio.gather(
+            *(
+                generate(index, section, quiz_type)
+                for index, section in enumerate(sections)
+                for quiz_type in self._quiz_types
+            ),
+            return_exceptions=True,
+        )
+
+        questions: List[QuizQuestion] = []
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Quiz bank section failed for document {document.id}: {result}")
+                continue
+            questions.extend(result)
+
+        if not questions and any(isinstance(r, Exception) for r in results):
+            # Keep the previous bank rather than wiping it on a provider outage
+            raise RuntimeError(f"Quiz bank generation failed for document {document.id}")
+
+        stored = await self._quiz_bank.replace_for_document(
+            document.id, document.user_id, document.class_id, questions
+        )
+        metrics.inc("quiz_bank_questions_total", stored)
+        logger.info(f"Quiz bank for document {document.id}: {stored} questions from {len(sections)} sections")
+        return stored
+
+    async def _generate_section(
+        self,
+        document: Document,
+        index: int,
+        section: List[dict],
+        quiz_type: QuizType,
+    ) -> List[QuizQuestion]:
+        context_text = self._context_assembler.assemble(section, model=self._llm.model_name)
+        prompt = f"""Generate a {quiz_type.value} quiz with {self._questions_per_section} questions.
+The questions must be answerable from this section of "{document.title}" alone.
+Context:
+{context_text}
+
+{QUIZ_OUTPUT_FORMAT}"""
+
+        with use_case_label("quiz_bank"):
+            response = await self._llm.complete(
+                prompt, system_message=self.SYSTEM_PROMPT, max_tokens=1500
+            )
+
+        _, questions = parse_quiz_response(response, quiz_type)
+        for question in questions:
+            question.document_id = document.id
+            question.section_index = index
+        return questions[:self._questions_per_section]
+
+
 class AnalyzeStudentPerformanceUseCase:
-    """Use case to analyze student performance and identify gaps."""
-    
+    """
+    Analyze a student's study activity in a class and identify gaps.
+
+    Reads the pre-aggregated study rollups (a handful of rows per student)
+    and gives the LLM a compact numeric summary rather than raw session
+    history. If the LLM answer cannot be parsed, strong and weak areas fall
+    back to the most and least studied concepts.
+    """
+
     SYSTEM_PROMPT = """You are Nova, an expert academic advisor.
 Analyze the student's performance data and provide insights into their strong and weak areas."""
 
-    def __init__(self, llm: ILLMInterface):
+    MAX_ITEMS = 8  # documents / concepts listed in the prompt
+
+    def __init__(
+        self,
+        llm: ILLMInterface,
+        rollup_repo: IStudyRollupInterface,
+        document_repo: Optional[IDocumentInterface] = None,
+    ):
         self._llm = llm
+        self._rollup_repo = rollup_repo
+        self._document_repo = document_repo
 
     async def execute(self, student_id: uuid.UUID, class_id: uuid.UUID) -> PerformanceAnalysis:
-        # This would normally pull from a PerformanceRepository
-        # For now, placeholder metrics
-        prompt = f"Analyze performance for student {student_id} in class {class_id}."
-        
-        # response = await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT)
-        
+        rollups = await self._rollup_repo.list_for_user(student_id, class_id=class_id)
+        by_scope = {scope: [r for r in rollups if r.scope == scope] for scope in RollupScope}
+        overview = by_scope[RollupScope.CLASS][0] if by_scope[RollupScope.CLASS] else None
+
+        if overview is None or overview.total_seconds == 0:
+            return PerformanceAnalysis(
+                student_id=student_id,
+                class_id=class_id,
+                strong_areas=[],
+                weak_areas=[],
+                recommendations=["Open a class document and start a study session to get an analysis."],
+                summary="No study activity has been recorded for this class yet.",
+            )
+
+        unstudied = await self._unstudied_titles(class_id, by_scope[RollupScope.DOCUMENT])
+        prompt = f"""Study data for one student in one class:
+{self._numeric_summary(overview, by_scope[RollupScope.DOCUMENT], by_scope[RollupScope.CONCEPT], unstudied)}
+
+Time spent is a proxy for engagement, not mastery. Output ONLY valid JSON, no other text:
+{{"strong_areas": ["..."], "weak_areas": ["..."], "recommendations": ["..."], "summary": "..."}}"""
+
+        with use_case_label("performance_analysis"):
+            response = await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT, max_tokens=600)
+
+        concepts = by_scope[RollupScope.CONCEPT] or by_scope[RollupScope.DOCUMENT]
+        names = [r.label or r.scope_key for r in concepts]
+        analysis = parse_json_object(response) or {}
         return PerformanceAnalysis(
             student_id=student_id,
             class_id=class_id,
-            strong_areas=["Concept A", "Concept B"],
-            weak_areas=["Concept C"],
-            recommendations=["Review Chapter 3", "Practice more MCQs on Concept C"],
-            summary="Overall good progress, but needs focus on specific advanced topics."
+            strong_areas=_string_list(analysis.get("strong_areas")) or names[:3],
+            weak_areas=_string_list(analysis.get("weak_areas")) or (unstudied + names[::-1])[:3],
+            recommendations=_string_list(analysis.get("recommendations")),
+            summary=str(analysis.get("summary") or "").strip() or (
+                f"{_duration(overview.total_seconds)} studied over {overview.session_count} sessions."
+            ),
         )
+
+    def _numeric_summary(
+        self,
+        overview: StudyRollup,
+        documents: List[StudyRollup],
+        concepts: List[StudyRollup],
+        unstudied: List[str],
+    ) -> str:
+        lines = [
+            f"Total: {_duration(overview.total_seconds)} over {overview.session_count} sessions, "
+            f"last studied {_age(overview.last_studied_at)}."
+        ]
+        if documents:
+            lines.append("Documents (time, sessions, last studied):")
+            lines += [
+                f"- {d.label or 'Untitled'}: {_duration(d.total_seconds)}, {d.session_count}, {_age(d.last_studied_at)}"
+                for d in documents[:self.MAX_ITEMS]
+            ]
+        if unstudied:
+            lines.append("Documents never studied: " + "; ".join(unstudied[:self.MAX_ITEMS]))
+        if concepts:
+            lines.append("Concepts by study time (most first):")
+            lines += [f"- {c.label}: {_duration(c.total_seconds)}" for c in concepts[:self.MAX_ITEMS]]
+            if len(concepts) > self.MAX_ITEMS:
+                least = concepts[-min(3, len(concepts) - self.MAX_ITEMS):]
+                lines.append("Least studied concepts: " + "; ".join(c.label or "" for c in least))
+        return "\n".join(lines)
+
+    async def _unstudied_titles(self, class_id: uuid.UUID, studied: List[StudyRollup]) -> List[str]:
+        if not self._document_repo:
+            return []
+        documents, _ = await self._document_repo.list_by_class(class_id, limit=100)
+        studied_ids = {r.scope_key for r in studied}
+        return [d.title for d in documents if str(d.id) not in studied_ids]
+
+
+def _string_list(value: object) -> List[str]:
+    if not isinstance(value, list):
+        return []
+    return [str(v).strip() for v in value if str(v).strip()]
+
+
+def _duration(seconds: int) -> str:
+    hours, minutes = divmod(round(seconds / 60), 60)
+    return f"{hours}h {minutes}m" if hours else f"{minutes}m"
+
+
+def _age(moment: Optional[datetime]) -> str:
+    if moment is None:
+        return "never"
+    days = (datetime.now(timezone.utc) - moment).days
+    return "today" if days <= 0 else f"{days}d ago"
@@ -8,9 +8,9 @@ from google.oauth2 import id_token
 
 from app.application.dtos import TokenPair
 from app.application.interfaces import (IEmailService, IJwtService,
-                                        IUserInterface)
+                                        IUserInterface, IUserProfileCache)
 from app.core.logging import get_logger
-from app.domain.entities import User
+from app.domain.entities import User, UserProfile
 from app.domain.exceptions import (AccountInactiveError, AuthenticationError,
                                    EmailNotVerifiedError,
                                    InvalidAuthMethodError,
@@ -20,6 +20,14 @@ from app.domain.exceptions import (AccountInactiveError, AuthenticationError,
 logger = get_logger(__name__)
 
 
+# ── Profile cache helper ───────────────────────────────────────
+
+async def _cache_profile(profile_cache: Optional[IUserProfileCache], user: User) -> None:
+    """Keep the shared profile cache warm whenever tokens are issued."""
+    if profile_cache:
+        await profile_cache.set(UserProfile.from_user(user))
+
+
 # ── Username helper ────────────────────────────────────────────
 
 async def _gen_unique_username(email: str, user_repo: IUserInterface) -> str:
@@ -67,14 +75,20 @@ class RegisterUseCase:
         verification_token = self._auth_repo.create_email_verification_token(user.id)
         await self._email_svc.send_verification_email(user.email, user.first_name, verification_token)
 
-        tokens = self._auth_repo.create_tokens(user.id)
+        tokens = self._auth_repo.create_tokens(user.id, user.username)
         return user, tokens
 
 
 class LoginUseCase:
-    def __init__(self, user_repo: IUserInterface, auth_repo: IJwtService) -> None:
+    def __init__(
+        self,
+        user_repo: IUserInterface,
+        auth_repo: IJwtService,
+        profile_cache: Optional[IUserProfileCache] = None,
+    ) -> None:
         self._user_repo = user_repo
         self._auth_repo = auth_repo
+        self._profile_cache = profile_cache
 
     async def execute(self, email: str, password: str) -> tuple[User, TokenPair]:
         user = await self._user_repo.get_by_email(email)
@@ -93,15 +107,23 @@ class LoginUseCase:
         if not user.is_active:
             raise AccountInactiveError("Account has been deactivated")
 
-        tokens = self._auth_repo.create_tokens(user.id)
+        await _cache_profile(self._profile_cache, user)
+        tokens = self._auth_repo.create_tokens(user.id, user.username)
         return user, tokens
 
 
 class GoogleAuthUseCase:
-    def __init__(self, user_repo: IUserInterface, auth_repo: IJwtService, google_client_id: str) -> None:
+    def __init__(
+        self,
+        user_repo: IUserInterface,
+        auth_repo: IJwtService,
+        google_client_id: str,
+        profile_cache: Optional[IUserProfileCache] = None,
+    ) -> None:
         self._user_repo = user_repo
         self._auth_repo = auth_repo
         self._google_client_id = google_client_id
+        self._profile_cache = profile_cache
 
         
     async def execute(self, code: str, is_access_token: Optional[bool] = True) -> tuple[User, TokenPair, bool]:
@@ -154,16 +176,23 @@ class GoogleAuthUseCase:
             )
             user = await self._user_repo.create(user)
         
-        tokens = self._auth_repo.create_tokens(user.id)
+        await _cache_profile(self._profile_cache, user)
+        tokens = self._auth_repo.create_tokens(user.id, user.username)
         return user, tokens, is_new_user
 
 
 # ── Refresh Token ───────────────────────────────────────────────
 
 class RefreshTokenUseCase:
-    def __init__(self, user_repo: IUserInterface, auth_repo: IJwtService) -> None:
+    def __init__(
+        self,
+        user_repo: IUserInterface,
+        auth_repo: IJwtService,
+        profile_cache: Optional[IUserProfileCache] = None,
+    ) -> None:
         self._user_repo = user_repo
         self._auth_repo = auth_repo
+        self._profile_cache = profile_cache
 
     async def execute(self, refresh_token: str) -> TokenPair:
         try:
@@ -177,7 +206,8 @@ class RefreshTokenUseCase:
         if not user.is_active:
             raise AccountInactiveError("Account is inactive")
 
-        return self._auth_repo.create_tokens(user.id)
+        await _cache_profile(self._profile_cache, user)
+        return self._auth_repo.create_tokens(user.id, user.username)
 
 
 # ── Forgot Password ─────────────────────────────────────────────
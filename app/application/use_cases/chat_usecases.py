@@ -1,15 +1,23 @@
 import re
-from typing import Optional, Any
-from uuid import UUID
+import time
+from typing import Any, AsyncContextManager, Callable, Optional
+from uuid import UUID, uuid4
 
 from app.application.interfaces import (IChatCacheInterface,
                                         IChatGroupInterface,
+                                        IChatMembershipCache,
                                         IChatMessageInterface,
                                         IChatNotificationInterface,
                                         IChatPubSub)
+from app.application.dtos import MessageType
+from app.core.logging import get_logger
 from app.domain.entities import (ChatGroup, ChatMessage, SendChatMessageInput,
                                  SendChatMessageOutput)
 
+logger = get_logger(__name__)
+
+NOVA_SENDER_ID = UUID("00000000-0000-0000-0000-000000000000")  # SYSTEM/AI ID
+
 
 class SendChatMessageUseCase:
     MENTION_PATTERN = re.compile(r'@([\w-]+)')
@@ -21,14 +29,15 @@ class SendChatMessageUseCase:
         pubsub: IChatPubSub,
         cache: IChatCacheInterface,
         notification_service: IChatNotificationInterface,
-        nova_agent: Optional[Any] = None, # Avoid cyclic dependency or use interface
+        # Queues a NovaAI reply; returns False when the queue is full
+        nova_dispatcher: Optional[Callable[[ChatMessage, ChatGroup], bool]] = None,
     ):
         self._message_repo = message_repo
         self._group_repo = group_repo
         self._pubsub = pubsub
         self._cache = cache
         self._notification = notification_service
-        self._nova_agent = nova_agent
+        self._nova_dispatcher = nova_dispatcher
     
     async def execute(self, input_data: SendChatMessageInput) -> SendChatMessageOutput:
         """
@@ -88,13 +97,13 @@ class SendChatMessageUseCase:
             )
         
         # 9. Trigger NovaAI if mentioned
-        if self._nova_agent:
+        if self._nova_dispatcher:
             # Simple check for @Nova or @NovaAI
             content_lower = input_data.content.lower()
             if "@nova" in content_lower or "@novaai" in content_lower:
-                # Run in background via Celery or async task
-                # For now, just a call to the agent
-                await self._trigger_nova(saved_message, group)
+                # The reply is generated in the background and streamed to the group
+                if not self._nova_dispatcher(saved_message, group):
+                    logger.warning(f"NovaAI is busy; dropped trigger for message {saved_message.id}")
 
         # Return result
         mentioned_user_ids = [m.user_id for m in message.mentions]
@@ -183,40 +192,93 @@ class SendChatMessageUseCase:
                 # Notifications are non-critical
                 print(f"Failed to send mention notification: {e}")
 
-    async def _trigger_nova(self, message: ChatMessage, group: ChatGroup) -> None:
-        """Trigger NovaAI agent to process the message and reply."""
+
+class NovaReplyUseCase:
+    """
+    Generate a NovaAI reply to a chat message and stream it into the group.
+
+    Flow:
+    1. Run the Nova agent in streaming mode
+    2. Publish the tokens as message_delta events, batched every flush_interval
+    3. Persist the full reply, cache it and publish it as a normal message
+
+    The deltas and the final message share one id so clients can swap the
+    streamed draft for the persisted message.
+    """
+
+    def __init__(
+        self,
+        message_repo: IChatMessageInterface,
+        pubsub: IChatPubSub,
+        cache: IChatCacheInterface,
+        nova_agent: Any,
+        flush_interval: float = 0.05,
+    ):
+        self._message_repo = message_repo
+        self._pubsub = pubsub
+        self._cache = cache
+        self._nova_agent = nova_agent
+        self._flush_interval = flush_interval
+
+    async def execute(self, message: ChatMessage, group: ChatGroup) -> Optional[ChatMessage]:
+        reply_id = uuid4()
+        sequence = 0
+        buffer: list[str] = []
+        reply: list[str] = []
+        last_flush = time.monotonic()
+
+        async def flush(done: bool = False) -> None:
+            nonlocal sequence, last_flush
+            if not buffer and not done:
+                return
+            await self._pubsub.publish_message_delta(
+                group.id, reply_id, "".join(buffer), sequence, done=done, reply_to_id=message.id
+            )
+            buffer.clear()
+            sequence += 1
+            last_flush = time.monotonic()
+
+        # We strip the mention from the content for the agent
+        cleaned_content = re.sub(r'@nova(ai)?\s*', '', message.content, flags=re.IGNORECASE).strip()
+
         try:
-            # Prepare context for Nova
-            # We strip the mention from the content for the agent
-            cleaned_content = re.sub(r'@nova(ai)?\s*', '', message.content, flags=re.IGNORECASE).strip()
-            
-            # Run Nova agent (using graph via execute)
-            result = await self._nova_agent.execute(
+            async for token in self._nova_agent.execute_stream(
                 input_text=cleaned_content,
                 user_id=message.sender_id,
                 class_id=group.id,
                 conversation_id=str(group.id)
-            )
-            
-            if result and "messages" in result:
-                ai_reply_content = result["messages"][-1].content
-                
-                # Create and save AI message
-                ai_message = ChatMessage(
-                    group_id=group.id,
-                    sender_id=UUID("00000000-0000-0000-0000-000000000000"), # SYSTEM/AI ID
-                    content=ai_reply_content,
-                    message_type="text",
-                    reply_to_id=message.id,
-                    metadata={"is_ai": True, "agent": "Nova"},
-                )
-                
-                saved_ai_msg = await self._message_repo.save(ai_message)
-                await self._cache.set_message(saved_ai_msg, ttl=300)
-                await self._pubsub.publish_message(group.id, saved_ai_msg)
-                
+            ):
+                buffer.append(token)
+                reply.append(token)
+                if time.monotonic() - last_flush >= self._flush_interval:
+                    await flush()
         except Exception as e:
-             print(f"Failed to trigger NovaAI: {e}")
+            logger.error(f"NovaAI reply to {message.id} failed: {e}")
+            # Tell clients to drop the draft
+            buffer.clear()
+            await flush(done=True)
+            return None
+
+        await flush(done=True)
+
+        content = "".join(reply).strip()
+        if not content:
+            return None
+
+        ai_message = ChatMessage(
+            id=reply_id,
+            group_id=group.id,
+            sender_id=NOVA_SENDER_ID,
+            content=content,
+            message_type=MessageType.TEXT,
+            reply_to_id=message.id,
+            metadata={"is_ai": True, "agent": "Nova"},
+        )
+
+        saved_ai_msg = await self._message_repo.save(ai_message)
+        await self._cache.set_message(saved_ai_msg, ttl=300)
+        await self._pubsub.publish_message(group.id, saved_ai_msg)
+        return saved_ai_msg
 
 
 # =============================================================================
@@ -472,6 +534,32 @@ class GetClassUseCase:
         return group
 
 
+class CheckClassMembershipUseCase:
+    """
+    Is a user a member of a class? For hot paths (WebSocket handshakes, the
+    tutor answer cache): members come from the shared membership cache, and
+    a short-lived repository is only opened on a miss.
+    """
+
+    def __init__(
+        self,
+        membership_cache: IChatMembershipCache,
+        group_repo_factory: Callable[[], AsyncContextManager[IChatGroupInterface]],
+    ):
+        self._membership_cache = membership_cache
+        self._group_repo_factory = group_repo_factory
+
+    async def execute(self, group_id: UUID, user_id: UUID) -> bool:
+        if await self._membership_cache.contains(group_id, user_id):
+            return True
+
+        async with self._group_repo_factory() as group_repo:
+            is_member = await group_repo.is_member(group_id, user_id)
+        if is_member:
+            await self._membership_cache.add(group_id, user_id)
+        return is_member
+
+
 class UpdateClassUseCase:
     """Update class metadata – owner or admin only."""
 
@@ -541,8 +629,13 @@ class AddClassMemberUseCase:
 class RemoveClassMemberUseCase:
     """Remove a member from a class – owner or admin only (or self-leave)."""
 
-    def __init__(self, group_repo: IChatGroupInterface):
+    def __init__(
+        self,
+        group_repo: IChatGroupInterface,
+        membership_cache: Optional[IChatMembershipCache] = None,
+    ):
         self._group_repo = group_repo
+        self._membership_cache = membership_cache
 
     async def execute(self, class_code: str, remover_id: UUID, target_user_id: UUID) -> ChatGroup:
         group = await self._group_repo.get_by_code(class_code)
@@ -550,7 +643,10 @@ class RemoveClassMemberUseCase:
             raise ValueError("Class not found")
 
         group.remove_member(target_user_id, remover_id)
-        return await self._group_repo.save(group)
+        saved = await self._group_repo.save(group)
+        if self._membership_cache:
+            await self._membership_cache.remove(group.id, [target_user_id])
+        return saved
 
 
 class ChangeClassMemberRoleUseCase:
@@ -579,8 +675,13 @@ class ChangeClassMemberRoleUseCase:
 class DeleteClassUseCase:
     """Delete a class – owner only."""
 
-    def __init__(self, group_repo: IChatGroupInterface):
+    def __init__(
+        self,
+        group_repo: IChatGroupInterface,
+        membership_cache: Optional[IChatMembershipCache] = None,
+    ):
         self._group_repo = group_repo
+        self._membership_cache = membership_cache
 
     async def execute(self, class_code: str, user_id: UUID) -> None:
         group = await self._group_repo.get_by_code(class_code)
@@ -592,6 +693,8 @@ class DeleteClassUseCase:
             raise PermissionError("Only the owner can delete the class")
 
         await self._group_repo.delete(group.id)
+        if self._membership_cache:
+            await self._membership_cache.invalidate_group(group.id)
 
 
 # =============================================================================
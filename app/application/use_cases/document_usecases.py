@@ -1,17 +1,25 @@
+import asyncio
 import datetime
+import math
 from typing import Optional
 from uuid import UUID
 
-from app.application.interfaces import (IChatGroupInterface,
+from app.adapters.agents.context_assembler import ContextAssembler
+from app.application.interfaces import (IAnswerCacheInterface,
+                                         IChatGroupInterface,
                                          IDocumentEmbedderInterface,
                                          IDocumentExtractorInterface,
                                          IDocumentInterface, IStorageService,
                                          IVectorStoreInterface)
+from app.application.interfaces.llm_interface import ILLMInterface
 from app.application.dtos import ChatGroupRole
+from app.application.use_cases.llm_output import parse_json_object, strip_reasoning
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import metrics, use_case_label
 from app.domain.entities import (Document, DocumentChunksAndEmbeddings,
-                                 EmbeddedChunk)
+                                 DocumentSummary, EmbeddedChunk,
+                                 SectionSummary)
 
 logger = get_logger(__name__)
 
@@ -94,17 +102,22 @@ class ProcessDocumentUseCase:
         extractor: IDocumentExtractorInterface,
         embedder: IDocumentEmbedderInterface,
         vector_store: IVectorStoreInterface,
+        answer_cache: Optional[IAnswerCacheInterface] = None,
+        summarizer: Optional["SummarizeDocumentUseCase"] = None,
     ) -> None:
         self._repo = document_repo
         self._storage = storage
         self._extractor = extractor
         self._embedder = embedder
         self._vector_store = vector_store
+        self._answer_cache = answer_cache
+        self._summarizer = summarizer
 
    
     async def execute(self, document: Document) -> None:
         """
-        Heavy background processing: extract → chunk → embed → store.
+        Heavy background processing: extract → chunk → embed → store,
+        then (with a summarizer) summarize into the coarse tier.
         Should be called via Celery Delay or FastAPI BackgroundTasks after upload.
         """
 
@@ -145,6 +158,14 @@ class ProcessDocumentUseCase:
                )
             )
 
+            # Document-level vector for coarse-to-fine retrieval
+            await self._vector_store.store_document_vector(
+                document_id=str(document.id),
+                user_id=str(document.user_id),
+                class_id=str(document.class_id),
+                vector=_centroid([embedding for _, embedding in embedded_chunks]),
+            )
+
             document.mark_ready(chunk_count=len(embedded_chunks), page_count=page_count)
             await self._repo.save(document)
 
@@ -153,6 +174,151 @@ class ProcessDocumentUseCase:
             await self._repo.save(document)
             raise
 
+        # Reprocessed content invalidates cached tutor answers for the class
+        if self._answer_cache:
+            await self._answer_cache.invalidate_document(document.id, document.user_id, document.class_id)
+
+        # Optional stage: the chunks are searchable already, so a failed
+        # summary leaves the document READY and broad questions on chunks
+        if self._summarizer:
+            try:
+                await self._summarizer.execute(document, raw_chunks)
+            except Exception as e:
+                logger.error(f"Summarizing document {document.id} failed: {e}")
+
+
+class SummarizeDocumentUseCase:
+    """
+    Map-reduce summarization of a document into the coarse retrieval tier.
+
+    MAP:    consecutive chunks are grouped into sections and each section is
+            summarized by its own LLM call, up to `concurrency` at once.
+    REDUCE: the section summaries are combined into a whole-document summary
+            and a key-concept list.
+
+    The summaries are embedded and stored apart from the chunks, so broad
+    questions ("what are the main topics") can be answered from a few
+    summaries instead of dozens of raw chunks.
+    """
+
+    SYSTEM_PROMPT = """You are Nova, an expert at condensing study material.
+Summaries must be faithful to the text: never add facts that are not in it."""
+
+    def __init__(
+        self,
+        llm: ILLMInterface,
+        embedder: IDocumentEmbedderInterface,
+        vector_store: IVectorStoreInterface,
+        context_assembler: Optional[ContextAssembler] = None,
+        section_chunks: int = 8,
+        max_sections: int = 12,
+        max_key_concepts: int = 12,
+        concurrency: int = 3,
+    ) -> None:
+        self._llm = llm
+        self._embedder = embedder
+        self._vector_store = vector_store
+        self._context_assembler = context_assembler or ContextAssembler()
+        self._section_chunks = section_chunks
+        self._max_sections = max_sections
+        self._max_key_concepts = max_key_concepts
+        self._concurrency = concurrency
+
+    async def execute(self, document: Document, chunks: list[str]) -> DocumentSummary:
+        # Grow sections rather than skip content when the document is long
+        size = max(self._section_chunks, math.ceil(len(chunks) / self._max_sections))
+        spans = [(start, min(start + size, len(chunks)) - 1) for start in range(0, len(chunks), size)]
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        async def summarize(start: int, end: int) -> str:
+            async with semaphore:
+                return await self._summarize_section(document, chunks, start, end)
+
+        with use_case_label("document_summary"):
+            # Map
+            section_texts = await asyncio.gather(*(summarize(start, end) for start, end in spans))
+            # Reduce
+            overview, key_concepts = await self._reduce(document, section_texts)
+
+        # The overview is embedded with its concepts so topic questions find it
+        overview_text = overview
+        if key_concepts:
+            overview_text += "\n\nKey concepts: " + ", ".join(key_concepts)
+        embedded = await self._embedder.embed_multiple([overview_text, *section_texts])
+
+        summary = DocumentSummary(
+            document_id=str(document.id),
+            user_id=str(document.user_id),
+            class_id=str(document.class_id),
+            summary=overview,
+            key_concepts=key_concepts,
+            embedding=embedded[0][1],
+            sections=[
+                SectionSummary(
+                    index=index,
+                    chunk_start=start,
+                    chunk_end=end,
+                    summary=text,
+                    embedding=embedding,
+                )
+                for index, ((start, end), (text, embedding)) in enumerate(zip(spans, embedded[1:]))
+            ],
+        )
+        await self._vector_store.store_summaries(summary)
+
+        metrics.inc("document_summaries_total")
+        logger.info(
+            f"Summarized document {document.id}: {len(spans)} sections, "
+            f"{len(key_concepts)} key concepts"
+        )
+        return summary
+
+    async def _summarize_section(self, document: Document, chunks: list[str], start: int, end: int) -> str:
+        context_text = self._context_assembler.assemble(
+            [
+                {"document_id": str(document.id), "chunk_index": i, "content": chunks[i]}
+                for i in range(start, end + 1)
+            ],
+            model=self._llm.model_name,
+        )
+        prompt = f"""Summarize this section of "{document.title}" in one short paragraph.
+Keep the definitions, results and names a student would need to revise it.
+
+Section:
+{context_text}"""
+
+        response = await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT, max_tokens=400)
+        return strip_reasoning(response)
+
+    async def _reduce(self, document: Document, section_texts: list[str]) -> tuple[str, list[str]]:
+        sections = "\n\n".join(f"Section {i + 1}: {text}" for i, text in enumerate(section_texts))
+        prompt = f"""Below are summaries of consecutive sections of "{document.title}".
+Write an overview of the whole document (one or two paragraphs) and list its
+key concepts (at most {self._max_key_concepts}, most important first).
+
+{sections}
+
+Output ONLY valid JSON, no other text:
+{{"summary": "...", "key_concepts": ["...", "..."]}}"""
+
+        response = await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT, max_tokens=800)
+        return _parse_overview(response, self._max_key_concepts)
+
+
+def _parse_overview(response: str, max_key_concepts: int) -> tuple[str, list[str]]:
+    """Read the reduce step's JSON; fall back to the raw text as the summary."""
+    data = parse_json_object(response)
+    if data is not None and isinstance(data.get("summary"), str):
+        concepts = []
+        for concept in data.get("key_concepts") or []:
+            concept = str(concept).strip()
+            if concept and concept.lower() not in (c.lower() for c in concepts):
+                concepts.append(concept)
+        return data["summary"].strip(), concepts[:max_key_concepts]
+
+    logger.warning("Document overview was not valid JSON; storing it without key concepts")
+    return strip_reasoning(response), []
+
 
 class GetDocumentUseCase:
     """Retrieve a single document by ID; allows access if owner or class member."""
@@ -185,6 +351,24 @@ class GetDocumentUseCase:
         raise PermissionError("Access denied")
 
 
+class GetDocumentSummaryUseCase:
+    """Return a document's precomputed summary; same access rules as GetDocumentUseCase."""
+
+    def __init__(
+        self,
+        document_repo: IDocumentInterface,
+        vector_store: IVectorStoreInterface,
+        group_repo: Optional[IChatGroupInterface] = None
+    ) -> None:
+        self._get_document = GetDocumentUseCase(document_repo, group_repo)
+        self._vector_store = vector_store
+
+    async def execute(self, document_id: UUID, user_id: UUID) -> tuple[Document, Optional[DocumentSummary]]:
+        document = await self._get_document.execute(document_id, user_id)
+        summary = await self._vector_store.get_document_summary(str(document.id))
+        return document, summary
+
+
 class ListDocumentsUseCase:
     """List documents for the calling user, with optional class filter."""
 
@@ -235,11 +419,13 @@ class DeleteDocumentUseCase:
         storage: IStorageService,
         vector_store: IVectorStoreInterface,
         group_repo: Optional[IChatGroupInterface] = None,
+        answer_cache: Optional[IAnswerCacheInterface] = None,
     ) -> None:
         self._repo = document_repo
         self._storage = storage
         self._vector_store = vector_store
         self._group_repo = group_repo
+        self._answer_cache = answer_cache
 
     async def execute(self, document_id: UUID, user_id: UUID) -> None:
         document = await self._repo.get_any_by_id(document_id)
@@ -263,15 +449,43 @@ class DeleteDocumentUseCase:
 
         # 1. Remove vectors from Qdrant
         await self._vector_store.delete_embeddings(str(document_id))
+
+        # 2. Drop cached tutor answers that may cite this document
+        if self._answer_cache:
+            await self._answer_cache.invalidate_document(document_id, document.user_id, document.class_id)
         
         # 3. Delete physical file
         await self._storage.delete_file(document.file_id, document.file_extension)
 
 
 class SearchDocumentsUseCase:
-    def __init__(self, vector_store: IVectorStoreInterface, embedder: IDocumentEmbedderInterface) -> None:
+    """
+    Semantic search over document chunks.
+
+    With `coarse_top_documents` set, unscoped searches are two-stage: the
+    class's documents are first ranked by their centroid vectors, then
+    chunks are searched only within the best `coarse_top_documents`. When
+    the library has no more documents than that, the flat search is used.
+    Only documents with a centroid can make the cut, so it is off unless
+    SEARCH_TWO_STAGE_ENABLED is set.
+    """
+
+    MMR_FETCH_MULTIPLIER = 4  # candidates fetched per result when diversifying
+
+    def __init__(
+        self,
+        vector_store: IVectorStoreInterface,
+        embedder: IDocumentEmbedderInterface,
+        coarse_top_documents: Optional[int] = None,
+    ) -> None:
         self._vector_store = vector_store
         self._embedder = embedder
+        self._coarse_top_documents = coarse_top_documents
+
+    async def embed_query(self, query: str) -> list[float]:
+        """Embed a query string with the same embedder used for search."""
+        _, embedded_query = await self._embedder.embed(query.strip())
+        return embedded_query
 
     async def execute(
         self,
@@ -279,23 +493,138 @@ class SearchDocumentsUseCase:
         user_id: UUID,
         class_id: Optional[UUID] = None,
         top_k: int = 5,
+        embedded_query: Optional[list[float]] = None,
+        document_id: Optional[UUID] = None,
+        document_ids: Optional[list[UUID]] = None,
+        chunk_range: Optional[tuple[int, int]] = None,
+        diversify: bool = False,
+        mmr_lambda: float = 0.5,
+        two_stage: Optional[bool] = None,
     ) -> list[dict]:
         """
         Retrieves the top-k most similar chunks from the vector store.
         Returns a list of similarity results.
+
+        Document, multi-document and chunk-range scopes are applied by the
+        vector store, so every returned hit is in scope.
+        `two_stage` overrides the configured coarse-to-fine mode; it only
+        applies to searches without a document or chunk scope.
+        Pass `embedded_query` when the caller already embedded the query.
+        Set `diversify` to re-rank with MMR (maximal marginal relevance);
+        `mmr_lambda` trades relevance (1.0) against diversity (0.0).
         """
         if not query or not query.strip():
             return []
         
         # Embed query string
-        _, embedded_query = await self._embedder.embed(query.strip())
+        if embedded_query is None:
+            embedded_query = await self.embed_query(query)
+
+        # Stage 1: narrow a large library down to its most relevant documents
+        if two_stage is None:
+            two_stage = self._coarse_top_documents is not None
+        if two_stage and not (document_id or document_ids or chunk_range):
+            document_ids = await self._rank_documents(embedded_query, user_id, class_id)
         
         # Retrieve similar chunks from vector store
-        return await self._vector_store.search_embeddings(
+        results = await self._vector_store.search_embeddings(
             embedded_query,
             user_id=str(user_id) if user_id else None,
             class_id=str(class_id) if class_id else None,
+            document_id=str(document_id) if document_id else None,
+            document_ids=[str(d) for d in document_ids] if document_ids else None,
+            chunk_range=chunk_range,
+            top_k=top_k * self.MMR_FETCH_MULTIPLIER if diversify else top_k,
+            with_vectors=diversify,
+        )
+
+        if diversify:
+            results = _mmr(embedded_query, results, top_k, mmr_lambda)
+            for hit in results:
+                hit.pop("vector", None)
+        return results
+
+    async def _rank_documents(
+        self,
+        embedded_query: list[float],
+        user_id: UUID,
+        class_id: Optional[UUID],
+    ) -> Optional[list[UUID]]:
+        """Top documents by centroid, or None when the flat search covers them all."""
+        limit = self._coarse_top_documents or 10
+        # One extra tells a library larger than the limit from one that fits
+        ranked = await self._vector_store.search_documents(
+            embedded_query,
+            top_k=limit + 1,
+            user_id=str(user_id) if user_id else None,
+            class_id=str(class_id) if class_id else None,
+        )
+        if len(ranked) <= limit:
+            # Includes documents without a centroid, which stage 1 cannot see
+            metrics.inc("search_two_stage_total", outcome="flat")
+            return None
+        metrics.inc("search_two_stage_total", outcome="narrowed")
+        return [UUID(hit["document_id"]) for hit in ranked[:limit]]
+
+    async def search_summaries(
+        self,
+        query: str,
+        user_id: UUID,
+        class_id: Optional[UUID] = None,
+        top_k: int = 5,
+        embedded_query: Optional[list[float]] = None,
+        document_id: Optional[UUID] = None,
+    ) -> list[dict]:
+        """
+        Retrieves the top-k most similar section / document summaries
+        (the coarse tier built at processing time). Hits have the chunk
+        shape, so they can be assembled into a prompt the same way.
+        """
+        if not query or not query.strip():
+            return []
+
+        if embedded_query is None:
+            embedded_query = await self.embed_query(query)
+
+        return await self._vector_store.search_summaries(
+            embedded_query,
+            user_id=str(user_id) if user_id else None,
+            class_id=str(class_id) if class_id else None,
+            document_id=str(document_id) if document_id else None,
             top_k=top_k,
         )
 
 
+def _centroid(vectors: list[list[float]]) -> list[float]:
+    """Normalized mean of the vectors."""
+    mean = [sum(values) / len(vectors) for values in zip(*vectors)]
+    norm = math.sqrt(sum(x * x for x in mean))
+    return [x / norm for x in mean] if norm else mean
+
+
+def _cosine(a: list[float], b: list[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _mmr(query: list[float], candidates: list[dict], top_k: int, mmr_lambda: float) -> list[dict]:
+    """Greedy maximal-marginal-relevance selection over vector-search hits."""
+    candidates = [c for c in candidates if c.get("vector")]
+    relevance = [_cosine(query, c["vector"]) for c in candidates]
+    selected: list[int] = []
+    remaining = list(range(len(candidates)))
+
+    while remaining and len(selected) < top_k:
+        def score(i: int) -> float:
+            redundancy = max(
+                (_cosine(candidates[i]["vector"], candidates[j]["vector"]) for j in selected),
+                default=0.0,
+            )
+            return mmr_lambda * relevance[i] - (1 - mmr_lambda) * redundancy
+
+        best = max(remaining, key=score)
+        selected.append(best)
+        remaining.remove(best)
+
+    return [candidates[i] for i in selected]
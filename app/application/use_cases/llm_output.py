@@ -0,0 +1,28 @@
+import json
+import re
+from typing import Optional
+
+_THINK_BLOCK = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+
+
+def strip_reasoning(response: Optional[str]) -> str:
+    """Drop <think> blocks that reasoning models put before their answer."""
+    return _THINK_BLOCK.sub("", response or "").strip()
+
+
+def parse_json_object(response: Optional[str]) -> Optional[dict]:
+    """
+    Read the JSON object an LLM was asked to output.
+
+    Tolerates reasoning blocks, code fences and prose around it; returns None
+    when there is no valid object.
+    """
+    text = strip_reasoning(response)
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    return data if isinstance(data, dict) else None
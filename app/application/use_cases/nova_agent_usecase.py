@@ -1,23 +1,32 @@
+import time
 import uuid
-from typing import Any, Dict, List, Annotated
+from typing import Any, AsyncGenerator, Dict, List, Annotated, Optional
 from typing_extensions import TypedDict
 
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, END
 from langgraph.graph.message import add_messages
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, RemoveMessage
+from langgraph.checkpoint.base import BaseCheckpointSaver
 
 from app.application.interfaces.llm_interface import ILLMInterface
 from app.application.use_cases.tutor_usecases import TutorUseCase
 from app.application.use_cases.ai_use_cases import GenerateQuizUseCase
+from app.adapters.agents.intent_classifier import IntentClassifier
 from app.adapters.agents.prompt_service import PromptService
+from app.core.logging import get_logger
+from app.core.metrics import metrics, use_case_label
 from app.domain.entities.ai_entity import QuizType
 
 
 from langgraph.checkpoint.memory import MemorySaver
 
+logger = get_logger(__name__)
+
 class AgentState(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
     context: Dict[str, Any]
+    summary: str  # rolling summary of messages that left the window
 
 
 class NovaAgentUseCase:
@@ -25,6 +34,13 @@ class NovaAgentUseCase:
     Use case that orchestration the Nova AI agentic flow using LangGraph.
     It takes an ILLMInterface, allowing flexibility between different LLM providers.
     Now includes conversational memory and persistent checkpointers.
+
+    MEMORY:
+    - One LangGraph thread per conversation (the group id in chat)
+    - The checkpointer persists it; defaults to in-process MemorySaver
+    - After each reply, once more than memory_window messages are held, the
+      oldest are folded into a rolling summary and removed, so the state
+      (and the history sent to the LLM) stays bounded
     """
 
     def __init__(
@@ -32,13 +48,18 @@ class NovaAgentUseCase:
         llm: ILLMInterface,
         tutor_use_case: TutorUseCase,
         quiz_use_case: GenerateQuizUseCase,
-        prompt_service: PromptService
+        prompt_service: PromptService,
+        intent_classifier: Optional[IntentClassifier] = None,
+        checkpointer: Optional[BaseCheckpointSaver] = None,
+        memory_window: int = 12
     ):
         self._llm = llm
         self._tutor_use_case = tutor_use_case
         self._quiz_use_case = quiz_use_case
         self._prompt_service = prompt_service
-        self._memory = MemorySaver()
+        self._intent_classifier = intent_classifier
+        self._memory = checkpointer or MemorySaver()
+        self._memory_window = max(memory_window, 2)
         self._graph = self._build_graph()
 
     def _build_graph(self):
@@ -48,6 +69,7 @@ class NovaAgentUseCase:
         workflow.add_node("tutor", self._tutor_node)
         workflow.add_node("quiz_gen", self._quiz_gen_node)
         workflow.add_node("conversational", self._conversational_node)
+        workflow.add_node("compact_memory", self._compact_memory_node)
 
         workflow.set_entry_point("router")
         workflow.add_conditional_edges(
@@ -60,29 +82,46 @@ class NovaAgentUseCase:
                 "end": END
             }
         )
-        workflow.add_edge("tutor", END)
-        workflow.add_edge("quiz_gen", END)
-        workflow.add_edge("conversational", END)
+        workflow.add_edge("tutor", "compact_memory")
+        workflow.add_edge("quiz_gen", "compact_memory")
+        workflow.add_edge("conversational", "compact_memory")
+        workflow.add_edge("compact_memory", END)
 
         return workflow.compile(checkpointer=self._memory)
 
     async def _route_node(self, state: AgentState):
-        """Analyze user intent using a dynamic prompt."""
+        """Analyze user intent: local classifier first, LLM router when unsure."""
         last_message = state["messages"][-1].content
-        
+
+        if self._intent_classifier is not None:
+            started = time.perf_counter()
+            prediction = await self._intent_classifier.classify(last_message)
+            metrics.observe("nova_route_local_seconds", time.perf_counter() - started)
+            if prediction is not None:
+                metrics.inc("nova_route_total", source=prediction.source, action=prediction.label)
+                logger.debug(
+                    f"Nova routed to {prediction.label} by {prediction.source} "
+                    f"({prediction.confidence:.2f})"
+                )
+                return {"context": {**state["context"], "action": prediction.label}}
+
         prompt = self._prompt_service.get_prompt("router", {"user_message": last_message})
-        
-        # Use our LLM interface
-        # We need a way to 'complete' with the prompt. 
-        # Since ILLMInterface is high-level, we use it directly.
-        action = await self._llm.complete(prompt)
+
+        started = time.perf_counter()
+        with use_case_label("nova_router"):
+            action = await self._llm.complete(prompt)
+        metrics.observe("nova_route_llm_seconds", time.perf_counter() - started)
         action = action.strip().lower()
-        
+
         if "quiz" in action:
-            return {"context": {"action": "quiz"}}
-        if "conversational" in action:
-            return {"context": {"action": "conversational"}}
-        return {"context": {"action": "tutor"}}
+            action = "quiz"
+        elif "conversational" in action:
+            action = "conversational"
+        else:
+            action = "tutor"
+        metrics.inc("nova_route_total", source="llm", action=action)
+        # context has no reducer: keep the caller's user_id / class_id
+        return {"context": {**state["context"], "action": action}}
 
     def _routing_logic(self, state: AgentState):
         action = state["context"].get("action")
@@ -96,22 +135,25 @@ class NovaAgentUseCase:
         """Handle general conversation and greetings."""
         last_message = state["messages"][-1].content
         
-        # History is automatically managed by the checkpointer in 'messages'
-        # But for the prompt, we can format it if needed
-        # However, to keep it simple, we just pass the last message or 
-        # let the LLM see the whole state if possible.
-        
+        # The window and summary kept by _compact_memory_node bound the history
         prompt = self._prompt_service.get_prompt("conversational", {
             "user_message": last_message,
-            "history": "" # History is already in the 'messages' list of the state
+            "history": self._format_history(state)
         })
         
-        response = await self._llm.complete(prompt)
-        return {"messages": [HumanMessage(content=response)]}
+        writer = get_stream_writer()
+        tokens = []
+        with use_case_label("nova_conversational"):
+            async for token in self._llm.complete_stream(prompt):
+                tokens.append(token)
+                writer({"token": token})
+        return {"messages": [AIMessage(content="".join(tokens))]}
 
     async def _tutor_node(self, state: AgentState):
         """Handle tutoring requests using context-aware prompts."""
-        question = state["messages"][-1].content
+        # Same text the intent classifier embedded, so retrieval reuses
+        # the cached embedding
+        question = IntentClassifier.clean(state["messages"][-1].content)
         user_id = state["context"].get("user_id")
         class_id = state["context"].get("class_id")
 
@@ -119,13 +161,17 @@ class NovaAgentUseCase:
         # Note: TutorUseCase currently does LLM call internally, 
         # but here we might just want the retrieval part if we want Nova to handle the final chain.
         # However, to keep it simple and reuse existing logic:
-        answer = await self._tutor_use_case.execute(
+        writer = get_stream_writer()
+        tokens = []
+        async for token in self._tutor_use_case.execute_stream(
             question=question,
             user_id=user_id,
             class_id=class_id
-        )
+        ):
+            tokens.append(token)
+            writer({"token": token})
         
-        return {"messages": [HumanMessage(content=answer)]}
+        return {"messages": [AIMessage(content="".join(tokens))]}
 
     async def _quiz_gen_node(self, state: AgentState):
         """Handle quiz generation."""
@@ -140,7 +186,50 @@ class NovaAgentUseCase:
         )
         
         response = f"I've generated a quiz for you: {quiz.title}. You can start it in the quiz section!"
-        return {"messages": [HumanMessage(content=response)]}
+        get_stream_writer()({"token": response})
+        return {"messages": [AIMessage(content=response)]}
+
+    async def _compact_memory_node(self, state: AgentState):
+        """Fold messages beyond the window into the rolling summary."""
+        messages = state["messages"]
+        if len(messages) <= self._memory_window:
+            return {}
+
+        # Trim to half the window so summarization runs every few turns, not every turn
+        folded = messages[:-(self._memory_window // 2)]
+        summary = state.get("summary", "")
+        try:
+            prompt = self._prompt_service.get_prompt("memory_summary", {
+                "summary": summary or "(none yet)",
+                "transcript": self._format_messages(folded),
+            })
+            with use_case_label("nova_memory"):
+                summary = (await self._llm.complete(prompt, max_tokens=300)).strip()
+        except Exception as e:
+            # Still trim: an unsummarized gap beats unbounded growth
+            logger.warning(f"Nova memory summarization failed: {e}")
+
+        metrics.inc("nova_memory_compactions_total")
+        return {
+            "summary": summary,
+            "messages": [RemoveMessage(id=m.id) for m in folded],
+        }
+
+    def _format_history(self, state: AgentState) -> str:
+        """Summary plus the windowed messages before the current one."""
+        parts = []
+        if state.get("summary"):
+            parts.append(f"Summary of earlier conversation: {state['summary']}")
+        earlier = self._format_messages(state["messages"][:-1])
+        if earlier:
+            parts.append(earlier)
+        return "\n".join(parts)
+
+    @staticmethod
+    def _format_messages(messages: List[BaseMessage]) -> str:
+        return "\n".join(
+            f"{'Nova' if isinstance(m, AIMessage) else 'Student'}: {m.content}" for m in messages
+        )
 
     async def execute(
         self, 
@@ -150,17 +239,39 @@ class NovaAgentUseCase:
         conversation_id: str = None
     ) -> Dict[str, Any]:
         """Execute the agentic workflow."""
-        initial_state = {
+        return await self._graph.ainvoke(
+            self._initial_state(input_text, user_id, class_id),
+            config=self._config(conversation_id),
+        )
+
+    async def execute_stream(
+        self,
+        input_text: str,
+        user_id: uuid.UUID = None,
+        class_id: uuid.UUID = None,
+        conversation_id: str = None
+    ) -> AsyncGenerator[str, None]:
+        """Execute the workflow, yielding the reply tokens as the nodes produce them."""
+        async for chunk in self._graph.astream(
+            self._initial_state(input_text, user_id, class_id),
+            config=self._config(conversation_id),
+            stream_mode="custom",
+        ):
+            token = chunk.get("token") if isinstance(chunk, dict) else None
+            if token:
+                yield token
+
+    @staticmethod
+    def _initial_state(input_text: str, user_id: uuid.UUID, class_id: uuid.UUID) -> Dict[str, Any]:
+        return {
             "messages": [HumanMessage(content=input_text)],
             "context": {
                 "user_id": user_id,
                 "class_id": class_id
             }
         }
-        
-        # LangGraph dynamic execution
-        # Note: We use a wrapper since we can't easily use LangChain's Runnable directly 
-        # with our custom ILLMInterface without an adapter.
-        # However, for now, the nodes handle the calls.
-        
-        return await self._graph.ainvoke(initial_state)
+
+    @staticmethod
+    def _config(conversation_id: Optional[str]) -> Dict[str, Any]:
+        # The checkpointer keys memory by thread; one-off calls get their own
+        return {"configurable": {"thread_id": conversation_id or str(uuid.uuid4())}}
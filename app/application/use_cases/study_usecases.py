@@ -1,8 +1,19 @@
 import uuid
-from typing import List, Optional
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
 
-from app.application.interfaces.study_session_interface import IStudySessionInterface
-from app.domain.entities.study_session_entity import StudySession
+from app.application.interfaces.document_interface import (
+    IDocumentInterface, IVectorStoreInterface)
+from app.application.interfaces.study_session_interface import (
+    IStudyRollupInterface, IStudySessionInterface)
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.domain.entities.study_session_entity import (RollupScope,
+                                                      StudyRollup,
+                                                      StudySession)
+
+logger = get_logger(__name__)
 
 
 class StartStudySessionUseCase:
@@ -70,20 +81,168 @@ class EndStudySessionUseCase:
 
 
 class GetStudyStatsUseCase:
-    def __init__(self, study_repo: IStudySessionInterface) -> None:
+    """
+    Study totals for a user, read from the pre-aggregated rollups.
+
+    Rollups trail live sessions by up to one refresh interval. A user who
+    has not been rolled up yet is aggregated on the fly.
+    """
+
+    def __init__(
+        self,
+        study_repo: IStudySessionInterface,
+        rollup_repo: Optional[IStudyRollupInterface] = None,
+    ) -> None:
         self._study_repo = study_repo
+        self._rollup_repo = rollup_repo
 
     async def execute(self, user_id: uuid.UUID) -> dict:
-        total = await self._study_repo.get_total_duration(user_id)
-        sessions = await self._study_repo.list_by_user(user_id, limit=1000)
-        
-        class_stats = {}
-        for s in sessions:
-            key = str(s.class_id) if s.class_id else "personal"
-            class_stats[key] = class_stats.get(key, 0) + s.duration_seconds
-            
+        rollups: List[StudyRollup] = []
+        if self._rollup_repo:
+            rollups = await self._rollup_repo.list_for_user(user_id)
+        if not rollups:
+            rollups = build_rollups(user_id, await self._study_repo.aggregate_by_document(user_id))
+
+        total = next((r for r in rollups if r.scope == RollupScope.TOTAL), None)
+        class_stats = {
+            r.scope_key or "personal": r.total_seconds
+            for r in rollups
+            if r.scope == RollupScope.CLASS
+        }
         return {
-            "total_study_seconds": total,
-            "total_sessions": len(sessions),
-            "class_stats": class_stats
+            "total_study_seconds": total.total_seconds if total else 0,
+            "total_sessions": total.session_count if total else 0,
+            "class_stats": class_stats,
+            "top_documents": [
+                {"document_id": r.scope_key, "title": r.label, "seconds": r.total_seconds}
+                for r in rollups
+                if r.scope == RollupScope.DOCUMENT
+            ][:5],
+            "top_concepts": [
+                {"concept": r.label, "seconds": r.total_seconds}
+                for r in rollups
+                if r.scope == RollupScope.CONCEPT
+            ][:5],
         }
+
+
+class RefreshStudyRollupsUseCase:
+    """
+    Fold new study activity into the rollup table (run by Celery beat).
+
+    Only users with a heartbeat since the last refresh are touched; each of
+    them is re-aggregated from their sessions with one GROUP BY, so a run is
+    idempotent and late heartbeats are never double counted. Concepts come
+    from the key concepts of each document's precomputed summary.
+
+    The watermark is the start time of the last run that finished. A run
+    that fails part-way leaves it unchanged, so the next run retries every
+    user since then, including the ones already refreshed.
+    """
+
+    def __init__(
+        self,
+        study_repo: IStudySessionInterface,
+        rollup_repo: IStudyRollupInterface,
+        document_repo: IDocumentInterface,
+        vector_store: Optional[IVectorStoreInterface] = None,
+        overlap_seconds: int = 300,
+    ) -> None:
+        self._study_repo = study_repo
+        self._rollup_repo = rollup_repo
+        self._document_repo = document_repo
+        self._vector_store = vector_store
+        # Re-read a little before the watermark for commits that landed late
+        self._overlap = timedelta(seconds=overlap_seconds)
+
+    async def execute(self) -> int:
+        started_at = datetime.now(timezone.utc)
+        watermark = await self._rollup_repo.get_watermark()
+        since = watermark - self._overlap if watermark else None
+        user_ids = await self._study_repo.list_users_active_since(since)
+
+        documents: Dict[str, Tuple[Optional[str], List[str]]] = {}
+        for user_id in user_ids:
+            per_document = await self._study_repo.aggregate_by_document(user_id)
+            for rollup in per_document:
+                if rollup.scope_key not in documents:
+                    documents[rollup.scope_key] = await self._describe_document(rollup.scope_key)
+            rollups = build_rollups(user_id, per_document, documents)
+            await self._rollup_repo.replace_for_user(user_id, rollups)
+
+        await self._rollup_repo.set_watermark(started_at)
+        metrics.inc("study_rollup_users_total", len(user_ids))
+        logger.info(f"Study rollups refreshed for {len(user_ids)} users since {since}")
+        return len(user_ids)
+
+    async def _describe_document(self, document_id: str) -> Tuple[Optional[str], List[str]]:
+        """(title, key concepts) of a document; missing parts are empty."""
+        document = await self._document_repo.get_any_by_id(uuid.UUID(document_id))
+        concepts: List[str] = []
+        if self._vector_store:
+            try:
+                summary = await self._vector_store.get_document_summary(document_id)
+                concepts = summary.key_concepts if summary else []
+            except Exception as e:
+                logger.warning(f"No key concepts for document {document_id}: {e}")
+        return (document.title if document else None), concepts
+
+
+def build_rollups(
+    user_id: uuid.UUID,
+    per_document: List[StudyRollup],
+    documents: Optional[Dict[str, Tuple[Optional[str], List[str]]]] = None,
+) -> List[StudyRollup]:
+    """Derive TOTAL, CLASS and CONCEPT rollups from per-document ones (labelled from `documents`)."""
+    documents = documents or {}
+    total = StudyRollup(user_id=user_id, scope=RollupScope.TOTAL)
+    classes: Dict[Optional[uuid.UUID], StudyRollup] = {}
+    concepts: Dict[Tuple[Optional[uuid.UUID], str], StudyRollup] = {}
+    concept_seconds: Dict[Tuple[Optional[uuid.UUID], str], float] = defaultdict(float)
+
+    def fold(target: StudyRollup, source: StudyRollup) -> None:
+        target.session_count += source.session_count
+        if source.last_studied_at and (
+            target.last_studied_at is None or source.last_studied_at > target.last_studied_at
+        ):
+            target.last_studied_at = source.last_studied_at
+
+    for doc in per_document:
+        title, doc_concepts = documents.get(doc.scope_key, (None, []))
+        doc.label = title
+
+        total.total_seconds += doc.total_seconds
+        fold(total, doc)
+        class_rollup = classes.setdefault(
+            doc.class_id,
+            StudyRollup(
+                user_id=user_id,
+                scope=RollupScope.CLASS,
+                scope_key=str(doc.class_id) if doc.class_id else "",
+                class_id=doc.class_id,
+            ),
+        )
+        class_rollup.total_seconds += doc.total_seconds
+        fold(class_rollup, doc)
+
+        for concept in doc_concepts:
+            key = (doc.class_id, concept.strip().lower())
+            concept_rollup = concepts.setdefault(
+                key,
+                StudyRollup(
+                    user_id=user_id,
+                    scope=RollupScope.CONCEPT,
+                    scope_key=key[1][:255],
+                    class_id=doc.class_id,
+                    label=concept.strip(),
+                ),
+            )
+            concept_seconds[key] += doc.total_seconds / len(doc_concepts)
+            fold(concept_rollup, doc)
+
+    for key, seconds in concept_seconds.items():
+        concepts[key].total_seconds = round(seconds)
+
+    rollups = [total, *classes.values(), *per_document, *concepts.values()]
+    rollups.sort(key=lambda r: r.total_seconds, reverse=True)
+    return rollups
@@ -1,8 +1,24 @@
+import re
 import uuid
 from typing import AsyncGenerator, List, Optional
 
+from app.adapters.agents.context_assembler import ContextAssembler
+from app.application.interfaces.answer_cache_interface import IAnswerCacheInterface
+from app.application.interfaces.chat_interface import IChatGroupInterface
 from app.application.interfaces.llm_interface import ILLMInterface
+from app.application.use_cases.chat_usecases import CheckClassMembershipUseCase
 from app.application.use_cases.document_usecases import SearchDocumentsUseCase
+from app.core.metrics import metrics, use_case_label
+from app.domain.entities.ai_entity import CachedAnswer
+
+# Questions about a document as a whole rather than a detail in it
+BROAD_QUESTION = re.compile(
+    r"\b(summar(y|ise|ize|ies)|overview|outline|recap|gist|tl;?dr"
+    r"|main (topics?|ideas?|points?|themes?|concepts?)|key (topics?|ideas?|points?|concepts?|takeaways?)"
+    r"|what (is|are) (this|the) (document|chapter|section|book|material|notes?) about"
+    r"|(chapter|section|unit|part) \d+ (about|cover))",
+    re.IGNORECASE,
+)
 
 
 class TutorUseCase:
@@ -16,66 +32,219 @@ If the answer isn't in the context, use your general knowledge but mention that
 Always be encouraging, professional, and educational."""
 
     def __init__(
-        self, 
-        llm: ILLMInterface, 
-        search_use_case: SearchDocumentsUseCase
+        self,
+        llm: ILLMInterface,
+        search_use_case: SearchDocumentsUseCase,
+        answer_cache: Optional[IAnswerCacheInterface] = None,
+        similarity_threshold: float = 0.92,
+        context_assembler: Optional[ContextAssembler] = None,
+        membership: Optional[CheckClassMembershipUseCase] = None,
     ) -> None:
         self._llm = llm
         self._search_use_case = search_use_case
+        self._context_assembler = context_assembler or ContextAssembler()
+        self._answer_cache = answer_cache
+        self._similarity_threshold = similarity_threshold
+        # Class-scoped answers are only shared with members; without a
+        # membership check they are never cached
+        self._membership = membership
 
     async def execute(
-        self, 
-        question: str, 
+        self,
+        question: str,
         user_id: uuid.UUID,
         document_id: Optional[uuid.UUID] = None,
         class_id: Optional[uuid.UUID] = None,
         top_k: int = 5
     ) -> str:
-        # 1. Retrieve relevant context
-        context_chunks = await self._search_use_case.execute(
-            query=question,
-            user_id=user_id,
-            class_id=class_id,
-            top_k=top_k
-        )
-        
-        # If document_id is provided, we could filter here 
-        # (though search_embeddings supports document_id as well)
-        if document_id:
-            context_chunks = [c for c in context_chunks if c.get("document_id") == str(document_id)]
+        with use_case_label("tutor"):
+            # 1. Serve semantically identical questions from the answer cache
+            embedded_question = await self._embed_question(question)
+            scope = await self._cache_scope(user_id, class_id, document_id)
+            cached = await self._lookup_answer(embedded_question, scope, class_id)
+            if cached:
+                return cached.answer
+
+            # 2. Retrieve relevant context
+            context_chunks = await self._retrieve(
+                question, embedded_question, user_id, document_id, class_id, top_k
+            )
+            versions = await self._document_versions(context_chunks)
 
-        # 2. Format context for prompt
-        context_text = "\n\n".join([c["content"] for c in context_chunks])
-        
-        prompt = f"Context from study materials:\n{context_text}\n\nQuestion: {question}"
+            # 3. Get LLM completion
+            prompt = self._build_prompt(question, context_chunks)
+            answer = await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT)
 
-        # 3. Get LLM completion
-        return await self._llm.complete(prompt, system_message=self.SYSTEM_PROMPT)
+            await self._store_answer(
+                question, embedded_question, answer, context_chunks, versions, scope
+            )
+            return answer
 
     async def execute_stream(
-        self, 
-        question: str, 
+        self,
+        question: str,
         user_id: uuid.UUID,
         document_id: Optional[uuid.UUID] = None,
         class_id: Optional[uuid.UUID] = None,
         top_k: int = 5
     ) -> AsyncGenerator[str, None]:
-        # 1. Retrieve relevant context
-        context_chunks = await self._search_use_case.execute(
+        with use_case_label("tutor"):
+            # 1. Cache hits are streamed back in one piece
+            embedded_question = await self._embed_question(question)
+            scope = await self._cache_scope(user_id, class_id, document_id)
+            cached = await self._lookup_answer(embedded_question, scope, class_id)
+            if cached:
+                yield cached.answer
+                return
+
+            # 2. Retrieve relevant context
+            context_chunks = await self._retrieve(
+                question, embedded_question, user_id, document_id, class_id, top_k
+            )
+            versions = await self._document_versions(context_chunks)
+
+            # 3. Stream LLM completion
+            prompt = self._build_prompt(question, context_chunks)
+            parts: List[str] = []
+            async for chunk in self._llm.complete_stream(prompt, system_message=self.SYSTEM_PROMPT):
+                parts.append(chunk)
+                yield chunk
+
+            # Only fully streamed answers are cached
+            await self._store_answer(
+                question, embedded_question, "".join(parts), context_chunks, versions, scope
+            )
+
+    async def _embed_question(self, question: str) -> Optional[List[float]]:
+        if not question or not question.strip():
+            return None
+        return await self._search_use_case.embed_query(question)
+
+    async def _retrieve(
+        self,
+        question: str,
+        embedded_question: Optional[List[float]],
+        user_id: uuid.UUID,
+        document_id: Optional[uuid.UUID],
+        class_id: Optional[uuid.UUID],
+        top_k: int,
+    ) -> List[dict]:
+        # Broad questions are answered from the precomputed summaries
+        if BROAD_QUESTION.search(question or ""):
+            summaries = await self._search_use_case.search_summaries(
+                query=question,
+                user_id=user_id,
+                class_id=class_id,
+                document_id=document_id,
+                top_k=top_k,
+                embedded_query=embedded_question,
+            )
+            metrics.inc("tutor_retrieval_total", tier="summary" if summaries else "chunk")
+            if summaries:
+                return summaries
+        else:
+            metrics.inc("tutor_retrieval_total", tier="chunk")
+
+        return await self._search_use_case.execute(
             query=question,
             user_id=user_id,
             class_id=class_id,
-            top_k=top_k
+            document_id=document_id,
+            top_k=top_k,
+            embedded_query=embedded_question,
+        )
+
+    def _build_prompt(self, question: str, context_chunks: List[dict]) -> str:
+        context_text = self._context_assembler.assemble(context_chunks, model=self._llm.model_name)
+        return f"Context from study materials:\n{context_text}\n\nQuestion: {question}"
+
+    async def _cache_scope(
+        self,
+        user_id: uuid.UUID,
+        class_id: Optional[uuid.UUID],
+        document_id: Optional[uuid.UUID],
+    ) -> Optional[str]:
+        """Answer cache scope the caller may read and write, or None to bypass the cache."""
+        if not self._answer_cache or not (class_id or document_id):
+            return None
+        if class_id and not (self._membership and await self._membership.execute(class_id, user_id)):
+            metrics.inc("answer_cache_requests_total", result="not_member")
+            return None
+        return self._answer_cache.scope_for(user_id, class_id, document_id)
+
+    async def _lookup_answer(
+        self,
+        embedded_question: Optional[List[float]],
+        scope: Optional[str],
+        class_id: Optional[uuid.UUID],
+    ) -> Optional[CachedAnswer]:
+        if not self._answer_cache or embedded_question is None or scope is None:
+            return None
+
+        threshold = self._similarity_threshold
+        if class_id:
+            threshold = await self._answer_cache.get_threshold(class_id) or threshold
+
+        return await self._answer_cache.lookup(scope, embedded_question, threshold)
+
+    async def _document_versions(self, context_chunks: List[dict]) -> Optional[dict]:
+        if not self._answer_cache:
+            return {}
+        document_ids = sorted({str(c["document_id"]) for c in context_chunks if c.get("document_id")})
+        return await self._answer_cache.get_document_versions(document_ids)
+
+    async def _store_answer(
+        self,
+        question: str,
+        embedded_question: Optional[List[float]],
+        answer: str,
+        context_chunks: List[dict],
+        document_versions: Optional[dict],
+        scope: Optional[str],
+    ) -> None:
+        if not self._answer_cache or embedded_question is None or not answer or scope is None:
+            return
+        if document_versions is None:
+            return  # versions unknown: the entry could never be invalidated
+
+        await self._answer_cache.store(
+            scope,
+            CachedAnswer(
+                question=question,
+                answer=answer,
+                embedding=embedded_question,
+                cited_chunks=[
+                    {"document_id": c.get("document_id"), "chunk_index": c.get("chunk_index")}
+                    for c in context_chunks
+                ],
+                document_versions=document_versions,
+            ),
         )
-        
-        if document_id:
-            context_chunks = [c for c in context_chunks if c.get("document_id") == str(document_id)]
-
-        # 2. Format context for prompt
-        context_text = "\n\n".join([c["content"] for c in context_chunks])
-        
-        prompt = f"Context from study materials:\n{context_text}\n\nQuestion: {question}"
-
-        # 3. Stream LLM completion
-        async for chunk in self._llm.complete_stream(prompt, system_message=self.SYSTEM_PROMPT):
-            yield chunk
+
+
+class SetAnswerCacheThresholdUseCase:
+    """Tune how similar a question must be to reuse a cached answer – class admins only."""
+
+    MIN_THRESHOLD = 0.5
+    MAX_THRESHOLD = 1.0
+
+    def __init__(self, group_repo: IChatGroupInterface, answer_cache: IAnswerCacheInterface) -> None:
+        self._group_repo = group_repo
+        self._answer_cache = answer_cache
+
+    async def execute(self, class_id: uuid.UUID, user_id: uuid.UUID, threshold: float) -> float:
+        if not self.MIN_THRESHOLD <= threshold <= self.MAX_THRESHOLD:
+            raise ValueError(
+                f"Similarity threshold must be between {self.MIN_THRESHOLD} and {self.MAX_THRESHOLD}"
+            )
+
+        group = await self._group_repo.get_by_id(class_id)
+        if not group:
+            raise ValueError("Class not found")
+
+        member = group.get_member(user_id)
+        if not member or not member.is_admin_or_owner():
+            raise PermissionError("Only admins or the owner can tune the answer cache")
+
+        await self._answer_cache.set_threshold(class_id, threshold)
+        return threshold
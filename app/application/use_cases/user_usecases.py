@@ -1,12 +1,13 @@
 """User / profile use cases."""
 import uuid
+from typing import Optional
 
 from fastapi import UploadFile
 
 from app.application.interfaces import (IJwtService, IStorageService,
-                                        IUserInterface)
+                                        IUserInterface, IUserProfileCache)
 from app.core.logging import get_logger
-from app.domain.entities import User
+from app.domain.entities import User, UserProfile
 from app.domain.exceptions import (AccountInactiveError, AuthenticationError,
                                    InvalidCredentialError,
                                    InvalidUsernameError, UsernameCooldownError,
@@ -26,6 +27,18 @@ async def _get_active_user(user_repo: IUserInterface, user_id: uuid.UUID) -> Use
     return user
 
 
+async def _save_profile(
+    user_repo: IUserInterface,
+    profile_cache: Optional[IUserProfileCache],
+    user: User,
+) -> User:
+    """Persist a profile change and rewrite the shared profile cache."""
+    user = await user_repo.update(user)
+    if profile_cache:
+        await profile_cache.set(UserProfile.from_user(user))
+    return user
+
+
 # ── Get Current User ─────────────────────────────────────────────
 
 class GetCurrentUserUseCase:
@@ -39,8 +52,9 @@ class GetCurrentUserUseCase:
 # ── Update Profile  (first / last name) ──────────────────────────
 
 class UpdateProfileUseCase:
-    def __init__(self, user_repo: IUserInterface) -> None:
+    def __init__(self, user_repo: IUserInterface, profile_cache: Optional[IUserProfileCache] = None) -> None:
         self._user_repo = user_repo
+        self._profile_cache = profile_cache
 
     async def execute(
         self,
@@ -53,34 +67,41 @@ class UpdateProfileUseCase:
             first_name=first_name or user.first_name,
             last_name=last_name or user.last_name,
         )
-        return await self._user_repo.update(user)
+        return await _save_profile(self._user_repo, self._profile_cache, user)
 
 
 # ── Upload Avatar ────────────────────────────────────────────────
 
 class UploadAvatarUseCase:
-    def __init__(self, user_repo: IUserInterface, storage: IStorageService) -> None:
+    def __init__(
+        self,
+        user_repo: IUserInterface,
+        storage: IStorageService,
+        profile_cache: Optional[IUserProfileCache] = None,
+    ) -> None:
         self._user_repo = user_repo
         self._storage = storage
+        self._profile_cache = profile_cache
 
     async def execute(self, user_id: uuid.UUID, file: UploadFile) -> User:
         result = await self._storage.upload_avatar(file)
         avatar_url = result["file_url"]
         user = await _get_active_user(self._user_repo, user_id)
         user.update_avatar(avatar_url)
-        return await self._user_repo.update(user)
+        return await _save_profile(self._user_repo, self._profile_cache, user)
 
 
 # ── Remove Avatar ────────────────────────────────────────────────
 
 class RemoveAvatarUseCase:
-    def __init__(self, user_repo: IUserInterface) -> None:
+    def __init__(self, user_repo: IUserInterface, profile_cache: Optional[IUserProfileCache] = None) -> None:
         self._user_repo = user_repo
+        self._profile_cache = profile_cache
 
     async def execute(self, user_id: uuid.UUID) -> User:
         user = await _get_active_user(self._user_repo, user_id)
         user.update_avatar(None)
-        return await self._user_repo.update(user)
+        return await _save_profile(self._user_repo, self._profile_cache, user)
 
 
 # ── Set Password (first-time, e.g. Google users) ─────────────────
@@ -127,20 +148,24 @@ class ChangePasswordUseCase:
 # ── Deactivate Account ───────────────────────────────────────────
 
 class DeactivateAccountUseCase:
-    def __init__(self, user_repo: IUserInterface) -> None:
+    def __init__(self, user_repo: IUserInterface, profile_cache: Optional[IUserProfileCache] = None) -> None:
         self._user_repo = user_repo
+        self._profile_cache = profile_cache
 
     async def execute(self, user_id: uuid.UUID) -> None:
         user = await _get_active_user(self._user_repo, user_id)
         user.is_active = False
         await self._user_repo.update(user)
+        if self._profile_cache:
+            await self._profile_cache.invalidate(user_id)
 
 
 # ── Update Username ─────────────────────────────────────────────
 
 class UpdateUsernameUseCase:
-    def __init__(self, user_repo: IUserInterface) -> None:
+    def __init__(self, user_repo: IUserInterface, profile_cache: Optional[IUserProfileCache] = None) -> None:
         self._user_repo = user_repo
+        self._profile_cache = profile_cache
 
     async def execute(self, user_id: uuid.UUID, new_username: str) -> User:
         # Validate format
@@ -166,4 +191,4 @@ class UpdateUsernameUseCase:
             )
 
         user.update_username(new_username.lower())
-        return await self._user_repo.update(user)
+        return await _save_profile(self._user_repo, self._profile_cache, user)
@@ -43,6 +43,14 @@ class Settings(BaseSettings):
     QDRANT_PORT: int = 6333
     QDRANT_VECTOR_SIZE: int = 1536
     QDRANT_COLLECTION_NAME: str = "novaacademy"
+    QDRANT_SUMMARY_COLLECTION_NAME: str = "novaacademy_summaries"  # coarse tier
+
+    # ── Retrieval ───────────────────────────────────────────────
+    # Rank documents by centroid, then search their chunks. Documents without a
+    # centroid (processed before centroids existed) are skipped, so only enable
+    # once they have all been reprocessed.
+    SEARCH_TWO_STAGE_ENABLED: bool = False
+    SEARCH_COARSE_TOP_DOCUMENTS: int = 8  # documents kept by the first stage
 
     # ── LLM ─────────────────────────────────────────────────────
     OPENAI_API_KEY: Optional[str] = None
@@ -56,6 +64,75 @@ class Settings(BaseSettings):
 
     LLM_PROVIDER: str = "openai"  # "openai" or "ollama"
 
+    # ── LLM HTTP clients ────────────────────────────────────────
+    LLM_HTTP2: bool = True  # used when the h2 package is installed
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    LLM_CONNECT_TIMEOUT: float = 5.0
+    LLM_READ_TIMEOUT: float = 120.0  # CPU-bound Ollama can be slow to produce tokens
+    LLM_WRITE_TIMEOUT: float = 10.0
+    LLM_POOL_TIMEOUT: float = 5.0
+    LLM_MAX_RETRIES: int = 2
+    LLM_COALESCING_ENABLED: bool = True  # share identical in-flight LLM calls
+
+    # ── LLM routing ─────────────────────────────────────────────
+    LLM_FALLBACK_PROVIDERS: list[str] = ["ollama"]  # tried after LLM_PROVIDER
+    LLM_HEDGE_AFTER_SECONDS: Optional[float] = None  # e.g. 2.0 to hedge slow first tokens
+    LLM_ROUTING_COOLDOWN: float = 30.0  # seconds a failing provider is skipped
+    LLM_ROUTING_SLOW_SECONDS: Optional[float] = None  # demote providers with a slower median
+
+    # ── Streaming ───────────────────────────────────────────────
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # keep-alive comment interval on idle streams
+
+    # ── LLM context budget ──────────────────────────────────────
+    # Estimated prompt tokens allowed for retrieved context, per model name
+    LLM_CONTEXT_TOKEN_BUDGETS: dict[str, int] = {
+        "gpt-4.1": 6000,
+        "qwen3:latest": 1500,
+    }
+    LLM_CONTEXT_TOKEN_BUDGET_DEFAULT: int = 2000
+
+    # ── Nova routing ────────────────────────────────────────────
+    NOVA_INTENT_CLASSIFIER_ENABLED: bool = True  # rules + centroids before the LLM router
+    NOVA_INTENT_MIN_SIMILARITY: float = 0.6  # centroid cosine needed to skip the LLM
+    NOVA_INTENT_MIN_MARGIN: float = 0.05  # lead over the runner-up intent
+    NOVA_WORKER_CONCURRENCY: int = 2  # @Nova replies generated at once per instance
+    NOVA_WORKER_QUEUE_SIZE: int = 100  # pending replies before triggers are dropped
+    NOVA_DELTA_FLUSH_SECONDS: float = 0.05  # batch streamed tokens into message_delta events
+    NOVA_MEMORY_WINDOW: int = 12  # messages kept verbatim; older ones are summarized
+    NOVA_MEMORY_TTL: int = 7 * 24 * 3600  # idle conversations are forgotten after 7 days
+
+    # ── Embedding cache ─────────────────────────────────────────
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 2048  # in-process LRU size
+    EMBEDDING_CACHE_TTL: int = 7 * 24 * 3600  # Redis TTL (7 days)
+
+    # ── Tutor answer cache ──────────────────────────────────────
+    TUTOR_ANSWER_CACHE_ENABLED: bool = True
+    TUTOR_ANSWER_CACHE_THRESHOLD: float = 0.92  # default cosine similarity for a hit
+    TUTOR_ANSWER_CACHE_MAX_ENTRIES: int = 100  # recent answers kept per class
+    TUTOR_ANSWER_CACHE_TTL: int = 24 * 3600  # 1 day
+
+    # ── Quiz bank ───────────────────────────────────────────────
+    QUIZ_BANK_ENABLED: bool = True  # pregenerate questions when a document is READY
+    QUIZ_BANK_TYPES: list[str] = ["mcq"]
+    QUIZ_BANK_SECTION_CHUNKS: int = 6  # consecutive chunks per generation call
+    QUIZ_BANK_MAX_SECTIONS: int = 8  # sections grow past SECTION_CHUNKS to stay under this
+    QUIZ_BANK_QUESTIONS_PER_SECTION: int = 4
+    QUIZ_BANK_CONCURRENCY: int = 3  # sections generated at once
+
+    # ── Document summaries ──────────────────────────────────────
+    DOCUMENT_SUMMARY_ENABLED: bool = True  # map-reduce summaries during processing
+    DOCUMENT_SUMMARY_SECTION_CHUNKS: int = 8  # consecutive chunks per section summary
+    DOCUMENT_SUMMARY_MAX_SECTIONS: int = 12  # sections grow past SECTION_CHUNKS to stay under this
+    DOCUMENT_SUMMARY_MAX_KEY_CONCEPTS: int = 12
+    DOCUMENT_SUMMARY_CONCURRENCY: int = 3  # section summaries generated at once
+
+    # ── Study analytics ─────────────────────────────────────────
+    STUDY_ROLLUP_INTERVAL_MINUTES: int = 5  # Celery beat refresh of study_rollups
+    STUDY_ROLLUP_OVERLAP_SECONDS: int = 300  # re-read window before the watermark
+
     # ── File storage ────────────────────────────────────────────
     UPLOAD_DIR: str = "./uploads"
     MAX_IMAGE_SIZE_KB: int = 2048  # 2MB
@@ -74,12 +151,23 @@ class Settings(BaseSettings):
     USE_SSL: bool = False
     
     WS_HEARTBEAT_INTERVAL: int = 30  # seconds
-    WS_PRESENCE_TTL: int = 300  # seconds (5 minutes)
+    WS_PRESENCE_TTL: int = 90  # seconds since a user's last heartbeat (3 missed = offline)
     WS_MAX_CONNECTIONS: int = 5000
+    WS_SEND_QUEUE_SIZE: int = 64  # outbound events buffered per connection
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0  # one frame stuck this long evicts the client
+    WS_TYPING_TIMEOUT_SECONDS: float = 5.0  # typing stops after this long without a frame
+    WS_TYPING_REFRESH_SECONDS: float = 3.0  # "still typing" re-published at most this often
+    WS_TYPING_ROSTER_SECONDS: float = 0.5  # typing rosters sent to sockets (when changed)
+    WS_TRANSPORT: str = "pubsub"  # "pubsub" or "streams" (durable, clients can resume)
+    WS_STREAM_MAXLEN: int = 1000  # chat messages kept per group stream (approximate)
+    WS_STREAM_TTL_SECONDS: int = 24 * 3600  # idle group streams are dropped after this
+    WS_REPLAY_LIMIT: int = 500  # missed events replayed on reconnect before a full resync
     
     # Cache Settings
     CACHE_GROUP_TTL: int = 3600  # 1 hour
     CACHE_MESSAGE_TTL: int = 300  # 5 minutes
+    USER_PROFILE_CACHE_TTL: int = 7 * 24 * 3600  # refilled on every login / token refresh
+    CHAT_MEMBERSHIP_CACHE_TTL: int = 24 * 3600  # refilled from the database on a miss
     
     # Rate Limiting
     RATE_LIMIT_MESSAGES_PER_MINUTE: int = 60
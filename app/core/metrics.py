@@ -0,0 +1,135 @@
+import statistics
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Name of the use case on whose behalf LLM calls are made (a metrics label)
+current_use_case: ContextVar[str] = ContextVar("current_use_case", default="unknown")
+
+
+@contextmanager
+def use_case_label(name: str) -> Iterator[None]:
+    """Label everything recorded inside the block with the calling use case."""
+    token = current_use_case.set(name)
+    try:
+        yield
+    finally:
+        try:
+            current_use_case.reset(token)
+        except ValueError:
+            # An abandoned async generator is finalised in another context
+            pass
+
+
+class _Summary:
+    """Count / sum / max plus a window of recent values for quantiles."""
+
+    def __init__(self, window: int) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = float("-inf")
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+        self.recent.append(value)
+
+    def to_dict(self) -> Dict[str, float]:
+        ordered = sorted(self.recent)
+
+        def quantile(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "avg": self.total / self.count,
+            "max": self.max,
+            "p50": statistics.median(ordered),
+            "p95": quantile(0.95),
+            "p99": quantile(0.99),
+        }
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics registry.
+
+    Counters and gauges are keyed by metric name plus a sorted label set,
+    so the same metric can be split by model, cache layer, group, etc.
+    Summaries keep count/sum/max and quantiles over the most recent
+    observations. Values are per-process; each API instance / worker
+    exposes its own.
+    """
+
+    SUMMARY_WINDOW = 1024
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(dict)
+        self._gauges: Dict[str, Dict[LabelKey, float]] = defaultdict(dict)
+        self._summaries: Dict[str, Dict[LabelKey, _Summary]] = defaultdict(dict)
+
+    @staticmethod
+    def _labels(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1.0, **labels: Any) -> None:
+        """Increment a counter."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Set a gauge to an absolute value."""
+        key = self._labels(labels)
+        with self._lock:
+            self._gauges[name][key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Record one observation (latency, size, rate…) in a summary."""
+        key = self._labels(labels)
+        with self._lock:
+            series = self._summaries[name]
+            if key not in series:
+                series[key] = _Summary(self.SUMMARY_WINDOW)
+            series[key].observe(value)
+
+    def get_counter(self, name: str, **labels: Any) -> float:
+        """Return the current value of a single counter series (0 if unset)."""
+        with self._lock:
+            return self._counters.get(name, {}).get(self._labels(labels), 0.0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a JSON-serialisable view of every metric."""
+        with self._lock:
+            return {
+                "counters": {
+                    name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                    for name, series in self._counters.items()
+                },
+                "gauges": {
+                    name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                    for name, series in self._gauges.items()
+                },
+                "summaries": {
+                    name: [{"labels": dict(k), **v.to_dict()} for k, v in series.items()]
+                    for name, series in self._summaries.items()
+                },
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+metrics = MetricsRegistry()
@@ -22,6 +22,9 @@ class QuizQuestion:
     options: List[str] = field(default_factory=list)
     correct_answer: str = ""
     explanation: Optional[str] = None
+    quiz_type: QuizType = QuizType.MCQ
+    document_id: Optional[UUID] = None  # Set for questions kept in the quiz bank
+    section_index: Optional[int] = None  # Section of the document the question covers
 
 @dataclass
 class Quiz:
@@ -44,6 +47,37 @@ class PerformanceAnalysis:
     id: UUID = field(default_factory=uuid4)
     created_at: datetime = field(default_factory=datetime.utcnow)
 
+@dataclass
+class CachedAnswer:
+    """A tutor answer kept for reuse by semantically similar questions in the same scope."""
+    question: str
+    answer: str
+    embedding: List[float]
+    cited_chunks: List[Dict[str, Any]] = field(default_factory=list)  # {"document_id", "chunk_index"}
+    document_versions: Dict[str, int] = field(default_factory=dict)  # document_id -> version at answer time
+    similarity: Optional[float] = None  # Set on lookup hits
+    created_at: datetime = field(default_factory=datetime.utcnow)
+
+@dataclass
+class LLMUsage:
+    """Timing and token accounting for one LLM call."""
+    model: str
+    use_case: str
+    mode: str  # "complete" or "stream"
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0  # seconds, request to last token
+    ttft: Optional[float] = None  # seconds to first token (streams)
+    tokens_per_second: float = 0.0
+    estimated: bool = False  # token counts estimated – provider reported none
+
+@dataclass
+class IntentPrediction:
+    """Routing decision for a message sent to Nova."""
+    label: str  # "tutor", "quiz" or "conversational"
+    confidence: float
+    source: str  # "rules", "centroid" or "llm"
+
 @dataclass
 class NovaState:
     """State for LangGraph agent."""
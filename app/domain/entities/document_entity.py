@@ -33,7 +33,35 @@ class DocumentChunksAndEmbeddings:
     embedding_model: str
     embedding_dim: int
     embedded_chunks: list[EmbeddedChunk]
-    
+
+
+@dataclass
+class SectionSummary:
+    """Summary of a run of consecutive chunks (chunk_start..chunk_end, inclusive)."""
+    index: int
+    chunk_start: int
+    chunk_end: int
+    summary: str
+    embedding: list[float] = field(default_factory=list)
+
+
+@dataclass
+class DocumentSummary:
+    """
+    Precomputed overview of a document: the coarse retrieval tier.
+
+    Built by map-reduce during processing – one summary per section, then a
+    whole-document summary and key-concept list reduced from those.
+    """
+    document_id: str
+    user_id: str
+    class_id: str
+    summary: str
+    key_concepts: list[str]
+    sections: list[SectionSummary]
+    embedding: list[float] = field(default_factory=list)
+    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
 
 @dataclass
 class Document:
@@ -1,6 +1,7 @@
 import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from enum import Enum
 from typing import Optional
 
 
@@ -44,3 +45,31 @@ class StudySession:
         self.update_heartbeat()
         self.end_time = datetime.now(timezone.utc)
         self.is_active = False
+
+
+class RollupScope(str, Enum):
+    TOTAL = "total"
+    CLASS = "class"
+    DOCUMENT = "document"
+    CONCEPT = "concept"
+
+
+@dataclass
+class StudyRollup:
+    """
+    Pre-aggregated study time of one student for one scope.
+
+    scope_key is the class / document id, or the lower-cased concept name;
+    it is empty for TOTAL. label is the display name (document title,
+    concept as written). Concept time is the time spent on the documents
+    covering the concept, split evenly across each document's concepts.
+    """
+    user_id: uuid.UUID
+    scope: RollupScope
+    scope_key: str = ""
+    class_id: Optional[uuid.UUID] = None
+    label: Optional[str] = None
+    total_seconds: int = 0
+    session_count: int = 0
+    last_studied_at: Optional[datetime] = None
+    id: uuid.UUID = field(default_factory=uuid.uuid4)
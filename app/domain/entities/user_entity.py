@@ -159,3 +159,23 @@ class User:
             google_sub=google_sub,
             avatar_url=avatar_url,
         )
+
+
+@dataclass
+class UserProfile:
+    """Public display info of a user, as cached for the chat handshake."""
+    user_id: uuid.UUID
+    username: str
+    first_name: str = ""
+    last_name: str = ""
+    avatar_url: Optional[str] = None
+
+    @staticmethod
+    def from_user(user: User) -> "UserProfile":
+        return UserProfile(
+            user_id=user.id,
+            username=user.username or "",
+            first_name=user.first_name,
+            last_name=user.last_name,
+            avatar_url=user.avatar_url,
+        )
@@ -1,36 +1,131 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import Depends
+
+from app.adapters.repositories import SQLQuizBankRepository
+from app.application.interfaces import (IDocumentInterface, IQuizBankInterface,
+                                        IStudyRollupInterface)
 from app.application.use_cases.ai_use_cases import GenerateQuizUseCase, AnalyzeStudentPerformanceUseCase
 from app.application.interfaces.llm_interface import ILLMInterface
 from app.application.use_cases.document_usecases import SearchDocumentsUseCase
-from app.infrastructure.api.dependencies.tutor_dep import get_llm_service, get_tutor_usecase
-from app.infrastructure.api.dependencies.document_dep import get_search_documents_usecase
+from app.infrastructure.api.dependencies.tutor_dep import (get_context_assembler,
+                                                           get_intent_classifier, get_llm_service,
+                                                           get_tutor_usecase)
+from app.infrastructure.api.dependencies.document_dep import (get_answer_cache,
+                                                              get_document_embedder,
+                                                              get_document_repository,
+                                                              get_search_documents_usecase,
+                                                              get_vector_store)
+from app.infrastructure.api.dependencies.study_dep import get_study_rollup_repository
+from app.infrastructure.api.dependencies.chat_dep import get_class_membership_usecase
+from app.infrastructure.api.dependencies.core_dep import get_chat_membership_cache
 from app.application.use_cases.nova_agent_usecase import NovaAgentUseCase
+from app.adapters.agents.context_assembler import ContextAssembler
 from app.adapters.agents.prompt_service import PromptService
-from app.application.use_cases.tutor_usecases import TutorUseCase
+from app.adapters.services import RedisCheckpointSaver
+from app.core.config import Settings, get_settings
+from app.infrastructure.db import async_session_factory
+
+_prompt_service_instance: PromptService | None = None
+_nova_checkpointer_instance: RedisCheckpointSaver | None = None
+_nova_agent_instance: NovaAgentUseCase | None = None
+_nova_agent_lock = asyncio.Lock()
+
+
+async def get_prompt_service(
+    settings: Settings = Depends(get_settings),
+) -> PromptService:
+    """Singleton prompt service; templates are preloaded, and re-read on change in DEBUG."""
+    global _prompt_service_instance
+
+    if _prompt_service_instance is None:
+        _prompt_service_instance = PromptService(check_mtime=settings.DEBUG)
+        _prompt_service_instance.preload()
+
+    return _prompt_service_instance
+
+@asynccontextmanager
+async def _quiz_bank_repository_scope() -> AsyncIterator[IQuizBankInterface]:
+    """Quiz bank repository with its own short-lived session (also used by the Nova singleton)."""
+    async with async_session_factory() as session:
+        yield SQLQuizBankRepository(session)
 
-async def get_prompt_service() -> PromptService:
-    return PromptService()
 
 async def get_generate_quiz_usecase(
     llm: ILLMInterface = Depends(get_llm_service),
-    search_use_case: SearchDocumentsUseCase = Depends(get_search_documents_usecase)
+    search_use_case: SearchDocumentsUseCase = Depends(get_search_documents_usecase),
+    context_assembler: ContextAssembler = Depends(get_context_assembler),
 ) -> GenerateQuizUseCase:
-    return GenerateQuizUseCase(llm, search_use_case)
+    return GenerateQuizUseCase(llm, search_use_case, context_assembler, _quiz_bank_repository_scope)
 
 async def get_analyze_performance_usecase(
-    llm: ILLMInterface = Depends(get_llm_service)
+    llm: ILLMInterface = Depends(get_llm_service),
+    rollup_repo: IStudyRollupInterface = Depends(get_study_rollup_repository),
+    document_repo: IDocumentInterface = Depends(get_document_repository),
 ) -> AnalyzeStudentPerformanceUseCase:
-    return AnalyzeStudentPerformanceUseCase(llm)
+    return AnalyzeStudentPerformanceUseCase(llm, rollup_repo, document_repo)
+
+async def get_nova_checkpointer(
+    settings: Settings = Depends(get_settings),
+) -> RedisCheckpointSaver:
+    """Singleton Redis checkpointer holding Nova's per-conversation memory."""
+    global _nova_checkpointer_instance
+
+    if _nova_checkpointer_instance is None:
+        _nova_checkpointer_instance = RedisCheckpointSaver(
+            settings.REDIS_URL, ttl=settings.NOVA_MEMORY_TTL
+        )
+        await _nova_checkpointer_instance.connect()
+
+    return _nova_checkpointer_instance
+
 
 async def get_nova_agent(
-    llm: ILLMInterface = Depends(get_llm_service),
-    tutor_use_case: TutorUseCase = Depends(get_tutor_usecase),
-    quiz_use_case: GenerateQuizUseCase = Depends(get_generate_quiz_usecase),
-    prompt_service: PromptService = Depends(get_prompt_service)
+    settings: Settings = Depends(get_settings),
 ) -> NovaAgentUseCase:
+    """
+    Singleton Nova agent, built on first use.
+
+    The LangGraph is compiled once per process and every dependency it holds
+    is itself a singleton; per-request data (user, class, conversation)
+    travels only through the graph state.
+    """
+    global _nova_agent_instance
+
+    if _nova_agent_instance is None:
+        async with _nova_agent_lock:
+            if _nova_agent_instance is None:
+                _nova_agent_instance = await _build_nova_agent(settings)
+
+    return _nova_agent_instance
+
+
+async def _build_nova_agent(settings: Settings) -> NovaAgentUseCase:
+    llm = get_llm_service(settings)
+    search_use_case = get_search_documents_usecase(
+        vector_store=await get_vector_store(settings),
+        embedder=await get_document_embedder(settings),
+        settings=settings,
+    )
+    context_assembler = get_context_assembler()
+
     return NovaAgentUseCase(
-        llm=llm, 
-        tutor_use_case=tutor_use_case, 
-        quiz_use_case=quiz_use_case,
-        prompt_service=prompt_service
+        llm=llm,
+        tutor_use_case=get_tutor_usecase(
+            llm=llm,
+            search_use_case=search_use_case,
+            answer_cache=await get_answer_cache(settings),
+            context_assembler=context_assembler,
+            membership=await get_class_membership_usecase(await get_chat_membership_cache()),
+            settings=settings,
+        ),
+        quiz_use_case=GenerateQuizUseCase(
+            llm, search_use_case, context_assembler, _quiz_bank_repository_scope
+        ),
+        prompt_service=await get_prompt_service(settings),
+        intent_classifier=await get_intent_classifier(settings),
+        checkpointer=await get_nova_checkpointer(settings),
+        memory_window=settings.NOVA_MEMORY_WINDOW
     )
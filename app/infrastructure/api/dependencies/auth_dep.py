@@ -7,7 +7,7 @@ from fastapi.security import (HTTPAuthorizationCredentials, HTTPBearer,
 from jose import JWTError, jwt
 
 from app.application.interfaces import (IEmailService, IJwtService,
-                                        IUserInterface)
+                                        IUserInterface, IUserProfileCache)
 from app.application.use_cases import (ConfirmEmailUseCase,
                                        ForgotPasswordUseCase,
                                        GoogleAuthUseCase, LoginUseCase,
@@ -18,7 +18,8 @@ from app.core.config import Settings, get_settings, settings
 from app.domain.entities import User
 from app.domain.exceptions import AccountInactiveError, AuthenticationError
 
-from .core_dep import get_email_service, get_jwt_service, get_user_repository
+from .core_dep import (get_email_service, get_jwt_service,
+                       get_user_profile_cache, get_user_repository)
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_PREFIX}/auth/login"
@@ -116,28 +117,32 @@ def get_register_usecase(
 def get_login_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
     jwt_srv: IJwtService = Depends(get_jwt_service),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> LoginUseCase:
-    return LoginUseCase(user_repo, jwt_srv)
+    return LoginUseCase(user_repo, jwt_srv, profile_cache)
 
 
 def get_google_auth_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
     jwt_srv: IJwtService = Depends(get_jwt_service),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> GoogleAuthUseCase:
     if not settings.GOOGLE_CLIENT_ID:
         raise ValueError(
             "Google Client ID must be set in settings for GoogleAuthUseCase"
         )
     return GoogleAuthUseCase(
-        user_repo, jwt_srv, google_client_id=settings.GOOGLE_CLIENT_ID
+        user_repo, jwt_srv, google_client_id=settings.GOOGLE_CLIENT_ID,
+        profile_cache=profile_cache,
     )
 
 
 def get_refresh_token_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
     jwt_srv: IJwtService = Depends(get_jwt_service),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> RefreshTokenUseCase:
-    return RefreshTokenUseCase(user_repo, jwt_srv)
+    return RefreshTokenUseCase(user_repo, jwt_srv, profile_cache)
 
 
 def get_forgot_password_usecase(
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator
 from uuid import UUID
 
 from fastapi import Depends, HTTPException, status
@@ -9,14 +10,17 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.adapters.repositories import (SQLChatGroupRepository,
                                        SQLChatMessageRepository)
 from app.adapters.services import (PushNotification, RedisCacheService,
-                                   RedisPresence, RedisPubSub)
+                                   RedisPresence, RedisPubSub,
+                                   RedisStreamPubSub)
 from app.application.interfaces import (IChatCacheInterface,
                                         IChatGroupInterface,
+                                        IChatMembershipCache,
                                         IChatMessageInterface,
                                         IChatNotificationInterface,
                                         IChatPresenceService, IChatPubSub)
 from app.application.use_cases import (AddClassMemberUseCase,
                                        ChangeClassMemberRoleUseCase,
+                                       CheckClassMembershipUseCase,
                                        CreateClassUseCase,
                                        DeleteChatMessageUseCase,
                                        DeleteClassUseCase,
@@ -25,17 +29,19 @@ from app.application.use_cases import (AddClassMemberUseCase,
                                        GetJoinRequestsUseCase,
                                        GetUserClassesUseCase,
                                        HandleJoinRequestUseCase,
-                                       JoinClassUseCase,
+                                       JoinClassUseCase, NovaReplyUseCase,
                                        RemoveClassMemberUseCase,
                                        SearchchatMessagesUseCase,
                                        SearchClassesUseCase,
                                        SendChatMessageUseCase,
                                        UpdateClassUseCase)
 from app.core.config import Settings, get_settings
-from app.domain.entities import User
-from app.infrastructure.db import get_db_session
+from app.domain.entities import ChatGroup, ChatMessage, User
+from app.infrastructure.db import async_session_factory, get_db_session
+from app.infrastructure.tasks.background_worker import BackgroundWorker
 
 from .auth_dep import get_current_user
+from .core_dep import get_chat_membership_cache
 
 if TYPE_CHECKING:
     from app.infrastructure.ws.connection_manager import ConnectionManager
@@ -44,6 +50,7 @@ _pubsub_instance: RedisPubSub | None = None
 _presence_instance: RedisPresence | None = None
 _cache_instance: RedisCacheService | None = None
 _connection_manager: ConnectionManager | None = None
+_nova_worker_instance: BackgroundWorker | None = None
 
 
 async def get_chat_pubsub_service(
@@ -52,7 +59,15 @@ async def get_chat_pubsub_service(
     global _pubsub_instance
 
     if _pubsub_instance is None:
-        _pubsub_instance = RedisPubSub(settings.REDIS_URL)
+        if settings.WS_TRANSPORT == "streams":
+            _pubsub_instance = RedisStreamPubSub(
+                settings.REDIS_URL,
+                maxlen=settings.WS_STREAM_MAXLEN,
+                ttl=settings.WS_STREAM_TTL_SECONDS,
+                replay_limit=settings.WS_REPLAY_LIMIT,
+            )
+        else:
+            _pubsub_instance = RedisPubSub(settings.REDIS_URL)
         await _pubsub_instance.connect()
 
     return _pubsub_instance
@@ -65,7 +80,7 @@ async def get_chat_presence_service(
     global _presence_instance
 
     if _presence_instance is None:
-        _presence_instance = RedisPresence(settings.REDIS_URL)
+        _presence_instance = RedisPresence(settings.REDIS_URL, presence_ttl=settings.WS_PRESENCE_TTL)
         await _presence_instance.connect()
 
     return _presence_instance
@@ -84,15 +99,24 @@ async def get_chat_cache_service(
     return _cache_instance
 
 
-async def get_connection_manager() -> ConnectionManager:
+async def get_connection_manager(
+    settings: Settings = Depends(get_settings),
+) -> ConnectionManager:
     from app.infrastructure.ws.connection_manager import \
         ConnectionManager as CM
 
     global _connection_manager
 
     if _connection_manager is None:
-        pubsub = await get_chat_pubsub_service()
-        _connection_manager = CM(pubsub)
+        pubsub = await get_chat_pubsub_service(settings)
+        _connection_manager = CM(
+            pubsub,
+            send_queue_size=settings.WS_SEND_QUEUE_SIZE,
+            send_timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+            typing_timeout=settings.WS_TYPING_TIMEOUT_SECONDS,
+            typing_refresh_interval=settings.WS_TYPING_REFRESH_SECONDS,
+            typing_roster_interval=settings.WS_TYPING_ROSTER_SECONDS,
+        )
 
     return _connection_manager
 
@@ -113,6 +137,23 @@ async def get_chat_group_repository(
 
 
 
+@asynccontextmanager
+async def _chat_group_repository_scope() -> AsyncIterator[IChatGroupInterface]:
+    """Group repository with its own short-lived session, for singletons and hot paths."""
+    async with async_session_factory() as session:
+        yield SQLChatGroupRepository(session)
+
+
+async def get_class_membership_usecase(
+    membership_cache: IChatMembershipCache = Depends(get_chat_membership_cache),
+) -> CheckClassMembershipUseCase:
+    """Membership check that only opens a DB session on a cache miss."""
+    return CheckClassMembershipUseCase(
+        membership_cache=membership_cache,
+        group_repo_factory=_chat_group_repository_scope,
+    )
+
+
 async def get_chat_notification_service(
     settings: Settings = Depends(get_settings),
 ) -> IChatNotificationInterface:
@@ -122,50 +163,60 @@ async def get_chat_notification_service(
 
 
 
+async def _reply_with_nova(message: ChatMessage, group: ChatGroup) -> None:
+    """Background job: stream a NovaAI reply into the group, with its own DB session."""
+    # Deferred import to avoid circular: chat_dep <- document_dep <- ai_dep -> chat_dep
+    from app.infrastructure.api.dependencies.ai_dep import get_nova_agent
+
+    settings = get_settings()
+    async with async_session_factory() as session:
+        use_case = NovaReplyUseCase(
+            message_repo=SQLChatMessageRepository(session),
+            pubsub=await get_chat_pubsub_service(settings),
+            cache=await get_chat_cache_service(settings),
+            nova_agent=await get_nova_agent(settings),
+            flush_interval=settings.NOVA_DELTA_FLUSH_SECONDS,
+        )
+        await use_case.execute(message, group)
+        await session.commit()
+
+
+def get_nova_reply_worker(
+    settings: Settings = Depends(get_settings),
+) -> BackgroundWorker:
+    """Get the NovaAI reply worker (singleton); started in the app lifespan."""
+    global _nova_worker_instance
+
+    if _nova_worker_instance is None:
+        _nova_worker_instance = BackgroundWorker(
+            "nova_reply",
+            _reply_with_nova,
+            concurrency=settings.NOVA_WORKER_CONCURRENCY,
+            max_queue=settings.NOVA_WORKER_QUEUE_SIZE,
+            # The group is Nova's conversation thread; concurrent replies
+            # to one group would overwrite each other's checkpoint
+            key=lambda message, group: group.id,
+        )
+
+    return _nova_worker_instance
+
+
 async def get_chat_send_message_use_case(
     message_repo: IChatMessageInterface = Depends(get_chat_message_repository),
     group_repo: IChatGroupInterface = Depends(get_chat_group_repository),
     pubsub: IChatPubSub = Depends(get_chat_pubsub_service),
     cache: IChatCacheInterface = Depends(get_chat_cache_service),
     notification: IChatNotificationInterface = Depends(get_chat_notification_service),
+    nova_worker: BackgroundWorker = Depends(get_nova_reply_worker),
 ) -> SendChatMessageUseCase:
     """Get SendMessage use case with NovaAI support."""
-    # Deferred import to avoid circular: chat_dep <- document_dep <- ai_dep -> chat_dep
-    from app.core.config import get_settings
-    from app.infrastructure.api.dependencies.tutor_dep import get_llm_service, get_tutor_usecase
-    from app.adapters.services import OllamaEmbedder
-    from app.adapters.services.qdrant_vector import QdrantVector
-    from app.application.use_cases.tutor_usecases import TutorUseCase
-    from app.application.use_cases.ai_use_cases import GenerateQuizUseCase
-    from app.application.use_cases.document_usecases import SearchDocumentsUseCase
-    from app.adapters.agents.prompt_service import PromptService
-    from app.application.use_cases.nova_agent_usecase import NovaAgentUseCase
-
-    settings = get_settings()
-    llm = get_llm_service(settings)
-
-    # Build deps needed for search/tutor
-    vector_store = QdrantVector(host=settings.QDRANT_HOST, port=settings.QDRANT_PORT)
-    embedder = OllamaEmbedder()
-    search_uc = SearchDocumentsUseCase(vector_store=vector_store, embedder=embedder)
-    tutor_uc = TutorUseCase(llm=llm, search_use_case=search_uc)
-    quiz_uc = GenerateQuizUseCase(llm=llm, search_use_case=search_uc)
-    prompt_svc = PromptService()
-
-    nova_agent = NovaAgentUseCase(
-        llm=llm,
-        tutor_use_case=tutor_uc,
-        quiz_use_case=quiz_uc,
-        prompt_service=prompt_svc
-    )
-
     return SendChatMessageUseCase(
         message_repo=message_repo,
         group_repo=group_repo,
         pubsub=pubsub,
         cache=cache,
         notification_service=notification,
-        nova_agent=nova_agent
+        nova_dispatcher=nova_worker.submit
     )
 
 
@@ -265,8 +316,9 @@ async def get_update_class_usecase(
 
 async def get_delete_class_usecase(
     group_repo: IChatGroupInterface = Depends(get_chat_group_repository),
+    membership_cache: IChatMembershipCache = Depends(get_chat_membership_cache),
 ) -> DeleteClassUseCase:
-    return DeleteClassUseCase(group_repo=group_repo)
+    return DeleteClassUseCase(group_repo=group_repo, membership_cache=membership_cache)
 
 
 async def get_add_class_member_usecase(
@@ -281,8 +333,9 @@ async def get_add_class_member_usecase(
 
 async def get_remove_class_member_usecase(
     group_repo: IChatGroupInterface = Depends(get_chat_group_repository),
+    membership_cache: IChatMembershipCache = Depends(get_chat_membership_cache),
 ) -> RemoveClassMemberUseCase:
-    return RemoveClassMemberUseCase(group_repo=group_repo)
+    return RemoveClassMemberUseCase(group_repo=group_repo, membership_cache=membership_cache)
 
 
 async def get_change_class_role_usecase(
@@ -2,12 +2,18 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.repositories import SQLUserRepository
-from app.adapters.services import JWTAuth, LocalStorage, SMTPEmail
-from app.application.interfaces import (IEmailService, IJwtService,
-                                        IStorageService, IUserInterface)
+from app.adapters.services import (JWTAuth, LocalStorage,
+                                   RedisChatMembershipCache,
+                                   RedisUserProfileCache, SMTPEmail)
+from app.application.interfaces import (IChatMembershipCache, IEmailService,
+                                        IJwtService, IStorageService,
+                                        IUserInterface, IUserProfileCache)
 from app.core.config import settings
 from app.infrastructure.db import get_db_session
 
+_profile_cache_instance: RedisUserProfileCache | None = None
+_membership_cache_instance: RedisChatMembershipCache | None = None
+
 
 def get_user_repository(
     session: AsyncSession = Depends(get_db_session),
@@ -46,3 +52,29 @@ async def get_storage_service() -> IStorageService:
     return LocalStorage(
         upload_dir=settings.UPLOAD_DIR, base_url=settings.BASE_URL
     )
+
+
+async def get_user_profile_cache() -> IUserProfileCache:
+    """Singleton shared cache of user display info."""
+    global _profile_cache_instance
+
+    if _profile_cache_instance is None:
+        _profile_cache_instance = RedisUserProfileCache(
+            settings.REDIS_URL, ttl=settings.USER_PROFILE_CACHE_TTL
+        )
+        await _profile_cache_instance.connect()
+
+    return _profile_cache_instance
+
+
+async def get_chat_membership_cache() -> IChatMembershipCache:
+    """Singleton shared cache of class memberships."""
+    global _membership_cache_instance
+
+    if _membership_cache_instance is None:
+        _membership_cache_instance = RedisChatMembershipCache(
+            settings.REDIS_URL, ttl=settings.CHAT_MEMBERSHIP_CACHE_TTL
+        )
+        await _membership_cache_instance.connect()
+
+    return _membership_cache_instance
@@ -1,16 +1,20 @@
+from typing import Optional
 from uuid import UUID
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.adapters.repositories import SQLDocumentRepository
-from app.adapters.services import DocumentExtractor, OllamaEmbedder
-from app.application.interfaces import (IChatGroupInterface,
+from app.adapters.services import (CachedEmbedder, DocumentExtractor,
+                                   OllamaEmbedder, RedisAnswerCache)
+from app.application.interfaces import (IAnswerCacheInterface,
+                                        IChatGroupInterface,
                                         IDocumentEmbedderInterface,
                                         IDocumentExtractorInterface,
                                         IDocumentInterface, IStorageService,
                                         IVectorStoreInterface)
 from app.application.use_cases import (DeleteDocumentUseCase,
+                                       GetDocumentSummaryUseCase,
                                        GetDocumentUseCase,
                                        ListDocumentsUseCase,
                                        SearchDocumentsUseCase,
@@ -22,6 +26,10 @@ from app.infrastructure.db import get_db_session
 from .core_dep import get_storage_service
 from .chat_dep import get_chat_group_repository
 
+_vector_store_instance: IVectorStoreInterface | None = None
+_embedder_instance: IDocumentEmbedderInterface | None = None
+_answer_cache_instance: RedisAnswerCache | None = None
+
 
 def get_document_repository(
     session: AsyncSession = Depends(get_db_session),
@@ -39,15 +47,57 @@ async def get_vector_store(
     """Singleton Qdrant client (one connection pool for all requests)."""
     from app.adapters.services.qdrant_vector import QdrantVector
 
-    return QdrantVector(
-        host=settings.QDRANT_HOST,
-        port=settings.QDRANT_PORT,
-    )
-    
+    global _vector_store_instance
+
+    if _vector_store_instance is None:
+        _vector_store_instance = QdrantVector(
+            host=settings.QDRANT_HOST,
+            port=settings.QDRANT_PORT,
+        )
+
+    return _vector_store_instance
+
 
+async def get_document_embedder(
+    settings: Settings = Depends(get_settings),
+) -> IDocumentEmbedderInterface:
+    """Singleton embedder; query embeddings are cached in-process and in Redis."""
+    global _embedder_instance
+
+    if _embedder_instance is None:
+        if settings.EMBEDDING_CACHE_ENABLED:
+            embedder = CachedEmbedder(
+                OllamaEmbedder(),
+                redis_url=settings.REDIS_URL,
+                max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+                ttl=settings.EMBEDDING_CACHE_TTL,
+            )
+            await embedder.connect()
+            _embedder_instance = embedder
+        else:
+            _embedder_instance = OllamaEmbedder()
+
+    return _embedder_instance
+
+
+async def get_answer_cache(
+    settings: Settings = Depends(get_settings),
+) -> Optional[IAnswerCacheInterface]:
+    """Singleton tutor answer cache; None when disabled."""
+    global _answer_cache_instance
+
+    if not settings.TUTOR_ANSWER_CACHE_ENABLED:
+        return None
 
-def get_document_embedder() -> IDocumentEmbedderInterface:
-    return OllamaEmbedder()
+    if _answer_cache_instance is None:
+        _answer_cache_instance = RedisAnswerCache(
+            settings.REDIS_URL,
+            max_entries=settings.TUTOR_ANSWER_CACHE_MAX_ENTRIES,
+            ttl=settings.TUTOR_ANSWER_CACHE_TTL,
+        )
+        await _answer_cache_instance.connect()
+
+    return _answer_cache_instance
 
 
 def get_upload_document_usecase(
@@ -68,6 +118,7 @@ def get_process_document_usecase(
     extractor: IDocumentExtractorInterface = Depends(get_document_extractor),
     embedder: IDocumentEmbedderInterface = Depends(get_document_embedder),
     vector_store: IVectorStoreInterface = Depends(get_vector_store),
+    answer_cache: Optional[IAnswerCacheInterface] = Depends(get_answer_cache),
 ) -> ProcessDocumentUseCase:
     return ProcessDocumentUseCase(
         document_repo=document_repo,
@@ -75,6 +126,7 @@ def get_process_document_usecase(
         extractor=extractor,
         embedder=embedder,
         vector_store=vector_store,
+        answer_cache=answer_cache,
     )
 
 
@@ -85,6 +137,16 @@ def get_get_document_usecase(
     return GetDocumentUseCase(document_repo=document_repo, group_repo=group_repo)
 
 
+def get_get_document_summary_usecase(
+    document_repo: IDocumentInterface = Depends(get_document_repository),
+    vector_store: IVectorStoreInterface = Depends(get_vector_store),
+    group_repo: IChatGroupInterface = Depends(get_chat_group_repository),
+) -> GetDocumentSummaryUseCase:
+    return GetDocumentSummaryUseCase(
+        document_repo=document_repo, vector_store=vector_store, group_repo=group_repo
+    )
+
+
 def get_list_documents_usecase(
     document_repo: IDocumentInterface = Depends(get_document_repository),
     group_repo: IChatGroupInterface = Depends(get_chat_group_repository),
@@ -97,19 +159,28 @@ def get_delete_document_usecase(
     storage: IStorageService = Depends(get_storage_service),
     vector_store: IVectorStoreInterface = Depends(get_vector_store),
     group_repo: IChatGroupInterface = Depends(get_chat_group_repository),
+    answer_cache: Optional[IAnswerCacheInterface] = Depends(get_answer_cache),
 ) -> DeleteDocumentUseCase:
     return DeleteDocumentUseCase(
         document_repo=document_repo,
         storage=storage,
         vector_store=vector_store,
-        group_repo=group_repo
+        group_repo=group_repo,
+        answer_cache=answer_cache,
     )
 
 
 def get_search_documents_usecase(
     vector_store: IVectorStoreInterface = Depends(get_vector_store),
     embedder: IDocumentEmbedderInterface = Depends(get_document_embedder),
+    settings: Settings = Depends(get_settings),
 ) -> SearchDocumentsUseCase:
-    return SearchDocumentsUseCase(vector_store=vector_store, embedder=embedder)
+    return SearchDocumentsUseCase(
+        vector_store=vector_store,
+        embedder=embedder,
+        coarse_top_documents=(
+            settings.SEARCH_COARSE_TOP_DOCUMENTS if settings.SEARCH_TWO_STAGE_ENABLED else None
+        ),
+    )
 
 
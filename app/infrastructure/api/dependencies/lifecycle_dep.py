@@ -1,7 +1,10 @@
+from app.adapters.services import CachedEmbedder
 from app.core.config import get_settings
 
+from .ai_dep import get_prompt_service
 from .chat_dep import (get_chat_cache_service, get_chat_presence_service,
-                       get_chat_pubsub_service)
+                       get_chat_pubsub_service, get_nova_reply_worker)
+from .tutor_dep import get_llm_gateway
 
 
 async def startup_event() -> None:
@@ -10,12 +13,19 @@ async def startup_event() -> None:
     await get_chat_pubsub_service(s)
     await get_chat_presence_service(s)
     await get_chat_cache_service(s)
+    await get_llm_gateway(s).start()
+    get_nova_reply_worker(s).start()
+    await get_prompt_service(s)
 
     print("✅ Chat services initialized")
 
 
 async def shutdown_event() -> None:
-    from . import chat_dep
+    from . import ai_dep, chat_dep, core_dep, document_dep, tutor_dep
+
+    # Finish in-flight NovaAI replies while pub/sub and the LLM are still up
+    if chat_dep._nova_worker_instance:
+        await chat_dep._nova_worker_instance.stop()
 
     if chat_dep._pubsub_instance:
         await chat_dep._pubsub_instance.disconnect()
@@ -26,6 +36,24 @@ async def shutdown_event() -> None:
     if chat_dep._cache_instance:
         await chat_dep._cache_instance.disconnect()
 
+    if core_dep._profile_cache_instance:
+        await core_dep._profile_cache_instance.disconnect()
+
+    if core_dep._membership_cache_instance:
+        await core_dep._membership_cache_instance.disconnect()
+
+    if isinstance(document_dep._embedder_instance, CachedEmbedder):
+        await document_dep._embedder_instance.disconnect()
+
+    if document_dep._answer_cache_instance:
+        await document_dep._answer_cache_instance.disconnect()
+
+    if ai_dep._nova_checkpointer_instance:
+        await ai_dep._nova_checkpointer_instance.disconnect()
+
+    if tutor_dep._llm_gateway_instance:
+        await tutor_dep._llm_gateway_instance.close()
+
     if chat_dep._connection_manager:
         await chat_dep._connection_manager.shutdown()
 
@@ -1,8 +1,10 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.adapters.repositories import SQLStudySessionRepository
-from app.application.interfaces import IStudySessionInterface
+from app.adapters.repositories import (SQLStudyRollupRepository,
+                                       SQLStudySessionRepository)
+from app.application.interfaces import (IStudyRollupInterface,
+                                        IStudySessionInterface)
 from app.application.use_cases.study_usecases import (
     StartStudySessionUseCase, UpdateStudySessionHeartbeatUseCase,
     EndStudySessionUseCase, GetStudyStatsUseCase
@@ -16,6 +18,12 @@ def get_study_session_repository(
     return SQLStudySessionRepository(session)
 
 
+def get_study_rollup_repository(
+    session: AsyncSession = Depends(get_db_session),
+) -> IStudyRollupInterface:
+    return SQLStudyRollupRepository(session)
+
+
 def get_start_study_session_usecase(
     study_repo: IStudySessionInterface = Depends(get_study_session_repository),
 ) -> StartStudySessionUseCase:
@@ -36,5 +44,6 @@ def get_end_study_session_usecase(
 
 def get_study_stats_usecase(
     study_repo: IStudySessionInterface = Depends(get_study_session_repository),
+    rollup_repo: IStudyRollupInterface = Depends(get_study_rollup_repository),
 ) -> GetStudyStatsUseCase:
-    return GetStudyStatsUseCase(study_repo=study_repo)
+    return GetStudyStatsUseCase(study_repo=study_repo, rollup_repo=rollup_repo)
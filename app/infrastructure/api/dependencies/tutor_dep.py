@@ -1,22 +1,96 @@
-from fastapi import Depends
+from typing import Optional
 
-from app.adapters.services.llm_service import OllamaLLM, OpenAILLM
+from fastapi import Depends, HTTPException, status
+
+from app.adapters.agents.context_assembler import ContextAssembler
+from app.adapters.agents.intent_classifier import IntentClassifier
+from app.adapters.services.llm_gateway import LLMGateway
+from app.application.interfaces import IAnswerCacheInterface, IChatGroupInterface
 from app.application.interfaces.llm_interface import ILLMInterface
-from app.application.use_cases.tutor_usecases import TutorUseCase
+from app.application.use_cases.chat_usecases import CheckClassMembershipUseCase
+from app.application.use_cases.tutor_usecases import (SetAnswerCacheThresholdUseCase,
+                                                      TutorUseCase)
 from app.application.use_cases.document_usecases import SearchDocumentsUseCase
 from app.core.config import Settings, get_settings
-from app.infrastructure.api.dependencies.document_dep import get_search_documents_usecase
+from app.infrastructure.api.dependencies.chat_dep import (get_chat_group_repository,
+                                                          get_class_membership_usecase)
+from app.infrastructure.api.dependencies.document_dep import (get_answer_cache,
+                                                              get_document_embedder,
+                                                              get_search_documents_usecase)
+
+_llm_gateway_instance: LLMGateway | None = None
+_context_assembler_instance: ContextAssembler | None = None
+_intent_classifier_instance: IntentClassifier | None = None
+
+
+def get_llm_gateway(settings: Settings = Depends(get_settings)) -> LLMGateway:
+    """Singleton LLM gateway; its pooled clients are opened in the app lifespan."""
+    global _llm_gateway_instance
+
+    if _llm_gateway_instance is None:
+        _llm_gateway_instance = LLMGateway(settings)
+
+    return _llm_gateway_instance
 
 
 def get_llm_service(settings: Settings = Depends(get_settings)) -> ILLMInterface:
-    if settings.OPENAI_API_KEY:
-        return OpenAILLM(api_key=settings.OPENAI_API_KEY, model=settings.OPENAI_MODEL)
-    else:
-        return OllamaLLM(host=settings.OLLAMA_HOST, model=settings.OLLAMA_CHAT_MODEL)
+    return get_llm_gateway(settings).get_llm()
+
+
+def get_context_assembler() -> ContextAssembler:
+    """Singleton context assembler shared by the tutor, quiz and Nova flows."""
+    global _context_assembler_instance
+
+    if _context_assembler_instance is None:
+        _context_assembler_instance = ContextAssembler()
+
+    return _context_assembler_instance
+
+
+async def get_intent_classifier(
+    settings: Settings = Depends(get_settings),
+) -> Optional[IntentClassifier]:
+    """Singleton Nova intent classifier; None routes every message through the LLM."""
+    global _intent_classifier_instance
+
+    if not settings.NOVA_INTENT_CLASSIFIER_ENABLED:
+        return None
+
+    if _intent_classifier_instance is None:
+        _intent_classifier_instance = IntentClassifier(
+            embedder=await get_document_embedder(settings),
+            min_similarity=settings.NOVA_INTENT_MIN_SIMILARITY,
+            min_margin=settings.NOVA_INTENT_MIN_MARGIN,
+        )
+
+    return _intent_classifier_instance
 
 
 def get_tutor_usecase(
     llm: ILLMInterface = Depends(get_llm_service),
     search_use_case: SearchDocumentsUseCase = Depends(get_search_documents_usecase),
+    answer_cache: Optional[IAnswerCacheInterface] = Depends(get_answer_cache),
+    context_assembler: ContextAssembler = Depends(get_context_assembler),
+    membership: CheckClassMembershipUseCase = Depends(get_class_membership_usecase),
+    settings: Settings = Depends(get_settings),
 ) -> TutorUseCase:
-    return TutorUseCase(llm=llm, search_use_case=search_use_case)
+    return TutorUseCase(
+        llm=llm,
+        search_use_case=search_use_case,
+        answer_cache=answer_cache,
+        similarity_threshold=settings.TUTOR_ANSWER_CACHE_THRESHOLD,
+        context_assembler=context_assembler,
+        membership=membership,
+    )
+
+
+async def get_set_answer_cache_threshold_usecase(
+    group_repo: IChatGroupInterface = Depends(get_chat_group_repository),
+    answer_cache: Optional[IAnswerCacheInterface] = Depends(get_answer_cache),
+) -> SetAnswerCacheThresholdUseCase:
+    if answer_cache is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The tutor answer cache is disabled",
+        )
+    return SetAnswerCacheThresholdUseCase(group_repo=group_repo, answer_cache=answer_cache)
@@ -1,7 +1,7 @@
 from fastapi import Depends
 
 from app.application.interfaces import (IJwtService, IStorageService,
-                                        IUserInterface)
+                                        IUserInterface, IUserProfileCache)
 from app.application.use_cases import (ChangePasswordUseCase,
                                        DeactivateAccountUseCase,
                                        GetCurrentUserUseCase,
@@ -10,7 +10,8 @@ from app.application.use_cases import (ChangePasswordUseCase,
                                        UpdateUsernameUseCase,
                                        UploadAvatarUseCase)
 
-from .core_dep import get_jwt_service, get_storage_service, get_user_repository
+from .core_dep import (get_jwt_service, get_storage_service,
+                       get_user_profile_cache, get_user_repository)
 
 
 def get_current_user_usecase(
@@ -21,21 +22,24 @@ def get_current_user_usecase(
 
 def get_update_profile_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> UpdateProfileUseCase:
-    return UpdateProfileUseCase(user_repo)
+    return UpdateProfileUseCase(user_repo, profile_cache)
 
 
 def get_upload_avatar_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
     storage: IStorageService = Depends(get_storage_service),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> UploadAvatarUseCase:
-    return UploadAvatarUseCase(user_repo, storage)
+    return UploadAvatarUseCase(user_repo, storage, profile_cache)
 
 
 def get_remove_avatar_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> RemoveAvatarUseCase:
-    return RemoveAvatarUseCase(user_repo)
+    return RemoveAvatarUseCase(user_repo, profile_cache)
 
 
 def get_set_password_usecase(
@@ -54,11 +58,13 @@ def get_change_password_usecase(
 
 def get_deactivate_account_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> DeactivateAccountUseCase:
-    return DeactivateAccountUseCase(user_repo)
+    return DeactivateAccountUseCase(user_repo, profile_cache)
 
 
 def get_update_username_usecase(
     user_repo: IUserInterface = Depends(get_user_repository),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
 ) -> UpdateUsernameUseCase:
-    return UpdateUsernameUseCase(user_repo)
+    return UpdateUsernameUseCase(user_repo, profile_cache)
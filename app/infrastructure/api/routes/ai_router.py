@@ -1,17 +1,19 @@
 from uuid import UUID
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
-from pydantic import BaseModel
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import BaseModel, Field
 
 from app.adapters.schemas import success_response
-from app.application.use_cases.tutor_usecases import TutorUseCase
+from app.application.use_cases.tutor_usecases import (SetAnswerCacheThresholdUseCase,
+                                                      TutorUseCase)
 from app.domain.entities import User
 from app.application.use_cases.ai_use_cases import GenerateQuizUseCase, AnalyzeStudentPerformanceUseCase
 from app.domain.entities.ai_entity import QuizType
+from app.infrastructure.api.sse import sse_response
 from app.infrastructure.api.dependencies import (
-    get_current_user, get_tutor_usecase, get_generate_quiz_usecase, get_analyze_performance_usecase
+    get_current_user, get_tutor_usecase, get_generate_quiz_usecase, get_analyze_performance_usecase,
+    get_set_answer_cache_threshold_usecase
 )
 
 router = APIRouter(prefix="/ai", tags=["AI Tutor & Assistant"])
@@ -28,15 +30,17 @@ class AskRequest(BaseModel):
 @router.post("/ask")
 async def ask_tutor(
     request: AskRequest,
+    http_request: Request,
     current_user: User = Depends(get_current_user),
     use_case: TutorUseCase = Depends(get_tutor_usecase),
 ):
     """
     Ask the AI tutor a question about specific documents or a class.
-    Supports both streaming and non-streaming responses.
+    Supports both streaming (server-sent events) and non-streaming responses.
     """
     if request.stream:
-        return StreamingResponse(
+        return sse_response(
+            http_request,
             use_case.execute_stream(
                 question=request.question,
                 user_id=current_user.id,
@@ -44,7 +48,6 @@ async def ask_tutor(
                 class_id=request.class_id,
                 top_k=request.top_k
             ),
-            media_type="text/event-stream"
         )
     
     answer = await use_case.execute(
@@ -57,6 +60,32 @@ async def ask_tutor(
     return success_response(message="AI Tutor response", data={"answer": answer})
 
 
+class AnswerCacheSettingsRequest(BaseModel):
+    similarity_threshold: float = Field(..., ge=0.5, le=1.0)
+
+
+@router.put("/classes/{class_id}/answer-cache")
+async def update_answer_cache_settings(
+    class_id: UUID,
+    request: AnswerCacheSettingsRequest,
+    current_user: User = Depends(get_current_user),
+    use_case: SetAnswerCacheThresholdUseCase = Depends(get_set_answer_cache_threshold_usecase),
+):
+    """Tune how close a question must be to a previous one to reuse its answer."""
+    try:
+        threshold = await use_case.execute(
+            class_id=class_id,
+            user_id=current_user.id,
+            threshold=request.similarity_threshold,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc))
+    return success_response(
+        message="Answer cache settings updated",
+        data={"class_id": str(class_id), "similarity_threshold": threshold},
+    )
+
+
 class QuizRequest(BaseModel):
     document_id: Optional[UUID] = None
     class_id: Optional[UUID] = None
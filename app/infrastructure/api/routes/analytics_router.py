@@ -15,17 +15,15 @@ async def get_my_analytics(
 ):
     """
     Get consolidated analytics for the current user.
-    Note: In a full implementation, this might combine data from quizzes, etc.
-    For now, it returns the core study stats.
+    Served from the pre-aggregated study rollups (refreshed by Celery beat).
     """
     stats = await stats_use_case.execute(user_id=current_user.id)
 
-    # Mock some extra analytics fields to match frontend expectations if needed
-    # (Trophy icons, accuracy, etc from the implementation plan)
     analytics_data = {
-        "total_points": 0, # Placeholder
-        "total_study_seconds": stats["total_study_seconds"],
-        "total_quizzes": 0, # Placeholder
+        # Quiz attempts are not recorded yet; kept for frontend compatibility
+        "total_points": 0,
+        "total_quizzes": 0,
+        **stats,
     }
     
     return success_response(
@@ -12,6 +12,7 @@ from app.adapters.schemas import (AddMemberRequest, ChangeMemberRoleRequest,
                                   SendMessageRequest, UpdateClassRequest,
                                   success_response)
 from app.application.dtos.enum_dto import MessageType
+from app.application.interfaces import IChatPresenceService
 from app.application.use_cases import (AddClassMemberUseCase,
                                        ChangeClassMemberRoleUseCase,
                                        CreateClassUseCase,
@@ -29,6 +30,7 @@ from app.application.use_cases import (AddClassMemberUseCase,
                                        SendChatMessageInput,
                                        SendChatMessageUseCase,
                                        UpdateClassUseCase)
+from app.core.logging import get_logger
 from app.domain.entities import User
 from app.infrastructure.api.dependencies import (
     get_add_class_member_usecase, get_change_class_role_usecase,
@@ -43,19 +45,22 @@ from app.infrastructure.api.dependencies import (
     get_search_classes_usecase, get_update_class_usecase)
 
 router = APIRouter(prefix="/class", tags=["Class"])
+logger = get_logger(__name__)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _class_response(group) -> ClassResponse:
+def _class_response(group, online_users: Optional[set] = None, online_count: int = 0) -> ClassResponse:
+    online_users = online_users or set()
     members = [
         ClassMemberResponse(
             user_id=m.user_id,
             username=m.username or "",
             role=m.role.value if hasattr(m.role, "value") else m.role,
             joined_at=m.joined_at,
+            is_online=m.user_id in online_users,
         )
         for m in (group.members or [])
     ]
@@ -68,6 +73,7 @@ def _class_response(group) -> ClassResponse:
         is_private=group.is_private,
         created_by=group.created_by,
         member_count=len(members),
+        online_count=online_count or sum(m.is_online for m in members),
         members=members,
         created_at=group.created_at,
     )
@@ -153,12 +159,21 @@ async def create_class(
 async def get_my_classes(
     current_user: User = Depends(get_current_user),
     use_case: GetUserClassesUseCase = Depends(get_get_user_classes_usecase),
+    presence: IChatPresenceService = Depends(get_chat_presence_service),
 ):
     """Return all classes the current user belongs to."""
     classes = await use_case.execute(user_id=current_user.id)
+    try:
+        online_counts = await presence.get_online_counts([c.id for c in classes])
+    except Exception as e:
+        logger.warning(f"Presence unavailable: {e}")
+        online_counts = {}
     return success_response(
         message="Classes retrieved",
-        data=[_class_response(c).model_dump(mode="json") for c in classes],
+        data=[
+            _class_response(c, online_count=online_counts.get(c.id, 0)).model_dump(mode="json")
+            for c in classes
+        ],
     )
 
 
@@ -182,13 +197,19 @@ async def get_class(
     class_code: str,
     current_user: User = Depends(get_current_user),
     use_case: GetClassUseCase = Depends(get_get_class_usecase),
+    presence: IChatPresenceService = Depends(get_chat_presence_service),
 ):
     """Return a single class by code (caller must be a member)."""
     try:
         group = await use_case.execute(class_code=class_code, user_id=current_user.id)
+        try:
+            online_users = set(await presence.get_online_users(group.id))
+        except Exception as e:
+            logger.warning(f"Presence unavailable: {e}")
+            online_users = set()
         return success_response(
             message="Class retrieved",
-            data=_class_response(group).model_dump(mode="json"),
+            data=_class_response(group, online_users=online_users).model_dump(mode="json"),
         )
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
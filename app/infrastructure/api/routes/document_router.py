@@ -5,9 +5,12 @@ from celery import Task
 from fastapi import (APIRouter, Depends, File, Form, HTTPException, Query,
                      UploadFile, status)
 
-from app.adapters.schemas import (DocumentResponse, UploadDocumentResponse,
-                                  generate_pagination, success_response)
+from app.adapters.schemas import (DocumentResponse, DocumentSummaryResponse,
+                                  SectionSummaryResponse,
+                                  UploadDocumentResponse, generate_pagination,
+                                  success_response)
 from app.application.use_cases import (DeleteDocumentUseCase,
+                                       GetDocumentSummaryUseCase,
                                        GetDocumentUseCase,
                                        ListDocumentsUseCase,
                                        SearchDocumentsUseCase,
@@ -17,6 +20,7 @@ from app.domain.entities import User
 from app.infrastructure.api.dependencies import (get_class_id_by_code,
                                                  get_current_user,
                                                  get_delete_document_usecase,
+                                                 get_get_document_summary_usecase,
                                                  get_get_document_usecase,
                                                  get_list_documents_usecase,
                                                  get_search_documents_usecase,
@@ -141,6 +145,45 @@ async def get_document(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
 
 
+@router.get("/{document_id}/summary")
+async def get_document_summary(
+    class_code: str,
+    document_id: UUID,
+    current_user: User = Depends(get_current_user),
+    class_id: UUID = Depends(get_class_id_by_code),
+    use_case: GetDocumentSummaryUseCase = Depends(get_get_document_summary_usecase),
+):
+    """Retrieve the summary, key concepts and section summaries built during processing."""
+    try:
+        document, summary = await use_case.execute(
+            document_id=document_id, user_id=current_user.id
+        )
+        if document.class_id != class_id:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document not found in this class")
+        if summary is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Document summary is not available yet")
+
+        return success_response(
+            message="Document summary retrieved",
+            data=DocumentSummaryResponse(
+                document_id=document.id,
+                summary=summary.summary,
+                key_concepts=summary.key_concepts,
+                sections=[
+                    SectionSummaryResponse(
+                        index=section.index,
+                        chunk_start=section.chunk_start,
+                        chunk_end=section.chunk_end,
+                        summary=section.summary,
+                    )
+                    for section in summary.sections
+                ],
+            ).model_dump(mode="json"),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc))
+
+
 @router.delete("/{document_id}", status_code=status.HTTP_200_OK)
 async def delete_document(
     class_code: str,
@@ -174,6 +217,9 @@ async def search_documents(
     class_code: str,
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(5, ge=1, le=20, description="Top K results"),
+    document_id: Optional[UUID] = Query(None, description="Restrict to one document"),
+    diversify: bool = Query(False, description="Re-rank results with MMR for diversity"),
+    two_stage: Optional[bool] = Query(None, description="Rank documents first, then search their chunks (default: server setting)"),
     current_user: User = Depends(get_current_user),
     class_id: UUID = Depends(get_class_id_by_code),
     use_case: SearchDocumentsUseCase = Depends(get_search_documents_usecase),
@@ -186,7 +232,10 @@ async def search_documents(
             query=q,
             user_id=current_user.id,
             class_id=class_id,
+            document_id=document_id,
             top_k=limit,
+            diversify=diversify,
+            two_stage=two_stage,
         )
         return success_response(
             message="Search results retrieved",
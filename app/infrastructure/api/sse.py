@@ -0,0 +1,148 @@
+import asyncio
+import json
+import time
+from typing import Any, AsyncGenerator, AsyncIterator, List, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from app.adapters.services.llm_instrumentation import llm_usage_collector
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.domain.entities.ai_entity import LLMUsage
+
+logger = get_logger(__name__)
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",  # stop nginx from buffering the stream
+}
+
+_END = object()
+
+
+def sse_event(data: Any, event: Optional[str] = None) -> str:
+    """Frame one SSE event; dicts are sent as JSON."""
+    payload = data if isinstance(data, str) else json.dumps(data, default=str)
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in payload.splitlines() or [""]]
+    return "\n".join(lines) + "\n\n"
+
+
+def sse_response(
+    request: Request,
+    source: AsyncGenerator[str, None],
+    heartbeat_interval: Optional[float] = None,
+) -> StreamingResponse:
+    """Stream *source* tokens to the client as server-sent events."""
+    return StreamingResponse(
+        stream_sse(request, source, heartbeat_interval or settings.SSE_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
+
+
+async def stream_sse(
+    request: Request,
+    source: AsyncGenerator[str, None],
+    heartbeat_interval: float,
+) -> AsyncIterator[str]:
+    """
+    Turn a token generator into an SSE event stream.
+
+    PROTOCOL:
+    - data: {"token": "..."}                     one per token
+    - : ping                                     comment, every heartbeat_interval of silence
+    - event: error / data: {"error": "..."}      if the source fails
+    - event: done  / data: {"usage", "timing"}   terminal event
+    - data: [DONE]                               end of stream
+
+    The source runs in its own task feeding a queue, so heartbeats keep
+    flowing while the model is thinking. If the client disconnects the task
+    is cancelled, which closes the upstream LLM stream.
+    """
+    started = time.perf_counter()
+    first_token_at: Optional[float] = None
+    queue: asyncio.Queue = asyncio.Queue()
+
+    usages: List[LLMUsage] = []
+    producer = asyncio.create_task(_produce(source, queue, usages))
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=heartbeat_interval)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    metrics.inc("sse_streams_total", outcome="disconnected")
+                    return
+                yield ": ping\n\n"
+                continue
+
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                logger.error(f"SSE source failed: {item}")
+                metrics.inc("sse_streams_total", outcome="error")
+                yield sse_event({"error": "The answer could not be completed"}, event="error")
+                yield sse_event("[DONE]")
+                return
+
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+            yield sse_event({"token": item})
+
+        metrics.inc("sse_streams_total", outcome="completed")
+        yield sse_event(
+            {
+                "usage": _summarize(usages),
+                "timing": {
+                    "ttft": round(first_token_at - started, 3) if first_token_at else None,
+                    "total": round(time.perf_counter() - started, 3),
+                },
+            },
+            event="done",
+        )
+        yield sse_event("[DONE]")
+    finally:
+        # Client went away (or we are done): stop generating upstream
+        if not producer.done():
+            producer.cancel()
+            metrics.inc("sse_upstream_cancelled_total")
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+async def _produce(
+    source: AsyncGenerator[str, None],
+    queue: asyncio.Queue,
+    usages: List[LLMUsage],
+) -> None:
+    # The task has its own context, so the collector needs no reset
+    llm_usage_collector.set(usages)
+    try:
+        async for token in source:
+            if token:
+                queue.put_nowait(token)
+        queue.put_nowait(_END)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        queue.put_nowait(e)
+    finally:
+        await source.aclose()
+
+
+def _summarize(usages: List[LLMUsage]) -> dict:
+    """Aggregate usage of the LLM calls made for this stream."""
+    if not usages:
+        # e.g. served from the answer cache
+        return {"prompt_tokens": 0, "completion_tokens": 0, "models": [], "llm_calls": 0}
+    return {
+        "prompt_tokens": sum(u.prompt_tokens for u in usages),
+        "completion_tokens": sum(u.completion_tokens for u in usages),
+        "tokens_per_second": round(usages[-1].tokens_per_second, 1),
+        "models": sorted({u.model for u in usages}),
+        "estimated": any(u.estimated for u in usages),
+        "llm_calls": len(usages),
+    }
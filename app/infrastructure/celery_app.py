@@ -15,6 +15,10 @@ celery_app.conf.beat_schedule = {
         "task": "process-pending-documents",
         "schedule": crontab(minute='*/5'),
     },
+    "refresh-study-rollups": {
+        "task": "refresh-study-rollups",
+        "schedule": crontab(minute=f'*/{settings.STUDY_ROLLUP_INTERVAL_MINUTES}'),
+    },
 }
 
 # Celery Configuration
@@ -4,5 +4,6 @@ from .models.user_model import *
 from .models.chat_model import *
 from .models.document_model import *
 from .models.study_session_model import *
+from .models.quiz_model import *
 from .session import *
 
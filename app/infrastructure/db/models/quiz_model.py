@@ -0,0 +1,27 @@
+import uuid
+from typing import Optional
+
+from sqlalchemy import JSON, ForeignKey, Integer, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.infrastructure.db.base import Base
+
+
+class QuizQuestionModel(Base):
+    """SQLAlchemy model for the per-document quiz question bank."""
+
+    __tablename__ = "quiz_questions"
+
+    document_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("documents.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    user_id: Mapped[uuid.UUID] = mapped_column(nullable=False, index=True)
+    class_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"), nullable=True, index=True
+    )
+    quiz_type: Mapped[str] = mapped_column(String(20), nullable=False, index=True)  # mcq | theory | flashcard
+    section_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    question_text: Mapped[str] = mapped_column(Text, nullable=False)
+    options: Mapped[list] = mapped_column(JSON, nullable=False, default=list)
+    correct_answer: Mapped[str] = mapped_column(Text, nullable=False)
+    explanation: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
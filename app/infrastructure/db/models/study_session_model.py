@@ -2,7 +2,8 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer
+from sqlalchemy import (Boolean, DateTime, ForeignKey, Index, Integer, String,
+                        UniqueConstraint)
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.infrastructure.db.base import Base
@@ -33,3 +34,36 @@ class StudySessionModel(Base):
     )
     duration_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     is_active: Mapped[bool] = mapped_column(Boolean, nullable=False, default=True)
+
+
+class StudyRollupModel(Base):
+    """SQLAlchemy model for pre-aggregated study time (refreshed by Celery beat)."""
+
+    __tablename__ = "study_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "scope", "scope_key", "class_id", name="uq_study_rollups_scope"),
+        Index("ix_study_rollups_user_class_scope", "user_id", "class_id", "scope"),
+    )
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    class_id: Mapped[Optional[uuid.UUID]] = mapped_column(
+        ForeignKey("groups.id", ondelete="CASCADE"), nullable=True
+    )
+    scope: Mapped[str] = mapped_column(String(20), nullable=False)  # total | class | document | concept
+    scope_key: Mapped[str] = mapped_column(String(255), nullable=False, default="")
+    label: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    total_seconds: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    session_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_studied_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True, index=True
+    )
+
+
+class StudyRollupRefreshModel(Base):
+    """SQLAlchemy model for the rollup refresh watermark (a single row)."""
+
+    __tablename__ = "study_rollup_refreshes"
+
+    refreshed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
@@ -10,9 +10,12 @@ from fastapi.responses import JSONResponse
 from app.adapters.schemas import error_response, success_response
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.core.metrics import metrics
 from app.infrastructure.api import (ai_router, analytics_router, auth_router,
                                     chat_router, document_router, personal_document_router, file_router,
                                     study_router, user_router)
+from app.infrastructure.api.dependencies.lifecycle_dep import (shutdown_event,
+                                                              startup_event)
 from app.infrastructure.ws.ws_router import router as ws_router
 from app.infrastructure.db import Base, engine
 
@@ -30,8 +33,12 @@ async def lifespan(_: FastAPI):
 
     upload_dir = Path(settings.UPLOAD_DIR)
     upload_dir.mkdir(parents=True, exist_ok=True)
+
+    # Long-lived clients (Redis, pooled LLM connections) live for the whole app
+    await startup_event()
     logger.info(f"🟢 {settings.APP_NAME} App started")
     yield
+    await shutdown_event()
     logger.info(f"🔴 {settings.APP_NAME} App stopped")
 
 
@@ -123,6 +130,10 @@ def create_app() -> FastAPI:
                 }
             )
 
+    @app.get(f"{settings.API_PREFIX}/metrics")
+    async def metrics_snapshot():
+        return success_response("Metrics snapshot", data=metrics.snapshot())
+
 
     return app
 
@@ -1 +1,4 @@
 from .document_tasks import *
+from .quiz_tasks import *
+from .study_tasks import *
+from .background_worker import *
@@ -0,0 +1,115 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import (Any, AsyncIterator, Awaitable, Callable, Dict, Hashable,
+                    List, Optional)
+
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class BackgroundWorker:
+    """
+    Bounded in-process job queue drained by a fixed pool of asyncio tasks.
+
+    For short, latency-sensitive work that should not hold up an HTTP
+    request but does not warrant a Celery round trip (e.g. NovaAI replies,
+    which stream back over the API instance's own pub/sub connection).
+
+    - submit() never blocks: it returns False when the queue is full
+    - at most `concurrency` jobs run at once
+    - a failing job is logged and does not stop its worker
+    - jobs with the same `key(*args)` run one at a time, in submission order
+      (e.g. NovaAI replies of one group, which share a conversation thread)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[..., Awaitable[Any]],
+        concurrency: int = 2,
+        max_queue: int = 100,
+        key: Optional[Callable[..., Hashable]] = None,
+    ) -> None:
+        self._name = name
+        self._handler = handler
+        self._concurrency = concurrency
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._workers: List[asyncio.Task] = []
+        self._key = key
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._holders: Dict[Hashable, int] = {}  # jobs running or waiting per key
+
+    @property
+    def started(self) -> bool:
+        return bool(self._workers)
+
+    def start(self) -> None:
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._run(), name=f"{self._name}-worker-{i}")
+            for i in range(self._concurrency)
+        ]
+        logger.info(f"Started {self._concurrency} {self._name} workers")
+
+    async def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Let queued jobs finish for up to `timeout` seconds, then cancel the rest."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{self._name}: {self._queue.qsize()} jobs dropped on shutdown")
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def submit(self, *args: Any) -> bool:
+        """Queue a call to the handler; False if the queue is full."""
+        if not self._workers:
+            self.start()
+        try:
+            self._queue.put_nowait(args)
+        except asyncio.QueueFull:
+            metrics.inc("background_jobs_total", worker=self._name, outcome="rejected")
+            return False
+        metrics.set_gauge("background_queue_depth", self._queue.qsize(), worker=self._name)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            args = await self._queue.get()
+            try:
+                async with self._serialized(args):
+                    await self._handler(*args)
+                metrics.inc("background_jobs_total", worker=self._name, outcome="completed")
+            except Exception as e:
+                metrics.inc("background_jobs_total", worker=self._name, outcome="failed")
+                logger.error(f"{self._name} job failed: {e}")
+            finally:
+                self._queue.task_done()
+                metrics.set_gauge("background_queue_depth", self._queue.qsize(), worker=self._name)
+
+    @asynccontextmanager
+    async def _serialized(self, args: tuple) -> AsyncIterator[None]:
+        """Hold the job's key lock; the lock is dropped once nobody needs it."""
+        if self._key is None:
+            yield
+            return
+
+        key = self._key(*args)
+        # Workers take jobs in queue order and acquire without awaiting
+        # first, so same-key jobs get the (FIFO) lock in submission order
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._holders[key] = self._holders.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._holders[key] -= 1
+            if not self._holders[key]:
+                del self._holders[key]
+                del self._locks[key]
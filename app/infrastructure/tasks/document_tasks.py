@@ -6,12 +6,16 @@ from sqlalchemy.ext.asyncio import (AsyncSession, async_sessionmaker,
                                     create_async_engine)
 
 from app.adapters.repositories import SQLDocumentRepository
+from app.adapters.services.answer_cache import RedisAnswerCache
 from app.adapters.services.document_extractor import DocumentExtractor
+from app.adapters.services.llm_gateway import LLMGateway
 from app.adapters.services.local_storage import LocalStorage
 from app.adapters.services.ollama_embedder import OllamaEmbedder
 from app.adapters.services.qdrant_vector import QdrantVector
-from app.application.use_cases.document_usecases import ProcessDocumentUseCase
+from app.application.use_cases.document_usecases import (
+    ProcessDocumentUseCase, SummarizeDocumentUseCase)
 from app.core.config import settings
+from app.domain.entities import Document, ProcessingStatus
 from app.core.logging import get_logger
 from app.infrastructure.celery_app import celery_app
 
@@ -30,6 +34,52 @@ async def _create_session() -> tuple:
     return engine, session
 
 
+async def _create_answer_cache() -> RedisAnswerCache | None:
+    """Connect the tutor answer cache so reprocessed documents invalidate it."""
+    if not settings.TUTOR_ANSWER_CACHE_ENABLED:
+        return None
+    answer_cache = RedisAnswerCache(
+        settings.REDIS_URL,
+        max_entries=settings.TUTOR_ANSWER_CACHE_MAX_ENTRIES,
+        ttl=settings.TUTOR_ANSWER_CACHE_TTL,
+    )
+    await answer_cache.connect()
+    return answer_cache
+
+
+async def _create_llm_gateway() -> LLMGateway | None:
+    """Start an LLM gateway for the summarization stage, if it is enabled."""
+    if not settings.DOCUMENT_SUMMARY_ENABLED:
+        return None
+    gateway = LLMGateway(settings)
+    await gateway.start()
+    return gateway
+
+
+def _create_summarizer(
+    gateway: LLMGateway | None,
+    embedder: OllamaEmbedder,
+    vector_store: QdrantVector,
+) -> SummarizeDocumentUseCase | None:
+    if gateway is None:
+        return None
+    return SummarizeDocumentUseCase(
+        llm=gateway.get_llm(),
+        embedder=embedder,
+        vector_store=vector_store,
+        section_chunks=settings.DOCUMENT_SUMMARY_SECTION_CHUNKS,
+        max_sections=settings.DOCUMENT_SUMMARY_MAX_SECTIONS,
+        max_key_concepts=settings.DOCUMENT_SUMMARY_MAX_KEY_CONCEPTS,
+        concurrency=settings.DOCUMENT_SUMMARY_CONCURRENCY,
+    )
+
+
+def _queue_quiz_bank(document: Document) -> None:
+    """Chain the quiz bank stage once a document is READY."""
+    if settings.QUIZ_BANK_ENABLED and document.processing_status == ProcessingStatus.READY:
+        celery_app.send_task("build_quiz_bank", args=[str(document.id)])
+
+
 # ===== Celery Task =========================
 
 @celery_app.task(name="process_document", bind=True, max_retries=3)
@@ -39,6 +89,8 @@ def process_document(self: Task, document_id: str) -> None:
 
 async def _process_document(document_id: str) -> None:
     engine, session = await _create_session()
+    answer_cache = await _create_answer_cache()
+    gateway = await _create_llm_gateway()
     try:
         async with session:
             repo = SQLDocumentRepository(session)
@@ -48,6 +100,14 @@ async def _process_document(document_id: str) -> None:
                 logger.error(f"Document {document_id} not found.")
                 return
 
+            embedder = OllamaEmbedder(
+                host=settings.OLLAMA_HOST,
+                model=settings.OLLAMA_EMBEDDING_MODEL,
+            )
+            vector_store = QdrantVector(
+                host=settings.QDRANT_HOST,
+                port=settings.QDRANT_PORT,
+            )
             use_case = ProcessDocumentUseCase(
                 document_repo=repo,
                 extractor=DocumentExtractor(),
@@ -55,17 +115,18 @@ async def _process_document(document_id: str) -> None:
                     base_url=settings.BASE_URL,
                     upload_dir=settings.UPLOAD_DIR,    
                 ),
-                embedder=OllamaEmbedder(
-                    host=settings.OLLAMA_HOST,
-                    model=settings.OLLAMA_EMBEDDING_MODEL,
-                ),
-                vector_store=QdrantVector(
-                    host=settings.QDRANT_HOST,
-                    port=settings.QDRANT_PORT,
-                ),
+                embedder=embedder,
+                vector_store=vector_store,
+                answer_cache=answer_cache,
+                summarizer=_create_summarizer(gateway, embedder, vector_store),
             )
             await use_case.execute(document)
+            _queue_quiz_bank(document)
     finally:
+        if answer_cache:
+            await answer_cache.disconnect()
+        if gateway:
+            await gateway.close()
         await engine.dispose()
 
 
@@ -78,6 +139,8 @@ def process_pending_documents(self: Task) -> None:
 
 async def _process_pending_documents() -> None:
     engine, session = await _create_session()
+    answer_cache = await _create_answer_cache()
+    gateway = await _create_llm_gateway()
     try:
         async with session:
             repo = SQLDocumentRepository(session)
@@ -87,6 +150,14 @@ async def _process_pending_documents() -> None:
                 logger.info("No stale documents to process.")
                 return
             
+            embedder = OllamaEmbedder(
+                host=settings.OLLAMA_HOST,
+                model=settings.OLLAMA_EMBEDDING_MODEL,
+            )
+            vector_store = QdrantVector(
+                host=settings.QDRANT_HOST,
+                port=settings.QDRANT_PORT,
+            )
             use_case = ProcessDocumentUseCase(
                 document_repo=repo,
                 extractor=DocumentExtractor(),
@@ -94,20 +165,21 @@ async def _process_pending_documents() -> None:
                     base_url=settings.BASE_URL,
                     upload_dir=settings.UPLOAD_DIR,    
                 ),
-                embedder=OllamaEmbedder(
-                    host=settings.OLLAMA_HOST,
-                    model=settings.OLLAMA_EMBEDDING_MODEL,
-                ),
-                vector_store=QdrantVector(
-                    host=settings.QDRANT_HOST,
-                    port=settings.QDRANT_PORT,
-                ),
+                embedder=embedder,
+                vector_store=vector_store,
+                answer_cache=answer_cache,
+                summarizer=_create_summarizer(gateway, embedder, vector_store),
             )
 
             for document in documents:
                 try:
                     await use_case.execute(document)
+                    _queue_quiz_bank(document)
                 except Exception as exc:
                     logger.error(f"Failed to reprocess document {document.id}: {exc}")
     finally:
+        if answer_cache:
+            await answer_cache.disconnect()
+        if gateway:
+            await gateway.close()
         await engine.dispose()
\ No newline at end of file
@@ -0,0 +1,59 @@
+import asyncio
+from uuid import UUID
+
+from celery import Task
+
+from app.adapters.repositories import SQLDocumentRepository, SQLQuizBankRepository
+from app.adapters.services.llm_gateway import LLMGateway
+from app.adapters.services.qdrant_vector import QdrantVector
+from app.application.use_cases.ai_use_cases import BuildQuizBankUseCase
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.domain.entities import ProcessingStatus
+from app.domain.entities.ai_entity import QuizType
+from app.infrastructure.celery_app import celery_app
+from app.infrastructure.tasks.document_tasks import _create_session
+
+logger = get_logger(__name__)
+
+
+# ===== Celery Task =========================
+
+@celery_app.task(name="build_quiz_bank", bind=True, max_retries=3, default_retry_delay=60)
+def build_quiz_bank(self: Task, document_id: str) -> None:
+    try:
+        asyncio.run(_build_quiz_bank(document_id))
+    except Exception as exc:
+        logger.error(f"Quiz bank for document {document_id} failed: {exc}")
+        raise self.retry(exc=exc)
+
+
+async def _build_quiz_bank(document_id: str) -> None:
+    engine, session = await _create_session()
+    gateway = LLMGateway(settings)
+    await gateway.start()
+    try:
+        async with session:
+            document = await SQLDocumentRepository(session).get_any_by_id(UUID(document_id))
+
+            if not document or document.processing_status != ProcessingStatus.READY:
+                logger.info(f"Document {document_id} is not ready; skipping quiz bank.")
+                return
+
+            use_case = BuildQuizBankUseCase(
+                llm=gateway.get_llm(),
+                vector_store=QdrantVector(
+                    host=settings.QDRANT_HOST,
+                    port=settings.QDRANT_PORT,
+                ),
+                quiz_bank=SQLQuizBankRepository(session),
+                section_chunks=settings.QUIZ_BANK_SECTION_CHUNKS,
+                max_sections=settings.QUIZ_BANK_MAX_SECTIONS,
+                questions_per_section=settings.QUIZ_BANK_QUESTIONS_PER_SECTION,
+                quiz_types=tuple(QuizType(t) for t in settings.QUIZ_BANK_TYPES),
+                concurrency=settings.QUIZ_BANK_CONCURRENCY,
+            )
+            await use_case.execute(document)
+    finally:
+        await gateway.close()
+        await engine.dispose()
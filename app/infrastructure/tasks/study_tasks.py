@@ -0,0 +1,41 @@
+import asyncio
+
+from celery import Task
+
+from app.adapters.repositories import (SQLDocumentRepository,
+                                       SQLStudyRollupRepository,
+                                       SQLStudySessionRepository)
+from app.adapters.services.qdrant_vector import QdrantVector
+from app.application.use_cases.study_usecases import RefreshStudyRollupsUseCase
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.infrastructure.celery_app import celery_app
+from app.infrastructure.tasks.document_tasks import _create_session
+
+logger = get_logger(__name__)
+
+
+# ===== Celery Task (Periodic) =========================
+
+@celery_app.task(name="refresh-study-rollups", bind=True, max_retries=3)
+def refresh_study_rollups(self: Task) -> None:
+    asyncio.run(_refresh_study_rollups())
+
+
+async def _refresh_study_rollups() -> None:
+    engine, session = await _create_session()
+    try:
+        async with session:
+            use_case = RefreshStudyRollupsUseCase(
+                study_repo=SQLStudySessionRepository(session),
+                rollup_repo=SQLStudyRollupRepository(session),
+                document_repo=SQLDocumentRepository(session),
+                vector_store=QdrantVector(
+                    host=settings.QDRANT_HOST,
+                    port=settings.QDRANT_PORT,
+                ),
+                overlap_seconds=settings.STUDY_ROLLUP_OVERLAP_SECONDS,
+            )
+            await use_case.execute()
+    finally:
+        await engine.dispose()
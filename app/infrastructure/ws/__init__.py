@@ -1,2 +1,3 @@
 from .connection_manager import *
+from .typing_roster import *
 from .ws_router import *
@@ -1,14 +1,79 @@
 import asyncio
-from typing import Dict, Set
+import json
+from collections import deque
+from typing import Deque, Dict, Optional, Set, Tuple, Union
 from uuid import UUID
 
-from fastapi import WebSocket
+from fastapi import WebSocket, status
 
 from app.application.interfaces import IChatPubSub
 from app.core.logging import get_logger
+from app.core.metrics import metrics
+from app.infrastructure.ws.typing_roster import TypingRoster
 
 logger = get_logger(__name__)
 
+# Events a lagging client can miss without losing any content (snapshots)
+DROPPABLE_EVENT_TYPES = frozenset({"typing_roster"})
+
+
+class _Outbox:
+    """
+    Bounded outbound queue of one WebSocket, drained by its writer task.
+
+    OVERFLOW POLICY:
+    - a droppable event (typing roster) replaces the oldest queued droppable
+      event, or is dropped itself when there is none
+    - any other event makes room by dropping the oldest queued droppable
+      event; when there is none the queue has overflowed
+    
+    Replayed events are queued on top of the limit.
+    """
+
+    def __init__(self, limit: int, group_id: UUID, username: str):
+        self.limit = limit
+        self.group_id = group_id
+        self.username = username
+        self.writer: Optional[asyncio.Task] = None
+        self._items: Deque[Tuple[str, bool]] = deque()  # (payload, droppable)
+        self._backlog = 0  # replayed events still at the head of the queue
+        self._ready = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put(self, payload: str, droppable: bool) -> bool:
+        """Queue a payload; False if it could not be queued without losing content."""
+        if len(self._items) - self._backlog >= self.limit:
+            oldest = next((item for item in self._items if item[1]), None)
+            if oldest is None and not droppable:
+                return False
+            metrics.inc("ws_events_dropped_total")
+            if oldest is None:
+                return True  # the new event is the one dropped
+            self._items.remove(oldest)
+
+        self._items.append((payload, droppable))
+        self._ready.set()
+        return True
+
+    async def get(self) -> str:
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        if self._backlog:
+            self._backlog -= 1
+        return self._items.popleft()[0]
+
+    def replay(self, payloads: list[str]) -> None:
+        """Queue replayed events ahead of live ones, dropping live duplicates."""
+        replayed = set(payloads)
+        live = [item for item in self._items if item[0] not in replayed]
+        self._items = deque([(payload, False) for payload in payloads] + live)
+        self._backlog = len(payloads)
+        if self._items:
+            self._ready.set()
+
 
 class ConnectionManager:
     """
@@ -46,16 +111,57 @@ class ConnectionManager:
     - O(1) lookup for connections by group
     - O(n) broadcast where n = connections in THIS instance only
     - No cross-instance communication needed (Redis handles it)
+    
+    SLOW CONSUMERS:
+    Broadcasting only enqueues: every connection has a bounded outbox
+    drained by its own writer task, so a stalled client never delays the
+    rest of the group. Typing rosters are dropped when an outbox is full;
+    a client that cannot keep up with chat messages (outbox overflow, or
+    one frame stuck past send_timeout) is evicted with close code 1013
+    and reconnects to catch up.
+    
+    TYPING:
+    Typing frames go through a TypingRoster: throttled on the way to
+    Redis, and delivered to sockets as one periodic "typing_roster" event
+    per group rather than one "typing" event per keystroke.
+    
+    RESUMING:
+    A client reconnecting with the last event_id it saw is first sent the
+    chat messages it missed, if the pub/sub transport can replay them
+    (Redis Streams), then live events. Otherwise it gets a "resync" event
+    and reloads history over REST.
     """
     
-    def __init__(self, pubsub: IChatPubSub):
+    def __init__(
+        self,
+        pubsub: IChatPubSub,
+        send_queue_size: int = 64,
+        send_timeout: float = 10.0,
+        typing_timeout: float = 5.0,
+        typing_refresh_interval: float = 3.0,
+        typing_roster_interval: float = 0.5,
+    ):
         """
         Initialize connection manager.
         
         Args:
             pubsub: Redis pub/sub service for inter-instance communication
+            send_queue_size: Outbound events buffered per connection
+            send_timeout: Seconds one frame may take before the client is evicted
+            typing_timeout: Seconds without a typing frame before typing stops
+            typing_refresh_interval: Minimum seconds between "still typing" publishes
+            typing_roster_interval: Seconds between typing roster flushes
         """
         self._pubsub = pubsub
+        self._send_queue_size = send_queue_size
+        self._send_timeout = send_timeout
+        self._typing = TypingRoster(
+            pubsub,
+            self.broadcast_to_group,
+            typing_timeout=typing_timeout,
+            refresh_interval=typing_refresh_interval,
+            roster_interval=typing_roster_interval,
+        )
         
         # Map: group_id -> Set of WebSocket connections
         self._group_connections: Dict[UUID, Set[WebSocket]] = {}
@@ -66,8 +172,21 @@ class ConnectionManager:
         # Map: group_id -> subscription_started (bool)
         # Track which groups we've subscribed to in Redis
         self._subscribed_groups: Set[UUID] = set()
+        
+        # Map: WebSocket -> outbound queue (and its writer task)
+        self._outboxes: Dict[WebSocket, _Outbox] = {}
+        
+        # Evictions still closing their socket
+        self._evictions: Set[asyncio.Task] = set()
     
-    async def connect(self, websocket: WebSocket, user_id: UUID, group_id: UUID, username: str):
+    async def connect(
+        self,
+        websocket: WebSocket,
+        user_id: UUID,
+        group_id: UUID,
+        username: str,
+        last_event_id: Optional[str] = None,
+    ):
         """
         Connect a WebSocket to a group.
         
@@ -75,7 +194,8 @@ class ConnectionManager:
         1. Accept WebSocket connection
         2. Add to group connections
         3. Subscribe to Redis channel (if not already)
-        4. Publish "user joined" event
+        4. Replay what the client missed since last_event_id (if given)
+        5. Publish "user joined" event
         """
         # Accept WebSocket
         await websocket.accept()
@@ -87,11 +207,23 @@ class ConnectionManager:
         self._group_connections[group_id].add(websocket)
         self._connection_users[websocket] = user_id
         
+        outbox = _Outbox(self._send_queue_size, group_id, username)
+        self._outboxes[websocket] = outbox
+        
+        self._typing.start()
+        
         # Subscribe to Redis channel for this group (if first connection)
         if group_id not in self._subscribed_groups:
             await self._subscribe_to_group(group_id)
             self._subscribed_groups.add(group_id)
         
+        # Live events queue up meanwhile; the writer starts after the replay
+        if last_event_id:
+            await self._replay(outbox, group_id, last_event_id)
+            if self._outboxes.get(websocket) is not outbox:
+                return  # evicted while replaying
+        outbox.writer = asyncio.create_task(self._write(websocket, outbox))
+        
         logger.info(f"User {user_id} ({username}) connected to group {group_id}")
         
         # Publish "user joined" event to all instances
@@ -107,6 +239,7 @@ class ConnectionManager:
         3. Unsubscribe from Redis if no more connections
         """
         user_id = self._connection_users.get(websocket)
+        self._stop_writer(websocket)
         
         # Remove connection
         if group_id in self._group_connections:
@@ -119,6 +252,7 @@ class ConnectionManager:
                 # Unsubscribe from Redis channel
                 await self._pubsub.unsubscribe_from_group(group_id)
                 self._subscribed_groups.discard(group_id)
+                self._typing.forget_group(group_id)
         
         if websocket in self._connection_users:
             del self._connection_users[websocket]
@@ -126,51 +260,132 @@ class ConnectionManager:
         logger.info(f"User {user_id} disconnected from group {group_id}")
         
         if user_id:
+            await self._typing.set_typing(group_id, user_id, username, False)
             await self._pubsub.publish_user_left(group_id, user_id, username)
     
-    async def broadcast_to_group(self, group_id: UUID, message: dict):
+    async def set_typing(self, group_id: UUID, user_id: UUID, username: str, is_typing: bool):
+        """Handle a typing frame from a client (throttled before it reaches Redis)."""
+        await self._typing.set_typing(group_id, user_id, username, is_typing)
+    
+    async def broadcast_to_group(self, group_id: UUID, message: Union[str, dict]):
         """
         Broadcast a message to all WebSocket connections in a group.
         
         This is called when we receive a message from Redis Pub/Sub.
         It only broadcasts to connections managed by THIS instance.
         
+        The payload is encoded at most once and the same text is sent to
+        every connection: events from Redis arrive already encoded and are
+        passed through untouched.
+        
         Args:
             group_id: ChatGroup to broadcast to
-            message: JSON-serializable message dict
+            message: Encoded JSON text, or a JSON-serializable dict
         """
         if group_id not in self._group_connections:
             return
         
-        # Get all connections for this group (on THIS instance)
-        connections = self._group_connections[group_id].copy()
+        payload = message if isinstance(message, str) else json.dumps(message)
+        event_type = self._event_type(message)
+        if event_type == "typing":
+            # Delivered in the group's next typing roster instead
+            self._typing.on_typing_event(group_id, payload)
+            return
+        droppable = event_type in DROPPABLE_EVENT_TYPES
+        
+        # Only enqueue: each connection's writer task does the sending
+        deepest = 0
+        for websocket in self._group_connections[group_id].copy():
+            outbox = self._outboxes.get(websocket)
+            if outbox is None:
+                continue
+            if not outbox.put(payload, droppable):
+                self._evict(websocket, "overflow")
+                continue
+            deepest = max(deepest, len(outbox))
+        
+        metrics.observe("ws_send_queue_depth", deepest)
+    
+    async def _replay(self, outbox: _Outbox, group_id: UUID, last_event_id: str):
+        """Put the events a reconnecting client missed at the head of its outbox."""
+        try:
+            missed = await self._pubsub.get_events_since(group_id, last_event_id)
+        except Exception as e:
+            logger.warning(f"Replay for group {group_id} failed: {e}")
+            missed = None
         
-        # Broadcast to all connections
-        # Use asyncio.gather for parallel sending
-        tasks = []
-        for websocket in connections:
-            tasks.append(self._send_to_connection(websocket, message, group_id))
+        if missed is None:
+            metrics.inc("ws_replays_total", outcome="resync")
+            outbox.replay([json.dumps({"type": "resync", "data": {"group_id": str(group_id)}})])
+            return
         
-        await asyncio.gather(*tasks, return_exceptions=True)
+        metrics.inc("ws_replays_total", outcome="replayed")
+        metrics.observe("ws_replayed_events", len(missed))
+        outbox.replay(missed)
     
-    async def _send_to_connection(
-        self,
-        websocket: WebSocket,
-        message: dict,
-        group_id: UUID,
-    ):
+    async def _write(self, websocket: WebSocket, outbox: _Outbox):
         """
-        Send a message to a single WebSocket connection.
+        Writer task of one connection: send its queued events in order.
         
         Handles disconnection gracefully.
         """
+        while True:
+            payload = await outbox.get()
+            try:
+                # asyncio.timeout, unlike wait_for, never swallows a cancel
+                async with asyncio.timeout(self._send_timeout):
+                    await websocket.send_text(payload)
+            
+            except TimeoutError:
+                self._evict(websocket, "timeout")
+                return
+            
+            except Exception as e:
+                # Connection is dead - clean it up
+                logger.warning(f"Error sending to WebSocket: {e}")
+                self._stop_writer(websocket)
+                await self.disconnect(websocket, outbox.group_id, outbox.username)
+                return
+    
+    def _stop_writer(self, websocket: WebSocket) -> Optional[_Outbox]:
+        """Forget a connection's outbox and cancel its writer (unless we are it)."""
+        outbox = self._outboxes.pop(websocket, None)
+        if outbox is not None and outbox.writer and outbox.writer is not asyncio.current_task():
+            outbox.writer.cancel()
+        return outbox
+    
+    def _evict(self, websocket: WebSocket, reason: str):
+        """Drop a client that cannot keep up; it reconnects to catch up."""
+        outbox = self._stop_writer(websocket)
+        if outbox is None:
+            return  # already being evicted
+        
+        metrics.inc("ws_evictions_total", reason=reason)
+        logger.warning(
+            f"Evicting slow WebSocket of {outbox.username} in group {outbox.group_id} ({reason})"
+        )
+        
+        task = asyncio.create_task(self._close_evicted(websocket, outbox))
+        self._evictions.add(task)
+        task.add_done_callback(self._evictions.discard)
+    
+    async def _close_evicted(self, websocket: WebSocket, outbox: _Outbox):
+        await self.disconnect(websocket, outbox.group_id, outbox.username)
         try:
-            await websocket.send_json(message)
-        
-        except Exception as e:
-            # Connection is dead - clean it up
-            logger.warning(f"Error sending to WebSocket: {e}")
-            await self.disconnect(websocket, group_id)
+            # The client may be stalled, so do not wait on it for long
+            async with asyncio.timeout(self._send_timeout):
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _event_type(message: Union[str, dict]) -> Optional[str]:
+        """Event type of a payload; publishers put "type" first, so no full decode."""
+        if isinstance(message, dict):
+            return message.get("type")
+        if not message.startswith('{"type": "'):
+            return None
+        return message[10:message.find('"', 10)]
     
     async def _subscribe_to_group(self, group_id: UUID):
         """
@@ -179,14 +394,15 @@ class ConnectionManager:
         When messages are published to Redis, they'll be received here
         and broadcast to all WebSocket connections in THIS instance.
         """
-        async def handle_redis_message(event_data: dict):
+        async def handle_redis_message(payload: str):
             """
             Callback invoked when a message is received from Redis.
             
             This is where messages from OTHER FastAPI instances arrive.
-            We then broadcast them to our local WebSocket connections.
+            We then broadcast them to our local WebSocket connections,
+            still encoded exactly as they were published.
             """
-            await self.broadcast_to_group(group_id, event_data)
+            await self.broadcast_to_group(group_id, payload)
         
         # Subscribe with our callback
         await self._pubsub.subscribe_to_group(group_id, handle_redis_message)
@@ -209,6 +425,15 @@ class ConnectionManager:
         
         Call this on application shutdown.
         """
+        await self._typing.stop()
+        
+        # Stop the writers first; pending events are not flushed
+        writers = [outbox.writer for outbox in self._outboxes.values() if outbox.writer]
+        for writer in writers:
+            writer.cancel()
+        await asyncio.gather(*writers, *self._evictions, return_exceptions=True)
+        self._outboxes.clear()
+        
         # Close all WebSocket connections
         all_connections = []
         for connections in self._group_connections.values():
@@ -239,7 +464,11 @@ from fastapi import WebSocket, status
 from jose import JWTError, jwt
 
 
-async def get_websocket_user(websocket: WebSocket, secret_key: str) -> UUID:
+async def get_websocket_user(
+    websocket: WebSocket,
+    secret_key: str,
+    algorithm: str = "HS256",
+) -> Tuple[UUID, Optional[str]]:
     """
     Authenticate WebSocket connection using JWT token.
     
@@ -249,9 +478,10 @@ async def get_websocket_user(websocket: WebSocket, secret_key: str) -> UUID:
     Args:
         websocket: WebSocket connection
         secret_key: JWT secret key
+        algorithm: JWT signing algorithm
         
     Returns:
-        User ID from token
+        User ID ("sub") and the signed username claim (None on older tokens)
         
     Raises:
         WebSocketException: If authentication fails
@@ -264,16 +494,14 @@ async def get_websocket_user(websocket: WebSocket, secret_key: str) -> UUID:
         raise ValueError("No authentication token provided")
     
     try:
-        # Decode JWT
-        payload = jwt.decode(token, secret_key, algorithms=["HS256"])
-        user_id = payload.get("user_id")
-        
-        if not user_id:
-            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-            raise ValueError("Invalid token payload")
-        
-        return UUID(user_id)
+        # Decode JWT; the user id is the subject of an access token
+        payload = jwt.decode(token, secret_key, algorithms=[algorithm])
+        if payload.get("type") != "access":
+            raise ValueError("not an access token")
+        user_id = UUID(payload["sub"])
     
-    except JWTError:
+    except (JWTError, KeyError, ValueError):
         await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-        raise ValueError("Invalid token")
\ No newline at end of file
+        raise ValueError("Invalid token")
+    
+    return user_id, payload.get("username")
@@ -0,0 +1,172 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+from app.application.interfaces import IChatPubSub
+from app.core.logging import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class _LocalTyping:
+    username: str
+    published_at: float  # last "is typing" sent to Redis
+    expires_at: float  # typing stops here without another keystroke frame
+
+
+class TypingRoster:
+    """
+    Throttles typing indicators and batches them into per-group rosters.
+
+    UPSTREAM (clients on THIS instance -> Redis):
+    - the first typing frame of a user is published at once (leading edge)
+    - later frames only extend the deadline; "still typing" is re-published
+      at most every refresh_interval so other instances keep the user
+    - no frame for typing_timeout (or an explicit stop / disconnect)
+      publishes the stop
+
+    DOWNSTREAM (Redis -> sockets on THIS instance):
+    Typing events from every instance update a roster per group. Every
+    roster_interval, each group whose roster changed gets one
+    {"type": "typing_roster"} event listing everyone typing, instead of one
+    event per keystroke per member. Entries not refreshed within
+    typing_timeout expire, so a crashed instance cannot leave users typing.
+    """
+
+    def __init__(
+        self,
+        pubsub: IChatPubSub,
+        broadcast: Callable[[UUID, dict], Awaitable[None]],
+        typing_timeout: float = 5.0,
+        refresh_interval: float = 3.0,
+        roster_interval: float = 0.5,
+    ):
+        self._pubsub = pubsub
+        self._broadcast = broadcast
+        self._typing_timeout = typing_timeout
+        self._refresh_interval = refresh_interval
+        self._roster_interval = roster_interval
+
+        # (group_id, user_id) -> typing state of users connected HERE
+        self._local: Dict[Tuple[UUID, UUID], _LocalTyping] = {}
+
+        # group_id -> user_id -> (username, expires_at), from all instances
+        self._rosters: Dict[UUID, Dict[str, Tuple[str, float]]] = {}
+        self._changed: set[UUID] = set()
+
+        self._ticker: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the periodic flush (idempotent)."""
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._ticker:
+            self._ticker.cancel()
+            await asyncio.gather(self._ticker, return_exceptions=True)
+            self._ticker = None
+        self._local.clear()
+        self._rosters.clear()
+        self._changed.clear()
+
+    async def set_typing(self, group_id: UUID, user_id: UUID, username: str, is_typing: bool) -> None:
+        """Handle a typing frame from a client connected to this instance."""
+        key = (group_id, user_id)
+        now = time.monotonic()
+        state = self._local.get(key)
+
+        if not is_typing:
+            if self._local.pop(key, None) is not None:
+                await self._publish(group_id, user_id, username, False)
+            return
+
+        if state is None:
+            self._local[key] = _LocalTyping(username, now, now + self._typing_timeout)
+            await self._publish(group_id, user_id, username, True)
+            return
+
+        state.expires_at = now + self._typing_timeout
+        if now - state.published_at >= self._refresh_interval:
+            state.published_at = now
+            await self._publish(group_id, user_id, username, True)
+        else:
+            metrics.inc("ws_typing_frames_total", outcome="coalesced")
+
+    def on_typing_event(self, group_id: UUID, payload: str) -> None:
+        """Fold a typing event received from Redis into the group's roster."""
+        try:
+            data = json.loads(payload)["data"]
+            user_id = data["user_id"]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Malformed typing event in group {group_id}: {e}")
+            return
+
+        roster = self._rosters.setdefault(group_id, {})
+        if data.get("is_typing"):
+            if user_id not in roster:
+                self._changed.add(group_id)
+            roster[user_id] = (data.get("username", ""), time.monotonic() + self._typing_timeout)
+        elif roster.pop(user_id, None) is not None:
+            self._changed.add(group_id)
+
+    def forget_group(self, group_id: UUID) -> None:
+        """Drop a group's roster once nobody on this instance is in it."""
+        self._rosters.pop(group_id, None)
+        self._changed.discard(group_id)
+
+    async def _publish(self, group_id: UUID, user_id: UUID, username: str, is_typing: bool) -> None:
+        metrics.inc("ws_typing_frames_total", outcome="published")
+        await self._pubsub.publish_typing_indicator(
+            group_id=group_id,
+            user_id=user_id,
+            username=username,
+            is_typing=is_typing,
+        )
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._roster_interval)
+            try:
+                await self._tick()
+            except Exception as e:
+                logger.error(f"Typing roster flush failed: {e}")
+
+    async def _tick(self) -> None:
+        now = time.monotonic()
+
+        # Local users who stopped sending frames
+        for key, state in list(self._local.items()):
+            if state.expires_at <= now and self._local.pop(key, None) is not None:
+                group_id, user_id = key
+                await self._publish(group_id, user_id, state.username, False)
+
+        # Remote users whose "still typing" never came
+        for group_id, roster in self._rosters.items():
+            expired = [user_id for user_id, (_, expires_at) in roster.items() if expires_at <= now]
+            for user_id in expired:
+                del roster[user_id]
+            if expired:
+                self._changed.add(group_id)
+
+        changed, self._changed = self._changed, set()
+        for group_id in changed:
+            roster = self._rosters.get(group_id, {})
+            if not roster:
+                self._rosters.pop(group_id, None)
+            await self._broadcast(group_id, {
+                "type": "typing_roster",
+                "data": {
+                    "group_id": str(group_id),
+                    "users": [
+                        {"user_id": user_id, "username": username}
+                        for user_id, (username, _) in roster.items()
+                    ],
+                },
+            })
+            metrics.inc("ws_typing_rosters_total")
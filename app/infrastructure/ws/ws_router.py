@@ -1,18 +1,18 @@
 import json
-from typing import Any
+from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
-from sqlalchemy import select
+from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
 
-from app.application.interfaces import IChatPresenceService, IChatPubSub
-from app.core.config import Settings, get_settings
+from app.application.interfaces import IChatPresenceService, IUserProfileCache
+from app.core.config import get_settings
 from app.core.logging import get_logger
-from app.domain.entities import User as UserEntity
+from app.core.metrics import metrics
+from app.application.use_cases import CheckClassMembershipUseCase
 from app.infrastructure.api.dependencies import (get_chat_presence_service,
-                                                 get_chat_pubsub_service,
-                                                 get_connection_manager)
-from app.infrastructure.db import get_db_session as db_session
+                                                 get_class_membership_usecase,
+                                                 get_connection_manager,
+                                                 get_user_profile_cache)
 from app.infrastructure.ws.connection_manager import (ConnectionManager,
                                                       get_websocket_user)
 
@@ -25,22 +25,31 @@ async def websocket_endpoint(
     group_id: UUID,
     manager: ConnectionManager = Depends(get_connection_manager),
     presence_service: IChatPresenceService = Depends(get_chat_presence_service),
-    pubsub: IChatPubSub = Depends(get_chat_pubsub_service),
+    profile_cache: IUserProfileCache = Depends(get_user_profile_cache),
+    membership: CheckClassMembershipUseCase = Depends(get_class_membership_usecase),
+    last_event_id: Optional[str] = None,
 ):
     """
     WebSocket endpoint for real-time chat.
     
     CLIENT FLOW:
     1. Connect: ws://localhost:8000/chat/groups/{group_id}?token={jwt}
+       Reconnect with &last_event_id={event_id of the last event received}
+       to first get the messages missed in between.
+       Closed with 1008 if the token is invalid or the user is not a
+       member of the class.
     2. Receive messages in real-time
     3. Send typing indicators, heartbeats
     4. Disconnect when done
     
     MESSAGE TYPES RECEIVED:
     - "message": New chat message
-    - "typing": Someone is typing
+    - "typing_roster": Everyone typing in the group (sent when it changes)
     - "user_joined": User joined the group
     - "user_left": User left the group
+    - "resync": Missed messages could not be replayed; reload history
+    
+    With the Redis Streams transport every event carries an "event_id".
     
     CLIENT CAN SEND:
     - {"type": "typing", "is_typing": true/false}
@@ -50,25 +59,37 @@ async def websocket_endpoint(
     
     # 1. Authenticate (from token in query params)
     try:
-        user_id = await get_websocket_user(websocket, settings.SECRET_KEY)
+        user_id, token_username = await get_websocket_user(
+            websocket, settings.SECRET_KEY, settings.ALGORITHM
+        )
     except Exception as e:
         logger.warning(f"WebSocket auth failed: {e}")
         return
 
-    # 2. Get username for broadcast
-    try:
-        # We need a repository to get the user
-        async with db_session() as session:
-            stmt = select(UserEntity).where(UserEntity.id == user_id)
-            result = await session.execute(stmt)
-            user = result.scalar_one_or_none()
-            username = user.username if user else "Someone"
-    except Exception as e:
-        logger.warning(f"Failed to get username: {e}")
-        username = "Someone"
+    # 2. Authorize – only members may follow a class or replay its history.
+    # Served from the shared membership cache, so a reconnect storm skips
+    # Postgres here too.
+    if not await membership.execute(group_id, user_id):
+        metrics.inc("ws_handshake_rejected_total", reason="not_member")
+        logger.warning(f"WebSocket rejected: user {user_id} is not a member of group {group_id}")
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    # 3. Get username for broadcast – never from the database, so a
+    # reconnect storm after a deploy costs Redis lookups, not Postgres queries.
+    # The cache is rewritten on every profile change, so it wins over the
+    # claim, which is only as fresh as the token.
+    profile = await profile_cache.get(user_id)
+    if profile and profile.username:
+        username, source = profile.username, "cache"
+    elif token_username:
+        username, source = token_username, "token"
+    else:
+        username, source = "Someone", "fallback"
+    metrics.inc("ws_handshake_username_total", source=source)
 
     # Connect WebSocket
-    await manager.connect(websocket, user_id, group_id, username)
+    await manager.connect(websocket, user_id, group_id, username, last_event_id)
     await presence_service.set_user_online(user_id, group_id)
 
     try:
@@ -78,11 +99,12 @@ async def websocket_endpoint(
             event = json.loads(data)
             
             if event["type"] == "typing":
-                await pubsub.publish_typing_indicator(
+                # Throttled and coalesced; not every frame reaches Redis
+                await manager.set_typing(
                     group_id=group_id,
                     user_id=user_id,
                     username=username,
-                    is_typing=event["is_typing"]
+                    is_typing=bool(event.get("is_typing")),
                 )
             
             elif event["type"] == "heartbeat":
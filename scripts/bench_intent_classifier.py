@@ -0,0 +1,115 @@
+"""
+Measure the Nova intent classifier against a labelled fixture.
+
+Reports, per stage, how many messages were settled locally, their accuracy
+and latency, and how many LLM router calls that avoids. By default only the
+keyword rules run (no network). --embed adds the centroid stage using the
+configured Ollama embedder; --llm also times the real LLM router on the
+messages the local stages left undecided, to put a number on the latency
+saved.
+
+    python -m scripts.bench_intent_classifier
+    python -m scripts.bench_intent_classifier --embed --llm
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from collections import Counter
+
+from app.adapters.agents.intent_classifier import IntentClassifier
+from app.adapters.agents.prompt_service import PromptService
+from app.core.config import settings
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "nova_intents.json")
+
+
+def _llm_label(action: str) -> str:
+    # Same mapping as NovaAgentUseCase._route_node
+    action = action.strip().lower()
+    if "quiz" in action:
+        return "quiz"
+    if "conversational" in action:
+        return "conversational"
+    return "tutor"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default=FIXTURE)
+    parser.add_argument("--embed", action="store_true", help="enable the centroid stage (needs Ollama)")
+    parser.add_argument("--llm", action="store_true", help="time the LLM router on undecided messages")
+    args = parser.parse_args()
+
+    with open(args.fixture, "r", encoding="utf-8") as f:
+        cases = json.load(f)
+
+    embedder = None
+    if args.embed:
+        from app.adapters.services import OllamaEmbedder
+        embedder = OllamaEmbedder()
+    classifier = IntentClassifier(
+        embedder=embedder,
+        min_similarity=settings.NOVA_INTENT_MIN_SIMILARITY,
+        min_margin=settings.NOVA_INTENT_MIN_MARGIN,
+    )
+
+    settled, correct, latencies = Counter(), Counter(), {"rules": [], "centroid": []}
+    undecided, mistakes = [], []
+    for case in cases:
+        start = time.perf_counter()
+        prediction = await classifier.classify(case["text"])
+        elapsed = time.perf_counter() - start
+        if prediction is None:
+            undecided.append(case)
+            continue
+        settled[prediction.source] += 1
+        latencies[prediction.source].append(elapsed * 1000)
+        if prediction.label == case["label"]:
+            correct[prediction.source] += 1
+        else:
+            mistakes.append((case["text"], case["label"], prediction.label, prediction.source))
+
+    total = len(cases)
+    print(f"fixture: {total} messages")
+    for source in ("rules", "centroid"):
+        if settled[source]:
+            print(
+                f"{source:<9} settled={settled[source]:3d} ({settled[source] / total:5.1%})  "
+                f"accuracy={correct[source] / settled[source]:6.1%}  "
+                f"p50={statistics.median(latencies[source]):.3f}ms"
+            )
+    local = sum(settled.values())
+    print(f"local     settled={local:3d} ({local / total:5.1%})  "
+          f"accuracy={sum(correct.values()) / max(local, 1):6.1%}  LLM router calls avoided={local}")
+    print(f"undecided {len(undecided):3d} -> LLM router")
+    for text, expected, got, source in mistakes:
+        print(f"  miss [{source}] {text!r}: expected {expected}, got {got}")
+
+    if args.llm and cases:
+        from app.adapters.services.llm_gateway import LLMGateway
+        gateway = LLMGateway(settings)
+        await gateway.start()
+        try:
+            llm, prompts = gateway.get_llm(), PromptService()
+            llm_latencies, llm_correct = [], 0
+            # Time the router on every message so the saving is measured, not assumed
+            for case in cases:
+                prompt = prompts.get_prompt("router", {"user_message": case["text"]})
+                start = time.perf_counter()
+                action = await llm.complete(prompt)
+                llm_latencies.append(time.perf_counter() - start)
+                llm_correct += _llm_label(action) == case["label"]
+        finally:
+            await gateway.close()
+
+        per_call = statistics.median(llm_latencies)
+        print(f"LLM router accuracy={llm_correct / total:6.1%}  p50={per_call * 1000:.0f}ms")
+        print(f"latency saved ~{per_call * local:.1f}s over the fixture "
+              f"({per_call * 1000:.0f}ms on {local / total:.0%} of messages)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+"""
+Compare per-call httpx clients against the pooled LLM gateway.
+
+By default a local stub of Ollama's /api/chat is started, so the numbers
+isolate connection setup from model time. Point --host at a real Ollama to
+measure end to end.
+
+    python -m scripts.bench_llm_clients --requests 200 --concurrency 10
+    python -m scripts.bench_llm_clients --host http://localhost:11434 --model qwen3:latest
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.adapters.services.llm_gateway import LLMGateway
+from app.adapters.services.llm_service import OllamaLLM
+from app.core.config import settings
+
+
+class _StubOllama(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like Ollama
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        body = json.dumps({"message": {"role": "assistant", "content": "ok"}, "done": True}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub() -> str:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+async def _run(llm: OllamaLLM, requests: int, concurrency: int) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await llm.complete("ping", max_tokens=1)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def _report(label: str, latencies: list[float]) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(f"{label:<10} p50={statistics.median(ordered):7.2f}ms  p99={p99:7.2f}ms  n={len(ordered)}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", help="Ollama host (default: local stub)")
+    parser.add_argument("--model", default=settings.OLLAMA_CHAT_MODEL)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    host = args.host or _start_stub()
+    config = settings.model_copy(update={"OLLAMA_HOST": host, "OLLAMA_CHAT_MODEL": args.model, "OPENAI_API_KEY": None})
+
+    _report("per-call", await _run(OllamaLLM(host=host, model=args.model), args.requests, args.concurrency))
+
+    gateway = LLMGateway(config)
+    await gateway.start()
+    try:
+        _report("pooled", await _run(gateway.get_llm(), args.requests, args.concurrency))
+    finally:
+        await gateway.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
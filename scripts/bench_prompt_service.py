@@ -0,0 +1,60 @@
+"""
+Per-call overhead of PromptService.get_prompt.
+
+Compares the previous behaviour (exists check, open, read and format on
+every call) with the compiled-template cache, with and without the mtime
+check. Uses the real prompts directory.
+
+    python -m scripts.bench_prompt_service --calls 20000
+"""
+import argparse
+import os
+import timeit
+
+from app.adapters.agents.prompt_service import PromptService
+
+CONTEXT = {"user_message": "@Nova can you explain how photosynthesis works?"}
+
+
+def _legacy_get_prompt(prompts_dir: str, name: str, context: dict) -> str:
+    # The pre-cache implementation, kept here as the baseline
+    file_path = os.path.join(prompts_dir, f"{name}.md")
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Prompt file not found: {file_path}")
+    with open(file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+    try:
+        return content.format(**context)
+    except KeyError:
+        return content
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--prompt", default="router")
+    args = parser.parse_args()
+
+    watched = PromptService(check_mtime=True)
+    preloaded = PromptService(check_mtime=False)
+    preloaded.preload()
+
+    assert watched.get_prompt(args.prompt, CONTEXT) == _legacy_get_prompt(
+        watched.prompts_dir, args.prompt, CONTEXT
+    )
+
+    cases = {
+        "legacy": lambda: _legacy_get_prompt(watched.prompts_dir, args.prompt, CONTEXT),
+        "cached+mtime": lambda: watched.get_prompt(args.prompt, CONTEXT),
+        "preloaded": lambda: preloaded.get_prompt(args.prompt, CONTEXT),
+    }
+    baseline = None
+    for label, call in cases.items():
+        seconds = min(timeit.repeat(call, number=args.calls, repeat=3))
+        per_call = seconds / args.calls * 1e6
+        baseline = baseline or per_call
+        print(f"{label:<13} {per_call:8.2f}us/call  {baseline / per_call:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
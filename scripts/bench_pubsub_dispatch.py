@@ -0,0 +1,123 @@
+"""
+Load-test RedisPubSub's single dispatcher with thousands of active groups.
+
+Subscribes one RedisPubSub instance to --groups group channels, then
+publishes --messages events to random groups from a separate connection
+while a share of the groups keep unsubscribing and resubscribing. Every
+callback checks that each event it receives belongs to its own group.
+
+Reports delivery throughput, publish-to-callback latency, misrouted,
+missing and duplicated events, and exits non-zero on any misrouting or
+loss on groups that stayed subscribed. Needs a running Redis
+(settings.REDIS_URL or --redis-url).
+
+    python -m scripts.bench_pubsub_dispatch
+    python -m scripts.bench_pubsub_dispatch --groups 5000 --messages 50000 --churn 0.05
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+
+import redis.asyncio as redis
+
+from app.adapters.services.chat_redis_pubsub import RedisPubSub
+from app.core.config import settings
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default=settings.REDIS_URL)
+    parser.add_argument("--groups", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--rate", type=int, default=5000, help="published events per second")
+    parser.add_argument("--churn", type=float, default=0.02, help="share of groups resubscribed during the run")
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    pubsub = RedisPubSub(args.redis_url)
+    await pubsub.connect()
+    publisher = await redis.from_url(args.redis_url, decode_responses=True)
+
+    groups = [uuid.uuid4() for _ in range(args.groups)]
+    received = defaultdict(list)  # group -> sequence numbers
+    misrouted = 0
+    latencies = []
+
+    def handler(group_id):
+        async def on_event(payload: str) -> None:
+            nonlocal misrouted
+            event = json.loads(payload)
+            if event["group_id"] != str(group_id):
+                misrouted += 1
+            received[group_id].append(event["sequence"])
+            latencies.append(time.perf_counter() - event["sent_at"])
+        return on_event
+
+    started = time.perf_counter()
+    for group_id in groups:
+        await pubsub.subscribe_to_group(group_id, handler(group_id))
+    print(f"subscribed {args.groups} groups in {time.perf_counter() - started:.2f}s")
+
+    churned = set(rng.sample(groups, int(args.groups * args.churn)))
+    sent = Counter()
+
+    async def churn() -> None:
+        # Unsubscribe / resubscribe a few groups while traffic flows
+        while True:
+            group_id = rng.choice(list(churned)) if churned else None
+            if group_id is None:
+                return
+            await pubsub.unsubscribe_from_group(group_id)
+            await asyncio.sleep(0.01)
+            await pubsub.subscribe_to_group(group_id, handler(group_id))
+            await asyncio.sleep(0.01)
+
+    churner = asyncio.create_task(churn())
+    started = time.perf_counter()
+    for sequence in range(args.messages):
+        group_id = rng.choice(groups)
+        sent[group_id] += 1
+        await publisher.publish(
+            f"chat:group:{group_id}",
+            json.dumps({"group_id": str(group_id), "sequence": sequence, "sent_at": time.perf_counter()}),
+        )
+        if sequence % 100 == 99:
+            # Pace publishing to the target rate
+            await asyncio.sleep(max(0.0, started + (sequence + 1) / args.rate - time.perf_counter()))
+
+    # Let the dispatcher drain
+    deadline = time.perf_counter() + 10
+    while sum(len(v) for v in received.values()) < args.messages and time.perf_counter() < deadline:
+        await asyncio.sleep(0.1)
+    elapsed = time.perf_counter() - started
+    churner.cancel()
+    await asyncio.gather(churner, return_exceptions=True)
+
+    stable = [g for g in groups if g not in churned]
+    missing = sum(max(sent[g] - len(received[g]), 0) for g in stable)
+    duplicated = sum(len(v) - len(set(v)) for v in received.values())
+    delivered = sum(len(v) for v in received.values())
+
+    print(f"published {args.messages}, delivered {delivered} in {elapsed:.2f}s ({delivered / elapsed:.0f}/s)")
+    if latencies:
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"latency p50 {quantiles[49] * 1000:.2f}ms  p99 {quantiles[98] * 1000:.2f}ms  max {max(latencies) * 1000:.2f}ms")
+    print(f"misrouted {misrouted}  missing on stable groups {missing}  duplicated {duplicated}")
+    print(f"churned groups {len(churned)} (events published while unsubscribed are expected to drop)")
+
+    for group_id in groups:
+        await pubsub.unsubscribe_from_group(group_id)
+    await pubsub.disconnect()
+    await publisher.close()
+    return 1 if misrouted or missing or duplicated else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,195 @@
+"""
+Compare flat and two-stage (coarse-to-fine) chunk retrieval as a class
+library grows.
+
+Synthetic libraries: documents belong to a few subjects and have long-tailed
+lengths (a few very verbose files). Queries are noisy copies of a random
+chunk. Both modes run through the real SearchDocumentsUseCase.
+
+Per library size it reports median / p95 search latency, points scored per
+query, how often the queried document appears in the top-k, and the
+overlap of the two-stage top-k with the flat top-k (recall against
+exhaustive search).
+
+By default the vectors live in an in-process numpy index that, like Qdrant
+with payload indexes, only scores the points that pass the filter. With
+--qdrant the same comparison runs against a Qdrant server through
+QdrantVector (it uses throwaway collections and drops them afterwards).
+
+    python -m scripts.bench_two_stage_retrieval
+    python -m scripts.bench_two_stage_retrieval --sizes 50 200 800 --top-documents 8
+    python -m scripts.bench_two_stage_retrieval --qdrant localhost:6333
+"""
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+import uuid
+import numpy as np
+
+from app.application.use_cases.document_usecases import SearchDocumentsUseCase
+from app.core.config import settings
+from app.domain.entities import DocumentChunksAndEmbeddings, EmbeddedChunk
+
+
+class NumpyIndex:
+    """Exact search with per-document posting lists – the vector store calls the use case makes."""
+
+    def __init__(self) -> None:
+        self.chunks: dict[str, np.ndarray] = {}
+        self.centroids: dict[str, np.ndarray] = {}
+        self.scored = 0
+
+    async def search_documents(self, embedded_query, top_k=10, user_id=None, class_id=None):
+        ids = list(self.centroids)
+        scores = np.stack([self.centroids[i] for i in ids]) @ np.asarray(embedded_query)
+        self.scored += len(ids)
+        order = np.argsort(-scores)[:top_k]
+        return [{"document_id": ids[i], "score": float(scores[i])} for i in order]
+
+    async def search_embeddings(self, embedded_query, top_k=5, user_id=None, class_id=None,
+                                document_id=None, document_ids=None, chunk_range=None, with_vectors=False):
+        ids = document_ids or list(self.chunks)
+        query = np.asarray(embedded_query)
+        hits = []
+        for doc in ids:
+            scores = self.chunks[doc] @ query
+            self.scored += len(scores)
+            for i in np.argsort(-scores)[:top_k]:
+                hits.append({"document_id": doc, "chunk_index": int(i), "score": float(scores[i])})
+        hits.sort(key=lambda h: h["score"], reverse=True)
+        return hits[:top_k]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    return matrix / np.linalg.norm(matrix, axis=-1, keepdims=True)
+
+
+def _library(rng: np.random.Generator, size: int, dim: int, subjects: int) -> list[tuple[str, np.ndarray]]:
+    subject_vectors = _normalize(rng.normal(size=(subjects, dim)))
+    library = []
+    for _ in range(size):
+        topic = _normalize(subject_vectors[rng.integers(subjects)] + rng.normal(0, 0.6 / dim ** 0.5, dim))
+        # Long-tailed lengths: most documents are short, a few are very verbose
+        chunk_count = int(np.clip(rng.lognormal(2.8, 0.9), 3, 300))
+        chunks = _normalize(topic + rng.normal(0, 0.7 / dim ** 0.5, (chunk_count, dim)))
+        library.append((str(uuid.uuid4()), chunks))
+    return library
+
+
+async def _numpy_store(library) -> NumpyIndex:
+    store = NumpyIndex()
+    for document_id, chunks in library:
+        store.chunks[document_id] = chunks
+        store.centroids[document_id] = _normalize(chunks.mean(axis=0))
+    return store
+
+
+async def _qdrant_store(library, address: str, dim: int):
+    from qdrant_client import QdrantClient
+
+    from app.adapters.services.qdrant_vector import QdrantVector
+
+    host, _, port = address.partition(":")
+    suffix = uuid.uuid4().hex[:8]
+    settings.QDRANT_VECTOR_SIZE = dim
+    settings.QDRANT_COLLECTION_NAME = f"bench_chunks_{suffix}"
+    settings.QDRANT_SUMMARY_COLLECTION_NAME = f"bench_summaries_{suffix}"
+    client = QdrantClient(host=host, port=int(port or 6333))
+    store = QdrantVector(host=host, port=int(port or 6333), client=client)
+
+    for document_id, chunks in library:
+        await store.store_embeddings(
+            DocumentChunksAndEmbeddings(
+                document_id=document_id,
+                user_id="bench",
+                class_id="bench",
+                created_at=datetime.datetime.now(datetime.timezone.utc),
+                embedding_model="synthetic",
+                embedding_dim=dim,
+                embedded_chunks=[
+                    EmbeddedChunk(index=i, chunk="", embedding=vector.tolist())
+                    for i, vector in enumerate(chunks)
+                ],
+            )
+        )
+        await store.store_document_vector(
+            document_id, "bench", "bench", _normalize(chunks.mean(axis=0)).tolist()
+        )
+    return store, client
+
+
+def _ms(samples: list[float], percentile: int) -> float:
+    return statistics.quantiles(samples, n=100)[percentile - 1] * 1000
+
+
+async def _run(args, size: int, rng: np.random.Generator) -> None:
+    library = _library(rng, size, args.dim, args.subjects)
+    client = None
+    if args.qdrant:
+        store, client = await _qdrant_store(library, args.qdrant, args.dim)
+    else:
+        store = await _numpy_store(library)
+    use_case = SearchDocumentsUseCase(store, embedder=None, coarse_top_documents=args.top_documents)
+
+    results = {mode: {"times": [], "scored": 0, "doc_hits": 0} for mode in ("flat", "staged")}
+    overlap = []
+    try:
+        for _ in range(args.queries):
+            document_id, chunks = library[rng.integers(len(library))]
+            target = chunks[rng.integers(len(chunks))]
+            query = _normalize(target + rng.normal(0, 0.6 / args.dim ** 0.5, args.dim)).tolist()
+
+            keys = {}
+            for mode in ("flat", "staged"):
+                scored_before = getattr(store, "scored", 0)
+                started = time.perf_counter()
+                hits = await use_case.execute(
+                    query="q", user_id=None, class_id=None, top_k=args.top_k,
+                    embedded_query=query, two_stage=mode == "staged",
+                )
+                results[mode]["times"].append(time.perf_counter() - started)
+                results[mode]["scored"] += getattr(store, "scored", 0) - scored_before
+                results[mode]["doc_hits"] += any(h["document_id"] == document_id for h in hits)
+                keys[mode] = {(h["document_id"], h["chunk_index"]) for h in hits}
+            overlap.append(len(keys["flat"] & keys["staged"]) / max(len(keys["flat"]), 1))
+    finally:
+        if client is not None:
+            client.delete_collection(settings.QDRANT_COLLECTION_NAME)
+            client.delete_collection(settings.QDRANT_SUMMARY_COLLECTION_NAME)
+
+    total_chunks = sum(len(chunks) for _, chunks in library)
+    row = f"{size:>5} {total_chunks:>7}"
+    for mode in ("flat", "staged"):
+        r = results[mode]
+        scored = f"{r['scored'] // args.queries:>7}" if not args.qdrant else f"{'-':>7}"
+        row += (
+            f" | {_ms(r['times'], 50):>7.2f}ms {_ms(r['times'], 95):>7.2f}ms {scored} "
+            f"{r['doc_hits'] / args.queries:>7.0%}"
+        )
+    print(f"{row} | {statistics.mean(overlap):>6.0%}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 400, 1600], help="documents per library")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--top-documents", type=int, default=settings.SEARCH_COARSE_TOP_DOCUMENTS)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--subjects", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--qdrant", metavar="HOST:PORT", help="run against a Qdrant server")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    header = f"{'p50':>9} {'p95':>9} {'scored':>7} {'doc hit':>7}"
+    print(f"{'':>13} | {'flat':^35} | {'two-stage (top ' + str(args.top_documents) + ' docs)':^35} |")
+    print(f"{'docs':>5} {'chunks':>7} | {header} | {header} | {'recall':>6}")
+    for size in args.sizes:
+        await _run(args, size, rng)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,194 @@
+"""
+Measure WebSocket broadcast cost and slow-consumer isolation for one large
+class.
+
+Connects --members Starlette WebSockets (over an in-memory ASGI transport)
+to one group of a real ConnectionManager, then fans out chat events
+captured as Redis would deliver them (JSON text).
+
+CPU: CPU time (process time) per broadcast message, until every member
+has been sent the frame, two ways:
+
+- decode + send_json: json.loads once, json.dumps again for every socket
+  (the original fan-out path)
+- passthrough: ConnectionManager.broadcast_to_group with the raw payload,
+  one shared str queued to every connection's writer
+
+Slow consumers: --slow of the members stop reading (their sends never
+complete) while chat messages and typing events keep flowing. Reports
+delivery latency of the healthy members and how the stalled ones were
+evicted.
+
+    python -m scripts.bench_ws_broadcast
+    python -m scripts.bench_ws_broadcast --members 1000 --messages 200 --slow 20
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+from starlette.websockets import WebSocket
+
+from app.core.metrics import metrics
+from app.infrastructure.ws.connection_manager import ConnectionManager
+
+
+class NullPubSub:
+    """Stands in for Redis; the benchmark feeds payloads directly."""
+
+    async def subscribe_to_group(self, group_id, callback):
+        pass
+
+    async def unsubscribe_from_group(self, group_id):
+        pass
+
+    async def publish_user_joined(self, group_id, user_id, username):
+        pass
+
+    async def publish_user_left(self, group_id, user_id, username):
+        pass
+
+
+class Transport:
+    """In-memory ASGI side of the sockets: counts frames, can stall."""
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.latencies: list[float] = []
+
+    def socket(self, stalled: bool = False) -> WebSocket:
+        async def receive():
+            return {"type": "websocket.connect"}
+
+        async def send(message):
+            if message["type"] != "websocket.send":
+                return
+            if stalled:
+                await asyncio.Event().wait()  # the client never reads again
+            self.frames += 1
+            sent_at = json.loads(message["text"]).get("sent_at")
+            if sent_at:
+                self.latencies.append(time.perf_counter() - sent_at)
+
+        return WebSocket({"type": "websocket", "path": "/", "headers": []}, receive, send)
+
+    async def wait_for(self, frames: int) -> None:
+        while self.frames < frames:
+            await asyncio.sleep(0)
+
+
+def _event(content: str, sent_at: float = 0.0) -> str:
+    return json.dumps({
+        "type": "message",
+        "data": {
+            "id": str(uuid.uuid4()),
+            "group_id": str(uuid.uuid4()),
+            "sender_id": str(uuid.uuid4()),
+            "content": content,
+            "message_type": "text",
+            "mentions": [],
+            "created_at": "2026-01-01T12:00:00+00:00",
+            "edited_at": None,
+            "is_deleted": False,
+            "reply_to_id": None,
+            "metadata": {},
+        },
+        "sent_at": sent_at,
+    })
+
+
+async def _class(members: int, slow: int = 0, **kwargs):
+    transport = Transport()
+    manager = ConnectionManager(NullPubSub(), **kwargs)
+    group_id = uuid.uuid4()
+    sockets = [transport.socket(stalled=i < slow) for i in range(members)]
+    for websocket in sockets:
+        await manager.connect(websocket, uuid.uuid4(), group_id, "bench")
+    return transport, manager, group_id, sockets
+
+
+async def _cpu(args) -> None:
+    transport, manager, group_id, sockets = await _class(args.members)
+
+    async def decode_and_send_json(payload: str) -> None:
+        message = json.loads(payload)
+        await asyncio.gather(
+            *(websocket.send_json(message) for websocket in sockets), return_exceptions=True
+        )
+
+    async def passthrough(payload: str) -> None:
+        await manager.broadcast_to_group(group_id, payload)
+        await transport.wait_for(transport.frames + args.members)
+
+    print(f"CPU per broadcast, {args.members} members, {args.messages} messages per case")
+    print(f"{'payload':>12} | {'decode + send_json':>22} | {'passthrough':>22} | {'saved':>6}")
+    for label, content in (("short", "Does anyone have the notes for week 3?"), ("long", "lorem ipsum " * 300)):
+        payload = _event(content)
+        timings = []
+        for broadcast in (decode_and_send_json, passthrough):
+            await broadcast(payload)  # warm up
+            started = time.process_time()
+            for _ in range(args.messages):
+                await broadcast(payload)
+            timings.append((time.process_time() - started) / args.messages)
+        before, after = timings
+        print(
+            f"{label + f' {len(payload)}B':>12} | "
+            f"{before * 1000:>8.2f}ms {before / args.members * 1e6:>7.2f}us/fr | "
+            f"{after * 1000:>8.2f}ms {after / args.members * 1e6:>7.2f}us/fr | "
+            f"{1 - after / before:>6.0%}"
+        )
+    await manager.shutdown()
+
+
+async def _slow_consumers(args) -> None:
+    metrics.reset()
+    transport, manager, group_id, _ = await _class(
+        args.members, slow=args.slow, send_queue_size=args.queue_size, send_timeout=args.send_timeout
+    )
+    healthy = args.members - args.slow
+    expected = 0
+    for i in range(args.messages):
+        await manager.broadcast_to_group(group_id, _event("hello", time.perf_counter()))
+        await manager.broadcast_to_group(
+            group_id, {"type": "typing", "data": {"user_id": str(uuid.uuid4()), "is_typing": i % 2 == 0}}
+        )
+        expected += healthy * 2
+        await transport.wait_for(expected)
+        await asyncio.sleep(0.001)
+
+    latencies = transport.latencies
+    quantiles = statistics.quantiles(latencies, n=100)
+    evictions = {
+        reason: metrics.get_counter("ws_evictions_total", reason=reason) for reason in ("overflow", "timeout")
+    }
+    print(f"\nSlow consumers: {args.slow} of {args.members} stalled, queue {args.queue_size}")
+    print(
+        f"healthy members got {len(latencies)}/{healthy * args.messages} messages, "
+        f"p50 {quantiles[49] * 1000:.2f}ms p99 {quantiles[98] * 1000:.2f}ms max {max(latencies) * 1000:.2f}ms"
+    )
+    print(
+        f"evicted: {int(evictions['overflow'])} overflow, {int(evictions['timeout'])} timeout; "
+        f"typing events dropped {int(metrics.get_counter('ws_events_dropped_total'))}; "
+        f"still connected {manager.get_connection_count(group_id)}"
+    )
+    await manager.shutdown()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--members", type=int, default=1000)
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--slow", type=int, default=10, help="stalled members in the slow-consumer run")
+    parser.add_argument("--queue-size", type=int, default=64)
+    parser.add_argument("--send-timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    await _cpu(args)
+    await _slow_consumers(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
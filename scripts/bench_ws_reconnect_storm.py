@@ -0,0 +1,192 @@
+"""
+Reconnect-storm benchmark for the chat WebSocket handshake.
+
+After a deploy every client reconnects at once. This drives --clients
+simultaneous handshakes through the real websocket_endpoint (JWT check,
+username resolution, ConnectionManager.connect, presence) over an
+in-memory ASGI transport, and reports how long the storm takes to settle
+and the per-handshake latency, for each way of resolving the username:
+
+- database: one query per connect through a bounded connection pool
+  (--db-pool, --db-latency-ms); models the previous handshake
+- cache:    the shared Redis profile cache (--redis-latency-ms, or a real
+            server with --redis-url)
+- token:    cache miss, the signed username claim of the access token
+
+Redis pub/sub, presence and the membership cache (every client is a cached
+member) are in-process fakes with --redis-latency-ms per call, so only the
+username lookup differs between the runs.
+
+    python -m scripts.bench_ws_reconnect_storm
+    python -m scripts.bench_ws_reconnect_storm --clients 5000 --db-latency-ms 3
+    python -m scripts.bench_ws_reconnect_storm --redis-url redis://localhost:6379/0
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from typing import Optional
+
+from loguru import logger
+from starlette.websockets import WebSocket
+
+from app.adapters.services import JWTAuth, RedisUserProfileCache
+from app.application.interfaces import IUserProfileCache
+from app.application.use_cases import CheckClassMembershipUseCase
+from app.core.config import settings
+from app.domain.entities import UserProfile
+from app.infrastructure.ws.connection_manager import ConnectionManager
+from app.infrastructure.ws.ws_router import websocket_endpoint
+
+
+class FakeRedis:
+    """Pub/sub and presence stand-in: every call costs one Redis round trip."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+
+    async def _rtt(self, *args, **kwargs) -> None:
+        await asyncio.sleep(self.latency)
+
+    subscribe_to_group = unsubscribe_from_group = _rtt
+    publish_user_joined = publish_user_left = publish_typing_indicator = _rtt
+    set_user_online = set_user_offline = _rtt
+
+    async def contains(self, group_id: uuid.UUID, user_id: uuid.UUID) -> bool:
+        await self._rtt()
+        return True
+
+
+class DatabaseLookup(IUserProfileCache):
+    """One SELECT per handshake through a bounded pool (the previous path)."""
+
+    def __init__(self, pool_size: int, latency: float) -> None:
+        self._pool = asyncio.Semaphore(pool_size)
+        self._latency = latency
+        self.queries = 0
+
+    async def get(self, user_id: uuid.UUID) -> Optional[UserProfile]:
+        async with self._pool:
+            self.queries += 1
+            await asyncio.sleep(self._latency)
+        return UserProfile(user_id=user_id, username=f"user_{str(user_id)[:8]}")
+
+    async def set(self, profile: UserProfile) -> None:
+        pass
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        pass
+
+
+class MemoryProfileCache(IUserProfileCache):
+    def __init__(self, latency: float, hit: bool) -> None:
+        self._latency = latency
+        self._hit = hit
+
+    async def get(self, user_id: uuid.UUID) -> Optional[UserProfile]:
+        await asyncio.sleep(self._latency)
+        return UserProfile(user_id=user_id, username=f"user_{str(user_id)[:8]}") if self._hit else None
+
+    async def set(self, profile: UserProfile) -> None:
+        pass
+
+    async def invalidate(self, user_id: uuid.UUID) -> None:
+        pass
+
+
+async def _storm(args, profile_cache: IUserProfileCache, users: list[tuple[uuid.UUID, str]]) -> dict:
+    redis = FakeRedis(args.redis_latency_ms / 1000)
+    manager = ConnectionManager(redis)
+    membership = CheckClassMembershipUseCase(redis, group_repo_factory=None)  # never misses
+    group_ids = [uuid.uuid4() for _ in range(args.groups)]
+    release = asyncio.Event()
+    handshakes: list[float] = []
+
+    async def client(index: int, token: str) -> None:
+        started = time.perf_counter()
+        connected = False
+
+        async def receive():
+            nonlocal connected
+            if not connected:
+                connected = True
+                return {"type": "websocket.connect"}
+            await release.wait()
+            return {"type": "websocket.disconnect", "code": 1001}
+
+        async def send(message):
+            if message["type"] == "websocket.accept":
+                handshakes.append(time.perf_counter() - started)
+
+        scope = {"type": "websocket", "path": "/", "headers": [], "query_string": f"token={token}".encode()}
+        await websocket_endpoint(
+            WebSocket(scope, receive, send),
+            group_ids[index % len(group_ids)],
+            manager=manager,
+            presence_service=redis,
+            profile_cache=profile_cache,
+            membership=membership,
+        )
+
+    started = time.perf_counter()
+    tasks = [asyncio.create_task(client(i, token)) for i, (_, token) in enumerate(users)]
+    while len(handshakes) < len(users):
+        await asyncio.sleep(0.001)
+    settled = time.perf_counter() - started
+    release.set()
+    await asyncio.gather(*tasks)
+    await manager.shutdown()
+
+    quantiles = statistics.quantiles(handshakes, n=100)
+    return {"settled": settled, "p50": quantiles[49], "p99": quantiles[98]}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=2000)
+    parser.add_argument("--groups", type=int, default=50)
+    parser.add_argument("--db-pool", type=int, default=15, help="SQLAlchemy default: 5 + 10 overflow")
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="session checkout + SELECT")
+    parser.add_argument("--redis-latency-ms", type=float, default=0.3)
+    parser.add_argument("--redis-url", help="use a real Redis for the profile cache")
+    args = parser.parse_args()
+    logger.disable("app")
+
+    jwt = JWTAuth(secret_key=settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    users = []
+    for _ in range(args.clients):
+        user_id = uuid.uuid4()
+        users.append((user_id, jwt.create_tokens(user_id, f"user_{str(user_id)[:8]}").access_token))
+
+    if args.redis_url:
+        cache = RedisUserProfileCache(args.redis_url)
+        await cache.connect()
+        for user_id, _ in users:
+            await cache.set(UserProfile(user_id=user_id, username=f"user_{str(user_id)[:8]}"))
+    else:
+        cache = MemoryProfileCache(args.redis_latency_ms / 1000, hit=True)
+
+    database = DatabaseLookup(args.db_pool, args.db_latency_ms / 1000)
+    runs = [
+        ("database", database),
+        ("cache", cache),
+        ("token", MemoryProfileCache(args.redis_latency_ms / 1000, hit=False)),
+    ]
+
+    print(f"{args.clients} clients reconnecting at once across {args.groups} groups")
+    print(f"{'username from':>14} | {'settled':>9} | {'p50':>9} | {'p99':>9} | {'db queries':>10}")
+    for label, profile_cache in runs:
+        database.queries = 0
+        result = await _storm(args, profile_cache, users)
+        print(
+            f"{label:>14} | {result['settled'] * 1000:>7.0f}ms | {result['p50'] * 1000:>7.1f}ms | "
+            f"{result['p99'] * 1000:>7.1f}ms | {database.queries if profile_cache is database else 0:>10}"
+        )
+
+    if args.redis_url:
+        await cache.disconnect()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+"""
+Load-test resuming chat WebSockets over the Redis Streams transport.
+
+--clients sockets (over an in-memory ASGI transport) join one group of a
+ConnectionManager backed by RedisStreamPubSub, while chat messages are
+published at --rate. Every client keeps dropping off for up to
+--offline-ms and reconnecting with the event_id of the last message it
+received, the way a browser does after a network blip.
+
+Checks that every client ends up with every message exactly once and in
+order (replayed, then live), and reports catch-up latency (reconnect
+until the newest message published by then was sent) and how many
+reconnects had to resync from the database instead. Needs a running
+Redis 6.2+ (settings.REDIS_URL or --redis-url).
+
+    python -m scripts.bench_ws_resume
+    python -m scripts.bench_ws_resume --clients 500 --rate 200 --offline-ms 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from loguru import logger
+from starlette.websockets import WebSocket
+
+from app.adapters.services import RedisStreamPubSub
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.infrastructure.ws.connection_manager import ConnectionManager
+
+
+class Client:
+    """One browser tab: reconnects with the last event_id it saw."""
+
+    def __init__(self) -> None:
+        self.received: list[int] = []
+        self.last_event_id = None
+        self.resynced = False  # would reload history over REST
+        self.replay_latencies: list[float] = []
+        self._resumed_at = None
+        self._catch_up_to = None
+
+    def socket(self) -> WebSocket:
+        async def receive():
+            return {"type": "websocket.connect"}
+
+        async def send(message):
+            if message["type"] != "websocket.send":
+                return
+            event = json.loads(message["text"])
+            if event["type"] == "resync":
+                self.resynced = True
+            if event["type"] != "message":
+                return
+            self.received.append(event["data"]["sequence"])
+            self.last_event_id = event["event_id"]
+            if self._catch_up_to is not None and event["data"]["sequence"] >= self._catch_up_to:
+                self.replay_latencies.append(time.perf_counter() - self._resumed_at)
+                self._catch_up_to = None
+
+        return WebSocket({"type": "websocket", "path": "/", "headers": []}, receive, send)
+
+    def resuming(self, published: int) -> None:
+        """Reconnecting; time until the newest message published so far arrives."""
+        self._resumed_at = time.perf_counter()
+        self._catch_up_to = published - 1 if self.received[-1] < published - 1 else None
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--redis-url", default=settings.REDIS_URL)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--rate", type=int, default=100, help="chat messages per second")
+    parser.add_argument("--offline-ms", type=float, default=1000.0, help="longest time a client stays away")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    logger.disable("app")
+
+    pubsub = RedisStreamPubSub(
+        args.redis_url,
+        maxlen=settings.WS_STREAM_MAXLEN,
+        replay_limit=settings.WS_REPLAY_LIMIT,
+    )
+    await pubsub.connect()
+    manager = ConnectionManager(pubsub)
+    group_id = uuid.uuid4()
+    clients = [Client() for _ in range(args.clients)]
+    websockets = [client.socket() for client in clients]
+    for websocket in websockets:
+        await manager.connect(websocket, uuid.uuid4(), group_id, "bench")
+
+    published = 0
+
+    async def publish(count: int) -> None:
+        nonlocal published
+        started = time.perf_counter()
+        for i in range(count):
+            await pubsub._publish(group_id, {"type": "message", "data": {"sequence": published}})
+            published += 1
+            await asyncio.sleep(max(0.0, started + (i + 1) / args.rate - time.perf_counter()))
+
+    # Every client needs one event_id before it can resume
+    await publish(1)
+    while any(not client.received for client in clients):
+        await asyncio.sleep(0.01)
+
+    publisher = asyncio.create_task(publish(args.messages - 1))
+
+    async def blip(client: Client, websocket: WebSocket) -> None:
+        # Drop off, stay away a while, come back with the last event_id
+        while not publisher.done():
+            await asyncio.sleep(rng.uniform(0.2, 2.0))
+            await manager.disconnect(websocket, group_id, "bench")
+            await asyncio.sleep(rng.uniform(0, args.offline_ms / 1000))
+            websocket = client.socket()
+            client.resuming(published)
+            await manager.connect(websocket, uuid.uuid4(), group_id, "bench", client.last_event_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(blip(client, websocket) for client, websocket in zip(clients, websockets)))
+    await publisher
+    deadline = time.perf_counter() + 10
+    while any(len(client.received) < published for client in clients) and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    elapsed = time.perf_counter() - started
+
+    expected = list(range(published))
+    resumed = [client for client in clients if not client.resynced]
+    complete = sum(client.received == expected for client in resumed)
+    duplicated = sum(len(client.received) - len(set(client.received)) for client in clients)
+    reconnects = int(metrics.get_counter("ws_replays_total", outcome="replayed"))
+    resyncs = int(metrics.get_counter("ws_replays_total", outcome="resync"))
+    latencies = [latency for client in clients for latency in client.replay_latencies]
+
+    print(f"{args.clients} clients, {published} messages in {elapsed:.1f}s, offline up to {args.offline_ms:.0f}ms")
+    print(f"clients with every message once and in order: {complete}/{len(resumed)}  duplicated {duplicated}")
+    print(
+        f"reconnects replayed {reconnects}  resynced {resyncs} "
+        f"({args.clients - len(resumed)} clients missed more than the replay limit)"
+    )
+    if len(latencies) > 1:
+        quantiles = statistics.quantiles(latencies, n=100)
+        print(f"catch-up after reconnect p50 {quantiles[49] * 1000:.1f}ms  p99 {quantiles[98] * 1000:.1f}ms")
+
+    await manager.shutdown()
+    await pubsub.disconnect()
+    return 0 if complete == len(resumed) and not duplicated else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,38 @@
+import uuid
+
+from app.adapters.services.answer_cache import RedisAnswerCache
+from app.application.interfaces import IAnswerCacheInterface
+
+
+class DownRedis:
+    """Every command fails, like Redis during an outage."""
+
+    def __getattr__(self, name):
+        async def fail(*args, **kwargs):
+            raise ConnectionError("redis is down")
+        return fail
+
+    def pipeline(self, **kwargs):
+        raise ConnectionError("redis is down")
+
+
+def test_scope_separates_documents_and_users():
+    user_a, user_b = uuid.uuid4(), uuid.uuid4()
+    class_id, doc_a, doc_b = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    scope_for = IAnswerCacheInterface.scope_for
+
+    assert scope_for(user_a, class_id, doc_a) != scope_for(user_a, class_id, doc_b)
+    assert scope_for(user_a, class_id) == scope_for(user_b, class_id) == f"class:{class_id}"
+    # Outside a class an answer never leaves the user who asked
+    assert scope_for(user_a, document_id=doc_a) == f"user:{user_a}:doc:{doc_a}"
+    assert scope_for(user_a, document_id=doc_a) != scope_for(user_b, document_id=doc_a)
+
+
+async def test_redis_outage_is_logged_not_raised():
+    cache = RedisAnswerCache("redis://unused")
+    cache._redis = DownRedis()
+
+    assert await cache.get_document_versions(["a"]) is None
+    assert await cache.get_threshold(uuid.uuid4()) is None
+    assert await cache.lookup("class:x", [1.0, 0.0], 0.9) is None
+    await cache.invalidate_document(uuid.uuid4(), uuid.uuid4(), uuid.uuid4())
@@ -0,0 +1,47 @@
+import asyncio
+
+from app.infrastructure.tasks.background_worker import BackgroundWorker
+
+
+async def test_same_key_jobs_run_one_at_a_time_in_order():
+    running: dict[str, int] = {"a": 0, "b": 0}
+    overlaps: list[str] = []
+    finished: list[tuple[str, int]] = []
+
+    async def handler(group: str, n: int) -> None:
+        running[group] += 1
+        if running[group] > 1:
+            overlaps.append(group)
+        await asyncio.sleep(0.01)
+        running[group] -= 1
+        finished.append((group, n))
+
+    worker = BackgroundWorker("test", handler, concurrency=4, key=lambda group, n: group)
+    for n in range(3):
+        worker.submit("a", n)
+        worker.submit("b", n)
+    await worker.stop()
+
+    assert overlaps == []
+    assert [n for group, n in finished if group == "a"] == [0, 1, 2]
+    assert [n for group, n in finished if group == "b"] == [0, 1, 2]
+    assert worker._locks == {}
+
+
+async def test_different_keys_run_concurrently():
+    peak = 0
+    running = 0
+
+    async def handler(group: str) -> None:
+        nonlocal peak, running
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    worker = BackgroundWorker("test", handler, concurrency=2, key=lambda group: group)
+    worker.submit("a")
+    worker.submit("b")
+    await worker.stop()
+
+    assert peak == 2
@@ -0,0 +1,141 @@
+import json
+import uuid
+
+from app.adapters.services.chat_redis_streams import RedisStreamPubSub
+
+
+class FakeRedis:
+    """Just enough of Redis streams and PUBLISH for replay."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list] = {}
+        self.published: list[tuple[str, str]] = []
+        self._seq = 0
+
+    @staticmethod
+    def _key(entry_id: str) -> tuple[int, int]:
+        ms, seq = entry_id.split("-")
+        return int(ms), int(seq)
+
+    async def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self._seq += 1
+        entry_id = f"{1000 + self._seq}-0"
+        entries = self.streams.setdefault(stream, [])
+        entries.append((entry_id, dict(fields)))
+        if maxlen and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        return entry_id
+
+    async def expire(self, *args):
+        return True
+
+    async def xrange(self, stream, min="-", max="+", count=None):
+        entries = self.streams.get(stream, [])
+        if min.startswith("("):
+            entries = [e for e in entries if self._key(e[0]) > self._key(min[1:])]
+        return entries[:count] if count else entries
+
+    async def xrevrange(self, stream, count=None):
+        return list(reversed(self.streams.get(stream, [])))[:count]
+
+    async def publish(self, channel, data):
+        self.published.append((channel, data))
+
+    def pipeline(self, **kwargs):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis) -> None:
+        self._redis = redis
+        self._calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append(getattr(self._redis, name)(*args, **kwargs))
+        return queue
+
+    async def execute(self):
+        return [await call for call in self._calls]
+
+
+def _transport(redis: FakeRedis, **kwargs) -> RedisStreamPubSub:
+    pubsub = RedisStreamPubSub("redis://unused", **kwargs)
+    pubsub._publisher = redis
+    return pubsub
+
+
+async def _send(pubsub: RedisStreamPubSub, group_id: uuid.UUID, count: int) -> list[str]:
+    """Publish chat messages and mark them read by the stream reader."""
+    stream = pubsub._get_stream_key(group_id)
+    for n in range(count):
+        await pubsub._publish(group_id, {"type": "message", "data": {"n": n}})
+    ids = [entry_id for entry_id, _ in pubsub._publisher.streams[stream]]
+    pubsub._offsets[stream] = ids[-1]
+    return ids
+
+
+async def test_replays_messages_after_last_event_id():
+    pubsub = _transport(FakeRedis())
+    group_id = uuid.uuid4()
+    ids = await _send(pubsub, group_id, 5)
+
+    replayed = await pubsub.get_events_since(group_id, ids[1])
+
+    assert [json.loads(p)["data"]["n"] for p in replayed] == [2, 3, 4]
+    assert [json.loads(p)["event_id"] for p in replayed] == ids[2:]
+    assert await pubsub.get_events_since(group_id, ids[-1]) == []
+
+
+async def test_missing_stream_forces_resync():
+    redis = FakeRedis()
+    pubsub = _transport(redis)
+    group_id = uuid.uuid4()
+    ids = await _send(pubsub, group_id, 3)
+
+    redis.streams.clear()  # idle expiry, eviction or a Redis restart
+
+    assert await pubsub.get_events_since(group_id, ids[0]) is None
+
+
+async def test_client_ahead_of_stream_forces_resync():
+    redis = FakeRedis()
+    pubsub = _transport(redis)
+    group_id = uuid.uuid4()
+    ids = await _send(pubsub, group_id, 3)
+
+    # Redis came back from an older snapshot without the last message
+    redis.streams[pubsub._get_stream_key(group_id)].pop()
+
+    assert await pubsub.get_events_since(group_id, ids[-1]) is None
+
+
+async def test_trimmed_stream_or_too_many_missed_forces_resync():
+    pubsub = _transport(FakeRedis(), maxlen=5, replay_limit=3)
+    group_id = uuid.uuid4()
+    ids = await _send(pubsub, group_id, 5)
+
+    assert await pubsub.get_events_since(group_id, ids[0]) is None  # 4 missed > 3
+    more = await _send(pubsub, group_id, 5)
+    assert await pubsub.get_events_since(group_id, ids[-1]) is None  # trimmed away
+    assert len(await pubsub.get_events_since(group_id, more[-3])) == 2
+    assert await pubsub.get_events_since(group_id, "not-an-id") is None
+
+
+async def test_deltas_and_typing_stay_off_the_stream():
+    redis = FakeRedis()
+    pubsub = _transport(redis)
+    group_id = uuid.uuid4()
+
+    for sequence in range(100):
+        await pubsub.publish_message_delta(group_id, uuid.uuid4(), "tok", sequence)
+    await pubsub.publish_typing_indicator(group_id, uuid.uuid4(), "ada", True)
+
+    assert redis.streams == {}
+    assert len(redis.published) == 101
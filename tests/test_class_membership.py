@@ -0,0 +1,117 @@
+import uuid
+from contextlib import asynccontextmanager
+
+from starlette.websockets import WebSocket
+
+from app.adapters.services import JWTAuth
+from app.application.interfaces import IChatMembershipCache
+from app.application.use_cases import (CheckClassMembershipUseCase,
+                                       RemoveClassMemberUseCase)
+from app.core.config import settings
+from app.domain.entities import ChatGroup
+from app.infrastructure.ws.ws_router import websocket_endpoint
+
+
+class MemoryMembershipCache(IChatMembershipCache):
+    def __init__(self) -> None:
+        self.members: dict[uuid.UUID, set[uuid.UUID]] = {}
+
+    async def contains(self, group_id, user_id):
+        return user_id in self.members.get(group_id, set())
+
+    async def add(self, group_id, user_id):
+        self.members.setdefault(group_id, set()).add(user_id)
+
+    async def remove(self, group_id, user_ids):
+        self.members.get(group_id, set()).difference_update(user_ids)
+
+    async def invalidate_group(self, group_id):
+        self.members.pop(group_id, None)
+
+
+class FakeGroupRepo:
+    def __init__(self, group: ChatGroup) -> None:
+        self.group = group
+        self.queries = 0
+
+    async def is_member(self, group_id, user_id):
+        self.queries += 1
+        return group_id == self.group.id and self.group.is_member(user_id)
+
+    async def get_by_code(self, code):
+        return self.group
+
+    async def save(self, group):
+        return group
+
+
+def _membership(repo: FakeGroupRepo, cache: IChatMembershipCache) -> CheckClassMembershipUseCase:
+    @asynccontextmanager
+    async def scope():
+        yield repo
+
+    return CheckClassMembershipUseCase(cache, group_repo_factory=scope)
+
+
+def _class(owner: uuid.UUID) -> ChatGroup:
+    return ChatGroup(name="Biology", code="BIO101", created_by=owner)
+
+
+async def test_members_are_served_from_the_cache_after_one_lookup():
+    owner, outsider = uuid.uuid4(), uuid.uuid4()
+    group = _class(owner)
+    repo, cache = FakeGroupRepo(group), MemoryMembershipCache()
+    membership = _membership(repo, cache)
+
+    assert await membership.execute(group.id, owner)
+    assert await membership.execute(group.id, owner)
+    assert repo.queries == 1
+
+    # Non-members are never cached, so a later join is seen at once
+    assert not await membership.execute(group.id, outsider)
+    assert not await cache.contains(group.id, outsider)
+
+
+async def test_removed_member_loses_cached_membership():
+    owner, student = uuid.uuid4(), uuid.uuid4()
+    group = _class(owner)
+    group.add_member(student, "student")
+    repo, cache = FakeGroupRepo(group), MemoryMembershipCache()
+    membership = _membership(repo, cache)
+    assert await membership.execute(group.id, student)
+
+    await RemoveClassMemberUseCase(repo, membership_cache=cache).execute("BIO101", owner, student)
+
+    assert not await membership.execute(group.id, student)
+
+
+async def test_websocket_of_a_non_member_is_closed_with_1008():
+    owner, outsider = uuid.uuid4(), uuid.uuid4()
+    group = _class(owner)
+    token = JWTAuth(secret_key=settings.SECRET_KEY, algorithm=settings.ALGORITHM).create_tokens(
+        outsider, "outsider"
+    ).access_token
+    sent = []
+
+    async def receive():
+        return {"type": "websocket.connect"}
+
+    async def send(message):
+        sent.append(message)
+
+    class NoManager:
+        async def connect(self, *args, **kwargs):
+            raise AssertionError("a non-member must not be subscribed")
+
+    scope = {"type": "websocket", "path": "/", "headers": [], "query_string": f"token={token}".encode()}
+    await websocket_endpoint(
+        WebSocket(scope, receive, send),
+        group.id,
+        manager=NoManager(),
+        presence_service=None,
+        profile_cache=None,
+        membership=_membership(FakeGroupRepo(group), MemoryMembershipCache()),
+        last_event_id="1-0",
+    )
+
+    assert sent == [{"type": "websocket.close", "code": 1008, "reason": ""}]
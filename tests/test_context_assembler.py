@@ -0,0 +1,12 @@
+from app.adapters.agents.context_assembler import ContextAssembler
+
+
+def test_over_budget_fallback_keeps_the_best_scoring_chunk():
+    chunks = [
+        {"document_id": "d1", "chunk_index": 0, "content": "weak " * 100, "score": 0.2},
+        {"document_id": "d1", "chunk_index": 5, "content": "strong " * 100, "score": 0.9},
+    ]
+
+    context = ContextAssembler(budgets={}, default_budget=10).assemble(chunks)
+
+    assert context == ("strong " * 100)[:40]
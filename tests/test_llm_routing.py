@@ -0,0 +1,159 @@
+import asyncio
+import time
+from typing import AsyncGenerator, Optional
+
+import pytest
+
+from app.adapters.services.llm_routing import RoutingLLM
+from app.application.interfaces.llm_interface import ILLMInterface
+
+
+class FakeProvider(ILLMInterface):
+    """Local provider with a set latency that can be switched to failing."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    @property
+    def model_name(self) -> str:
+        return self.name
+
+    async def complete(self, prompt: str, system_message: Optional[str] = None, max_tokens: int = 1000) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail:
+            raise ConnectionError(f"{self.name} is down")
+        return f"{self.name}:{prompt}"
+
+    async def complete_stream(
+        self, prompt: str, system_message: Optional[str] = None, max_tokens: int = 1000
+    ) -> AsyncGenerator[str, None]:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError(f"{self.name} is down")
+            for token in (self.name, ":", prompt):
+                yield token
+        except (asyncio.CancelledError, GeneratorExit):
+            self.cancelled += 1
+            raise
+
+
+async def _stream(router: RoutingLLM, prompt: str = "q") -> str:
+    return "".join([token async for token in router.complete_stream(prompt)])
+
+
+async def test_failover_to_next_provider():
+    down, backup = FakeProvider("primary", fail=True), FakeProvider("backup")
+    router = RoutingLLM([down, backup])
+
+    assert await router.complete("q") == "backup:q"
+    assert await _stream(router) == "backup:q"
+    assert down.calls == 2
+
+
+async def test_all_providers_failing_raises_last_error():
+    router = RoutingLLM([FakeProvider("a", fail=True), FakeProvider("b", fail=True)])
+
+    with pytest.raises(ConnectionError, match="b is down"):
+        await router.complete("q")
+    with pytest.raises(ConnectionError, match="b is down"):
+        await _stream(router)
+
+
+async def test_circuit_opens_after_consecutive_failures_and_recovers():
+    down, backup = FakeProvider("primary", fail=True), FakeProvider("backup")
+    router = RoutingLLM([down, backup], max_consecutive_failures=2, cooldown=0.1)
+
+    await router.complete("q")
+    await router.complete("q")
+    assert [(s["model"], s["cooling_down"]) for s in router.stats()] == [
+        ("backup", False), ("primary", True),
+    ]
+
+    # Open: the failing provider is not called at all
+    await router.complete("q")
+    assert down.calls == 2
+
+    # Half-open after the cooldown: tried first again, with a clean window
+    down.fail = False
+    await asyncio.sleep(0.15)
+    assert await router.complete("q") == "primary:q"
+    assert router.stats()[0]["model"] == "primary"
+    assert router.stats()[0]["error_rate"] == 0.0
+
+
+async def test_circuit_opens_on_error_rate():
+    flaky, backup = FakeProvider("flaky"), FakeProvider("backup")
+    router = RoutingLLM([flaky, backup], max_consecutive_failures=10, max_error_rate=0.5)
+
+    # Alternate failures: never two in a row, but half the window fails
+    for n in range(6):
+        flaky.fail = n % 2 == 0
+        await router.complete("q")
+
+    assert router.model_name == "backup"
+    assert router.stats()[1] == {
+        "model": "flaky", "error_rate": 0.0, "median_latency": None, "cooling_down": True,
+    }
+
+
+async def test_stream_failures_do_not_open_the_complete_circuit():
+    down, backup = FakeProvider("primary", fail=True), FakeProvider("backup")
+    router = RoutingLLM([down, backup], max_consecutive_failures=1)
+
+    await _stream(router)
+
+    assert router.stats("stream")[0]["model"] == "backup"
+    assert router.stats("complete")[0]["model"] == "primary"
+
+
+async def test_hedged_complete_takes_faster_provider_and_cancels_loser():
+    slow, fast = FakeProvider("slow", delay=1.0), FakeProvider("fast", delay=0.02)
+    router = RoutingLLM([slow, fast], hedge_after=0.05)
+
+    started = time.perf_counter()
+    answer = await router.complete("q")
+
+    assert answer == "fast:q"
+    assert time.perf_counter() - started < 0.5
+    assert slow.cancelled == 1
+
+
+async def test_hedged_stream_takes_faster_first_token_and_cancels_loser():
+    slow, fast = FakeProvider("slow", delay=1.0), FakeProvider("fast", delay=0.02)
+    router = RoutingLLM([slow, fast], hedge_after=0.05)
+
+    started = time.perf_counter()
+    tokens = await _stream(router)
+
+    assert tokens == "fast:q"
+    assert time.perf_counter() - started < 0.5
+    assert slow.cancelled == 1
+
+
+async def test_fast_primary_is_not_hedged():
+    primary, backup = FakeProvider("primary", delay=0.01), FakeProvider("backup")
+    router = RoutingLLM([primary, backup], hedge_after=0.2)
+
+    assert await router.complete("q") == "primary:q"
+    assert await _stream(router) == "primary:q"
+    assert backup.calls == 0
+
+
+async def test_slow_provider_is_demoted():
+    slow, fast = FakeProvider("slow", delay=0.1), FakeProvider("fast")
+    router = RoutingLLM([slow, fast], slow_after=0.05)
+
+    assert await router.complete("q") == "slow:q"
+    assert router.model_name == "fast"
+    assert await router.complete("q") == "fast:q"
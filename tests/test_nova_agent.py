@@ -0,0 +1,113 @@
+import uuid
+
+import pytest
+
+from app.adapters.agents.intent_classifier import IntentClassifier
+from app.application.use_cases.nova_agent_usecase import NovaAgentUseCase
+
+
+class FakeLLM:
+    def __init__(self, route: str = "tutor") -> None:
+        self.route = route
+
+    async def complete(self, prompt, **kwargs):
+        return self.route
+
+    async def complete_stream(self, prompt, **kwargs):
+        yield "hello"
+
+
+class FakePrompts:
+    def get_prompt(self, name, variables):
+        return name
+
+
+class FakeTutor:
+    def __init__(self) -> None:
+        self.calls = []
+        self.questions = []
+
+    async def execute_stream(self, question, user_id=None, class_id=None):
+        self.calls.append((user_id, class_id))
+        self.questions.append(question)
+        yield "answer"
+
+
+class FakeQuiz:
+    def __init__(self) -> None:
+        self.calls = []
+
+    async def execute(self, user_id=None, class_id=None, **kwargs):
+        self.calls.append((user_id, class_id))
+
+        class Quiz:
+            title = "Week 3"
+
+        return Quiz()
+
+
+class FakeClassifier:
+    def __init__(self, label: str) -> None:
+        self.label = label
+
+    async def classify(self, text):
+        class Prediction:
+            label = self.label
+            source = "local"
+            confidence = 0.99
+
+        return Prediction()
+
+
+class RecordingEmbedder:
+    def __init__(self) -> None:
+        self.texts = []
+
+    async def embed(self, text):
+        self.texts.append(text)
+        return text, [1.0, 0.0]
+
+    async def embed_multiple(self, texts):
+        return [(t, [0.0, 1.0]) for t in texts]
+
+
+def _agent(route: str, classifier=None):
+    tutor, quiz = FakeTutor(), FakeQuiz()
+    agent = NovaAgentUseCase(
+        llm=FakeLLM(route),
+        tutor_use_case=tutor,
+        quiz_use_case=quiz,
+        prompt_service=FakePrompts(),
+        intent_classifier=classifier,
+    )
+    return agent, tutor, quiz
+
+
+@pytest.mark.parametrize("classifier", [None, FakeClassifier("tutor")], ids=["llm_router", "local_classifier"])
+async def test_tutor_node_receives_caller_scope(classifier):
+    agent, tutor, _ = _agent("tutor", classifier)
+    user_id, class_id = uuid.uuid4(), uuid.uuid4()
+
+    tokens = [t async for t in agent.execute_stream("What is osmosis?", user_id, class_id, "group-1")]
+
+    assert tokens == ["answer"]
+    assert tutor.calls == [(user_id, class_id)]
+
+
+async def test_quiz_node_receives_caller_scope():
+    agent, _, quiz = _agent("quiz")
+    user_id, class_id = uuid.uuid4(), uuid.uuid4()
+
+    await agent.execute("Quiz me on chapter 2", user_id, class_id)
+
+    assert quiz.calls == [(user_id, class_id)]
+
+
+async def test_tutor_searches_with_the_text_the_classifier_embedded():
+    embedder = RecordingEmbedder()
+    agent, tutor, _ = _agent("tutor", IntentClassifier(embedder, examples={"tutor": ["a"], "quiz": ["b"]}))
+
+    [t async for t in agent.execute_stream("@Nova  photosynthesis   in C4 plants?", uuid.uuid4())]
+
+    assert embedder.texts == ["photosynthesis in C4 plants?"]
+    assert tutor.questions == embedder.texts
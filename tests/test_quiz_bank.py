@@ -0,0 +1,64 @@
+import uuid
+from contextlib import asynccontextmanager
+
+from app.application.use_cases.ai_use_cases import GenerateQuizUseCase
+from app.domain.entities.ai_entity import QuizQuestion, QuizType
+
+
+class FakeBank:
+    def __init__(self, count: int) -> None:
+        self.questions = [QuizQuestion(question_text=f"Q{n}", correct_answer="A") for n in range(count)]
+        self.open_sessions = 0
+
+    async def sample(self, quiz_type, limit, user_id=None, document_id=None, class_id=None):
+        assert self.open_sessions == 1
+        return self.questions[:limit]
+
+
+class CountingLLM:
+    model_name = "fake"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def complete(self, prompt, system_message=None, max_tokens=1000):
+        self.calls += 1
+        return '{"questions": []}'
+
+
+class EmptySearch:
+    async def execute(self, **kwargs):
+        return []
+
+
+def _scope(bank: FakeBank):
+    @asynccontextmanager
+    async def scope():
+        bank.open_sessions += 1
+        try:
+            yield bank
+        finally:
+            bank.open_sessions -= 1
+
+    return scope
+
+
+async def test_quiz_is_served_from_the_bank_through_a_short_lived_repository():
+    bank, llm = FakeBank(8), CountingLLM()
+    use_case = GenerateQuizUseCase(llm, EmptySearch(), quiz_bank_factory=_scope(bank))
+
+    quiz = await use_case.execute(uuid.uuid4(), QuizType.MCQ, class_id=uuid.uuid4(), num_questions=5)
+
+    assert [q.question_text for q in quiz.questions] == ["Q0", "Q1", "Q2", "Q3", "Q4"]
+    assert llm.calls == 0
+    assert bank.open_sessions == 0
+
+
+async def test_small_bank_falls_back_to_generation():
+    bank, llm = FakeBank(2), CountingLLM()
+    use_case = GenerateQuizUseCase(llm, EmptySearch(), quiz_bank_factory=_scope(bank))
+
+    await use_case.execute(uuid.uuid4(), QuizType.MCQ, num_questions=5)
+
+    assert llm.calls == 1
+    assert bank.open_sessions == 0
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.application.use_cases.study_usecases import RefreshStudyRollupsUseCase
+from app.domain.entities.study_session_entity import RollupScope, StudyRollup
+
+
+class FakeStudyRepo:
+    def __init__(self, active: dict[uuid.UUID, datetime]) -> None:
+        self.active = active  # user -> last heartbeat
+
+    async def list_users_active_since(self, since=None):
+        return [u for u, at in self.active.items() if since is None or at > since]
+
+    async def aggregate_by_document(self, user_id):
+        return [StudyRollup(
+            user_id=user_id, scope=RollupScope.DOCUMENT, scope_key=str(uuid.uuid4()),
+            total_seconds=60, session_count=1, last_studied_at=self.active[user_id],
+        )]
+
+
+class FakeRollupRepo:
+    def __init__(self, fail_for: set[uuid.UUID] = frozenset()) -> None:
+        self.fail_for = set(fail_for)
+        self.refreshed: list[uuid.UUID] = []
+        self.watermark = None
+
+    async def replace_for_user(self, user_id, rollups):
+        if user_id in self.fail_for:
+            raise ConnectionError("database went away")
+        self.refreshed.append(user_id)
+        return len(rollups)
+
+    async def get_watermark(self):
+        return self.watermark
+
+    async def set_watermark(self, refreshed_at):
+        self.watermark = refreshed_at
+
+
+class FakeDocumentRepo:
+    async def get_any_by_id(self, document_id):
+        return None
+
+
+async def test_failed_run_keeps_watermark_so_no_user_is_skipped():
+    now = datetime.now(timezone.utc)
+    early, late = uuid.uuid4(), uuid.uuid4()
+    # The user studied most recently is refreshed first; the earlier one fails
+    study = FakeStudyRepo({late: now, early: now - timedelta(hours=1)})
+    rollups = FakeRollupRepo(fail_for={early})
+    use_case = RefreshStudyRollupsUseCase(study, rollups, FakeDocumentRepo(), overlap_seconds=0)
+    previous = now - timedelta(days=1)
+    rollups.watermark = previous
+
+    with pytest.raises(ConnectionError):
+        await use_case.execute()
+    assert rollups.refreshed == [late]
+    assert rollups.watermark == previous
+
+    rollups.fail_for.clear()
+    assert await use_case.execute() == 2
+    assert early in rollups.refreshed
+    assert rollups.watermark > now - timedelta(seconds=1)
+
+    # Nothing new since the successful run
+    assert await use_case.execute() == 0
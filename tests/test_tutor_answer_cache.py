@@ -0,0 +1,93 @@
+import uuid
+
+from app.application.interfaces import IAnswerCacheInterface
+from app.application.use_cases.tutor_usecases import TutorUseCase
+
+
+class MemoryAnswerCache(IAnswerCacheInterface):
+    """Exact-match stand-in: one answer per scope."""
+
+    def __init__(self) -> None:
+        self.entries = {}
+
+    async def lookup(self, scope, embedding, threshold):
+        return self.entries.get(scope)
+
+    async def store(self, scope, entry):
+        self.entries[scope] = entry
+
+    async def get_document_versions(self, document_ids):
+        return {d: 0 for d in document_ids}
+
+    async def invalidate_document(self, document_id, owner_id, class_id=None):
+        pass
+
+    async def get_threshold(self, class_id):
+        return None
+
+    async def set_threshold(self, class_id, threshold):
+        pass
+
+
+class FakeSearch:
+    async def embed_query(self, query):
+        return [1.0, 0.0]
+
+    async def execute(self, query, user_id, **kwargs):
+        return [{"document_id": "d", "chunk_index": 0, "content": f"notes of {user_id}", "score": 1.0}]
+
+    async def search_summaries(self, query, **kwargs):
+        return []
+
+
+class CountingLLM:
+    model_name = "fake"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def complete(self, prompt, system_message=None, max_tokens=1000):
+        self.calls += 1
+        return f"answer {self.calls}"
+
+
+class FakeMembership:
+    def __init__(self, members) -> None:
+        self.members = members
+
+    async def execute(self, group_id, user_id):
+        return (group_id, user_id) in self.members
+
+
+async def test_other_user_misses_an_answer_from_a_private_document():
+    owner, other, document_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    llm = CountingLLM()
+    tutor = TutorUseCase(llm, FakeSearch(), answer_cache=MemoryAnswerCache())
+
+    first = await tutor.execute("What is osmosis?", owner, document_id=document_id)
+    assert await tutor.execute("What is osmosis?", owner, document_id=document_id) == first
+
+    assert await tutor.execute("What is osmosis?", other, document_id=document_id) != first
+    assert llm.calls == 2
+
+
+async def test_class_answers_are_shared_with_members_only():
+    member, classmate, outsider, class_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    llm, cache = CountingLLM(), MemoryAnswerCache()
+    membership = FakeMembership({(class_id, member), (class_id, classmate)})
+    tutor = TutorUseCase(llm, FakeSearch(), answer_cache=cache, membership=membership)
+
+    first = await tutor.execute("What is osmosis?", member, class_id=class_id)
+    assert await tutor.execute("What is osmosis?", classmate, class_id=class_id) == first
+
+    assert await tutor.execute("What is osmosis?", outsider, class_id=class_id) != first
+    assert list(cache.entries) == [f"class:{class_id}"]  # the outsider's answer is not stored
+
+
+async def test_class_scope_is_not_cached_without_a_membership_check():
+    cache = MemoryAnswerCache()
+    tutor = TutorUseCase(CountingLLM(), FakeSearch(), answer_cache=cache)
+
+    await tutor.execute("What is osmosis?", uuid.uuid4(), class_id=uuid.uuid4())
+
+    assert cache.entries == {}